@@ -0,0 +1,230 @@
+"""Génération de quiz par lot sur un dossier de documents."""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .parsers.cache import file_digest
+from .parsers.pdf_parser import PdfParser
+from .parsers.registry import get_parser_class, parse_document, supported_extensions
+
+MANIFEST_VERSION = 1
+
+
+def discover_documents(directory: str | Path, recursive: bool = True) -> List[Path]:
+    """
+    Liste les documents pris en charge d'un dossier.
+
+    Args:
+        directory: Dossier à parcourir
+        recursive: Parcourir aussi les sous-dossiers
+
+    Returns:
+        Chemins des documents, triés
+    """
+    directory = Path(directory)
+    extensions = set(supported_extensions())
+    pattern = "**/*" if recursive else "*"
+    return sorted(
+        path for path in directory.glob(pattern)
+        if path.is_file() and path.suffix.lower() in extensions and not path.name.startswith((".", "~$"))
+    )
+
+
+class BatchManifest:
+    """
+    Manifeste d'un traitement par lot (documents terminés ou en échec).
+
+    Le manifeste est réécrit de façon atomique après chaque document: un
+    traitement interrompu reprend sans refaire les documents terminés. Un
+    document modifié depuis (empreinte différente) est traité à nouveau.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Charge (ou crée) le manifeste.
+
+        Args:
+            path: Fichier JSON du manifeste
+        """
+        self.path = Path(path)
+        self.items: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.items = data.get("items", {})
+
+    def is_done(self, key: str, digest: str) -> bool:
+        """Indique si le document a déjà été traité avec succès dans cette version."""
+        item = self.items.get(key)
+        return item is not None and item.get("status") == "done" and item.get("digest") == digest
+
+    def mark_done(self, key: str, digest: str, output: str, duration: float, num_questions: int) -> None:
+        """Enregistre un document terminé."""
+        self.items[key] = {
+            "status": "done",
+            "digest": digest,
+            "output": output,
+            "num_questions": num_questions,
+            "duration": round(duration, 3),
+            "finished_at": datetime.now().isoformat(),
+        }
+        self.save()
+
+    def mark_failed(self, key: str, digest: str, error: Exception, duration: float) -> None:
+        """Enregistre un document en échec (il sera réessayé à la reprise)."""
+        self.items[key] = {
+            "status": "failed",
+            "digest": digest,
+            "error": f"{type(error).__name__}: {error}",
+            "duration": round(duration, 3),
+            "finished_at": datetime.now().isoformat(),
+        }
+        self.save()
+
+    def save(self) -> None:
+        """Écrit le manifeste (fichier temporaire puis remplacement atomique)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(
+            json.dumps({"version": MANIFEST_VERSION, "items": self.items}, indent=2, ensure_ascii=False),
+            encoding="utf-8"
+        )
+        os.replace(tmp_path, self.path)
+
+    def summary(self) -> Dict[str, int]:
+        """Nombre de documents par statut."""
+        counts = {"done": 0, "failed": 0}
+        for item in self.items.values():
+            counts[item["status"]] = counts.get(item["status"], 0) + 1
+        return counts
+
+
+def _parse_in_worker(path: str, digest: str) -> List[Dict[str, Any]]:
+    """Parse un document dans un processus du pool (sans pool imbriqué pour les PDF)."""
+    kwargs = {"max_workers": 1} if get_parser_class(path) is PdfParser else {}
+    return parse_document(path, digest=digest, **kwargs)
+
+
+class BatchRunner:
+    """
+    Traite un lot de documents en parallèle.
+
+    Le parsing (CPU) est réparti sur un pool de processus; la génération de
+    plusieurs documents se fait en même temps (`concurrency` documents en
+    cours), chacun envoyant ses appels LLM en asynchrone via le client
+    partagé et son limiteur de débit.
+    """
+
+    def __init__(
+        self,
+        generator: Any,
+        root: str | Path,
+        output: str | Path,
+        manifest: BatchManifest,
+        format: str = "json",
+        parse_workers: Optional[int] = None,
+        concurrency: int = 4,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        **generate_kwargs
+    ):
+        """
+        Initialise le traitement par lot.
+
+        Args:
+            generator: QuizGenerator utilisé pour tous les documents
+            root: Dossier racine (les chemins du manifeste lui sont relatifs)
+            output: Dossier de sortie (un sous-dossier par document)
+            manifest: Manifeste de reprise
+            format: Format d'export
+            parse_workers: Nombre de processus de parsing (défaut: nombre de CPU)
+            concurrency: Nombre de documents en cours de génération simultanément
+            on_progress: Callback appelé après chaque document
+            **generate_kwargs: Paramètres de `generate_quiz_from_sections`
+        """
+        self.generator = generator
+        self.root = Path(root)
+        self.output = Path(output)
+        self.manifest = manifest
+        self.format = format
+        self.parse_workers = parse_workers
+        self.concurrency = concurrency
+        self.on_progress = on_progress
+        self.generate_kwargs = generate_kwargs
+
+    def run(self, paths: List[Path]) -> Dict[str, int]:
+        """
+        Traite les documents non encore terminés.
+
+        Args:
+            paths: Documents à traiter
+
+        Returns:
+            Compteurs {"done", "failed", "skipped"} de ce traitement
+        """
+        return asyncio.run(self._run(paths))
+
+    async def _run(self, paths: List[Path]) -> Dict[str, int]:
+        pending = []
+        for path in paths:
+            key = path.relative_to(self.root).as_posix()
+            digest = file_digest(path)
+            if not self.manifest.is_done(key, digest):
+                pending.append((path, key, digest))
+
+        stats = {"done": 0, "failed": 0, "skipped": len(paths) - len(pending)}
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # Parsing en avance limité: les sections en attente restent bornées en mémoire
+        in_flight = asyncio.Semaphore(2 * self.concurrency)
+        loop = asyncio.get_running_loop()
+
+        with ProcessPoolExecutor(max_workers=self.parse_workers) as pool:
+
+            async def process(path: Path, key: str, digest: str) -> None:
+                async with in_flight:
+                    await process_item(path, key, digest)
+
+            async def process_item(path: Path, key: str, digest: str) -> None:
+                item_started = time.perf_counter()
+                try:
+                    sections = await loop.run_in_executor(pool, _parse_in_worker, str(path), digest)
+                    async with semaphore:
+                        quiz = await asyncio.to_thread(
+                            self.generator.generate_quiz_from_sections, sections, **self.generate_kwargs
+                        )
+                    output_dir = self.output / Path(key).with_suffix("")
+                    output_path = await asyncio.to_thread(
+                        self.generator.export_quiz, quiz, format=self.format, output_path=output_dir
+                    )
+                except Exception as e:
+                    stats["failed"] += 1
+                    self.manifest.mark_failed(key, digest, e, time.perf_counter() - item_started)
+                    status = "failed"
+                else:
+                    stats["done"] += 1
+                    self.manifest.mark_done(
+                        key, digest, output_path, time.perf_counter() - item_started, len(quiz.get("questions", []))
+                    )
+                    status = "done"
+
+                if self.on_progress:
+                    finished = stats["done"] + stats["failed"]
+                    elapsed = time.perf_counter() - started
+                    throughput = finished / elapsed if elapsed > 0 else 0.0
+                    self.on_progress({
+                        "document": key,
+                        "status": status,
+                        "finished": finished,
+                        "total": len(pending),
+                        "throughput": throughput,
+                        "eta": (len(pending) - finished) / throughput if throughput else None,
+                    })
+
+            await asyncio.gather(*(process(*item) for item in pending))
+
+        return stats
@@ -18,6 +18,29 @@ class Settings(BaseSettings):
     openai_model: str = "gpt-4o"
     anthropic_model: str = "claude-3-5-sonnet-latest"
     embedding_model: str = "text-embedding-3-large"
+    embedding_dimensions: Optional[int] = None  # troncature (ex: 1024), défaut: dimension native
+
+    # Connexions HTTP (clients SDK partagés par le processus)
+    llm_base_url: Optional[str] = None
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http_timeout: float = 120.0
+    http_connect_timeout: float = 10.0
+
+    # Exécution des appels LLM
+    llm_max_concurrency: int = 5
+    llm_max_retries: int = 3
+    openai_requests_per_minute: Optional[int] = None
+    openai_tokens_per_minute: Optional[int] = None
+    anthropic_requests_per_minute: Optional[int] = None
+    anthropic_tokens_per_minute: Optional[int] = None
+
+    # Cache des réponses LLM (désactivé par défaut)
+    llm_cache_enabled: bool = False
+    llm_cache_path: str = ".cache/llm_responses.sqlite"
+    llm_cache_ttl: Optional[float] = 7 * 24 * 3600
+    llm_cache_deterministic_only: bool = True
 
     # Configuration de sortie
     output_language: str = "fr"
@@ -26,14 +49,42 @@ class Settings(BaseSettings):
     max_questions: int = 20
 
     # Options de génération
+    quiz_strategy: str = "auto"  # auto, rag, map_reduce, retrieval
+    quiz_part_size: int = 8000  # caractères par partie (map-reduce)
+    retrieval_chunk_tokens: int = 256  # tokens par chunk indexé
+    retrieval_top_k: int = 4  # chunks de contexte par concept
+    retrieval_min_score: float = 0.3
+    reranker_escalate: bool = True  # hybrid: cas indécis délégués au LLMReranker
+    question_dedup_threshold: float = 0.9  # similarité cosinus entre questions doublons
+    concept_batch_size: int = 5  # concepts détaillés par appel LLM
     include_explanations: bool = True
     include_difficulty: bool = True
     shuffle_options: bool = True
 
+    # Parsing des documents
+    parser_max_workers: Optional[int] = None  # défaut: nombre de CPU
+    pdf_parallel_min_pages: int = 16  # en dessous, extraction séquentielle
+    parse_cache_path: str = ".cache/parsed.sqlite"  # vide pour désactiver
+    parse_cache_max_entries: int = 1000  # documents conservés (éviction LRU)
+
     # Chemins
     document_path: str = "."
     output_path: str = "./output"
 
+    # Cache d'embeddings (chemin vide pour le désactiver)
+    embedding_cache_path: str = ".cache/embeddings.sqlite"
+    embedding_cache_max_entries: int = 100_000
+
+    # Embeddings de queries gardés en mémoire par VectorStore (0 pour désactiver)
+    query_cache_size: int = 1024
+
+    # Déduplication des chunks quasi identiques (MinHash)
+    dedup_enabled: bool = True
+    dedup_threshold: float = 0.9  # similarité de Jaccard estimée
+
+    # Dimension des embeddings locaux (mode hors ligne, sans clé API)
+    offline_embedding_dim: int = 1024
+
 
 # Instance globale de configuration
 settings = Settings()
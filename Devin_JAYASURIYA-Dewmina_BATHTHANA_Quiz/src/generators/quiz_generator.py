@@ -2,13 +2,44 @@
 
 import json
 import random
+from collections import Counter
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Callable, Tuple
 from datetime import datetime
 
 from ..config import settings
 from ..llm.client import LLMClient
-from ..rag.extractor import RAGExtractor, chunk_text
+from ..llm.streaming import JSONArrayStreamParser
+from ..rag.extractor import RAGExtractor, chunk_text, iter_chunks, merge_concepts, IMPORTANCE_RANK, concept_key
+from ..rag.reranker import create_reranker
+from ..rag.dedup import iter_strip_repeated_lines, QuestionDeduplicator
+from ..rag.embeddings import HashingEmbedder
+
+
+def allocate_questions(sizes: List[int], total: int) -> List[int]:
+    """
+    Répartit des questions proportionnellement à la taille des parties.
+
+    Utilise la méthode du plus fort reste: la somme vaut exactement `total`.
+
+    Args:
+        sizes: Taille (en caractères) de chaque partie
+        total: Nombre total de questions
+
+    Returns:
+        Nombre de questions par partie
+    """
+    weight = sum(sizes)
+    if weight == 0 or total <= 0:
+        return [0] * len(sizes)
+
+    quotas = [total * size / weight for size in sizes]
+    counts = [int(q) for q in quotas]
+    by_remainder = sorted(range(len(sizes)), key=lambda i: quotas[i] - counts[i], reverse=True)
+    for i in by_remainder[:total - sum(counts)]:
+        counts[i] += 1
+    return counts
 
 
 class QuizGenerator:
@@ -77,6 +108,9 @@ class QuizGenerator:
         """
         Génère un quiz à partir d'un texte.
 
+        Un texte plus long qu'une partie (QUIZ_PART_SIZE) est traité en
+        map-reduce plutôt que tronqué.
+
         Args:
             text: Le contenu à partir duquel générer le quiz
             num_questions: Nombre de questions à générer
@@ -91,10 +125,15 @@ class QuizGenerator:
         difficulty = difficulty or settings.default_difficulty
         question_types = question_types or ["qcm", "ouvert"]
 
-        # Tronquer le texte si trop long
-        max_tokens = 8000
-        if len(text) > max_tokens:
-            text = text[:max_tokens]
+        if len(text) > settings.quiz_part_size:
+            return self.generate_quiz_map_reduce(
+                [{"title": "Document", "content": text}],
+                num_questions=num_questions,
+                num_options=num_options,
+                difficulty=difficulty,
+                question_types=question_types,
+                **kwargs
+            )
 
         prompt = self.PROMPT_TEMPLATE.format(
             content=text,
@@ -122,30 +161,464 @@ class QuizGenerator:
 
     def generate_quiz_from_sections(
         self,
-        sections: List[Dict[str, Any]],
+        sections: Iterable[Dict[str, Any]],
+        strategy: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
         Génère un quiz à partir de sections parseées.
 
+        Les sections peuvent être produites au fil du parsing (ex:
+        `iter_document`): en map-reduce et en retrieval, les concepts de
+        chaque partie sont extraits dès qu'elle est complète, pendant
+        l'extraction des suivantes.
+
         Args:
-            sections: Liste de sections avec titre et contenu
+            sections: Sections avec titre et contenu (liste ou itérable)
+            strategy: "rag" (un appel; map-reduce si le contenu dépasse une
+                partie), "map_reduce" (tout le document), "retrieval"
+                (contexte récupéré par concept) ou "auto" (selon la taille);
+                défaut: configuration
 
         Returns:
             Dictionnaire contenant le quiz généré
         """
-        # Assembler le contenu des sections
-        full_content = ""
-        for section in sections:
-            title = section.get("title", "Section")
-            content = section.get("content", "")
-            full_content += f"## {title}\n\n{content}\n\n"
+        sections = iter(sections)
+        if settings.dedup_enabled:
+            # En-têtes et pieds de page répétés sur chaque page
+            sections = iter_strip_repeated_lines(sections)
+
+        strategy = strategy or settings.quiz_strategy
+        if strategy in ("auto", "rag"):
+            # Assembler le contenu des sections, jusqu'à dépasser une partie
+            head = []
+            full_content = ""
+            for section in sections:
+                head.append(section)
+                title = section.get("title", "Section")
+                content = section.get("content", "")
+                full_content += f"## {title}\n\n{content}\n\n"
+                if len(full_content) > settings.quiz_part_size:
+                    break
+            sections = chain(head, sections)
+            # Au-delà d'une partie, un seul appel ne couvrirait pas tout le document: map-reduce
+            strategy = "map_reduce" if len(full_content) > settings.quiz_part_size else "rag"
+
+        if strategy == "map_reduce":
+            return self.generate_quiz_map_reduce(sections, **kwargs)
+        if strategy == "retrieval":
+            return self.generate_quiz_with_retrieval(sections, **kwargs)
+        if strategy != "rag":
+            raise ValueError(f"Stratégie inconnue: {strategy}")
 
         # Utiliser RAG pour extraire les concepts clés
         concepts = self.rag_extractor.extract_key_concepts(full_content, num_concepts=8)
         
         return self._generate_quiz_with_rag(full_content, concepts, **kwargs)
 
+    def generate_quiz_map_reduce(
+        self,
+        sections: Iterable[Dict[str, Any]],
+        num_questions: int = None,
+        num_options: int = 4,
+        difficulty: int = None,
+        question_types: List[str] = None,
+        on_question: Optional[Callable[[Dict[str, Any]], None]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Génère un quiz couvrant tout le document (map-reduce).
+
+        Le document est découpé en parties; les concepts de chaque partie sont
+        extraits en parallèle puis fusionnés, les questions sont réparties entre
+        les parties proportionnellement à leur taille, et chaque partie est
+        traitée par un appel LLM, lui aussi en parallèle.
+
+        Args:
+            sections: Sections avec titre et contenu (liste ou itérable)
+            num_questions: Nombre total de questions
+            num_options: Nombre d'options pour les QCM
+            difficulty: Difficulté cible (1-5)
+            question_types: Types de questions souhaités
+            on_question: Callback recevant chaque question générée
+
+        Returns:
+            Dictionnaire contenant le quiz généré
+        """
+        num_questions = num_questions or settings.min_questions
+        difficulty = difficulty or settings.default_difficulty
+        # Map: concepts de chaque partie, en parallèle
+        parts, concepts_by_part = self._extract_part_concepts(sections)
+        if not parts:
+            quiz = self._generate_fallback_quiz("", num_questions)
+            self._add_metadata(quiz, difficulty)
+            return quiz
+
+        # Reduce: concepts du document, dédupliqués
+        concepts = merge_concepts(concepts_by_part)
+        concept_keys = {concept_key(c["name"]): c for c in concepts}
+
+        # Questions par partie, proportionnelles à la taille du contenu
+        counts = allocate_questions([len(part["content"]) for part in parts], num_questions)
+        targets = [
+            {
+                "field": "section",
+                "value": part["title"],
+                "count": count,
+                "content": part["content"],
+                "concepts": [concept_keys.get(concept_key(str(c.get("name", ""))), c) for c in part_concepts],
+            }
+            for part, part_concepts, count in zip(parts, concepts_by_part, counts)
+            if count > 0
+        ]
+
+        quiz = self._generate_targets(targets, num_options, difficulty, on_question, limit=num_questions)
+        if quiz["questions"]:
+            quiz["concepts"] = concepts
+            self._complete_questions(quiz, targets, num_questions, num_options, difficulty, on_question)
+        else:
+            quiz = self._generate_fallback_quiz(parts[0]["content"], num_questions)
+            if on_question:
+                for question in quiz["questions"]:
+                    on_question(question)
+
+        self._calibrate_quiz_difficulties(quiz)
+        self._add_metadata(quiz, difficulty)
+        quiz["metadata"]["strategy"] = "map_reduce"
+        quiz["metadata"]["num_parts"] = len(parts)
+        return quiz
+
+    def generate_quiz_with_retrieval(
+        self,
+        sections: Iterable[Dict[str, Any]],
+        num_questions: int = None,
+        num_options: int = 4,
+        difficulty: int = None,
+        question_types: List[str] = None,
+        on_question: Optional[Callable[[Dict[str, Any]], None]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Génère un quiz à partir de contextes récupérés par concept.
+
+        Les chunks du document sont indexés une fois dans un VectorStore; pour
+        chaque concept clé, les chunks les plus proches sont récupérés puis
+        reclassés localement (HybridReranker: BM25 et score vectoriel), les
+        cas indécis étant confiés au LLMReranker; seul ce contexte est envoyé
+        au LLM.
+
+        Args:
+            sections: Sections avec titre et contenu (liste ou itérable)
+            num_questions: Nombre total de questions
+            num_options: Nombre d'options pour les QCM
+            difficulty: Difficulté cible (1-5)
+            question_types: Types de questions souhaités
+            on_question: Callback recevant chaque question générée
+
+        Returns:
+            Dictionnaire contenant le quiz généré
+        """
+        num_questions = num_questions or settings.min_questions
+        difficulty = difficulty or settings.default_difficulty
+        parts, concepts_by_part = self._extract_part_concepts(sections)
+        if not parts:
+            quiz = self._generate_fallback_quiz("", num_questions)
+            self._add_metadata(quiz, difficulty)
+            return quiz
+
+        # Concepts du document entier (map-reduce), sans troncature
+        concepts = merge_concepts(concepts_by_part, num_concepts=num_questions)
+
+        # Indexer les chunks une seule fois
+        chunks = list(iter_chunks(parts, max_tokens=settings.retrieval_chunk_tokens, overlap_tokens=32))
+        store = self.rag_extractor.build_vector_store(chunks)
+
+        # Récupérer le contexte de chaque concept (un seul lot d'embeddings),
+        # reclassé localement; seuls les cas indécis sont confiés au LLM
+        reranker = create_reranker(
+            "hybrid",
+            max_results=settings.retrieval_top_k,
+            escalate=settings.reranker_escalate,
+            model=self.model,
+            api_key=self.api_key
+        )
+        queries = [f"{c['name']}: {c.get('definition', '')}" for c in concepts]
+        contexts = [
+            reranker.rerank(query, results)
+            for query, results in zip(
+                queries,
+                store.batch_search(queries, k=2 * settings.retrieval_top_k, min_score=settings.retrieval_min_score)
+            )
+        ]
+
+        counts = allocate_questions(
+            [IMPORTANCE_RANK.get(c.get("importance"), 1) for c in concepts], num_questions
+        )
+        targets = [
+            {
+                "field": "concept",
+                "value": concept["name"],
+                "count": count,
+                "content": "\n---\n".join(result["text"] for result in context),
+                "concepts": [concept],
+            }
+            for concept, context, count in zip(concepts, contexts, counts)
+            if count > 0 and context
+        ]
+
+        quiz = self._generate_targets(targets, num_options, difficulty, on_question, limit=num_questions)
+        if quiz["questions"]:
+            quiz["concepts"] = concepts
+            self._complete_questions(quiz, targets, num_questions, num_options, difficulty, on_question)
+        else:
+            quiz = self._generate_fallback_quiz(parts[0]["content"], num_questions)
+            if on_question:
+                for question in quiz["questions"]:
+                    on_question(question)
+
+        self._calibrate_quiz_difficulties(quiz)
+        self._add_metadata(quiz, difficulty)
+        quiz["metadata"]["strategy"] = "retrieval"
+        quiz["metadata"]["num_chunks"] = len(chunks)
+        quiz["metadata"]["rerank_escalations"] = reranker.escalations
+        return quiz
+
+    def _generate_targets(
+        self,
+        targets: List[Dict[str, Any]],
+        num_options: int,
+        difficulty: int,
+        on_question: Optional[Callable[[Dict[str, Any]], None]] = None,
+        existing: Optional[List[Dict[str, Any]]] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Génère en parallèle les questions de chaque cible (partie ou concept).
+
+        Les réponses sont traitées dans leur ordre d'arrivée: les questions de
+        chaque cible sont dédupliquées (entre elles et avec les questions déjà
+        retenues) dès que sa réponse arrive, puis transmises à `on_question`.
+        Les questions transmises sont donc exactement celles du quiz final.
+
+        Args:
+            targets: Cibles {"field", "value", "count", "content", "concepts"}
+            num_options: Nombre d'options pour les QCM
+            difficulty: Difficulté cible (1-5)
+            on_question: Callback recevant chaque question retenue
+            existing: Questions déjà retenues (à ne pas reformuler ni dupliquer)
+            limit: Nombre total de questions du quiz (les suivantes ne sont pas
+                transmises à `on_question`)
+
+        Returns:
+            Quiz fusionné: nouvelles questions retenues, dans l'ordre d'arrivée,
+            et 'duplicates_removed'
+        """
+        existing = existing or []
+        prompts = []
+        for target in targets:
+            prompt = self._build_quiz_prompt(
+                target["content"], target["concepts"], target["count"], num_options, difficulty
+            )
+            if existing:
+                prompt += "\n## Questions déjà posées (ne pas les reformuler):\n" + "\n".join(
+                    f"- {q.get('question') or q.get('text', '')}" for q in existing
+                )
+            prompts.append(prompt)
+
+        questions: List[Dict[str, Any]] = []
+        removed = 0
+        title = description = None
+        # Embeddings des questions retenues gardés: chaque réponse n'encode que ses questions
+        dedup = self._question_deduplicator()
+        dedup.add(existing)
+
+        for index, response in self.client.generate_as_completed(
+            prompts,
+            temperature=0.5,
+            max_tokens=4000,
+            response_format={"type": "json_object"}
+        ):
+            target = targets[index]
+            result = self._parse_partial_quiz(response, target["field"], target["value"], target["count"])
+            if result is None:
+                continue
+            title = title or result.get("title")
+            description = description or result.get("description")
+
+            accepted, more_removed = dedup.filter(result["questions"])
+            removed += more_removed
+            self._calibrate_quiz_difficulties({"questions": accepted})
+
+            for question in accepted:
+                questions.append(question)
+                position = len(existing) + len(questions)
+                question["id"] = position
+                if on_question and (limit is None or position <= limit):
+                    on_question(question)
+
+        return {
+            "title": title or "Quiz",
+            "description": description or "Quiz couvrant l'ensemble du document",
+            "questions": questions,
+            "duplicates_removed": removed,
+        }
+
+    def _complete_questions(
+        self,
+        quiz: Dict[str, Any],
+        targets: List[Dict[str, Any]],
+        num_questions: int,
+        num_options: int,
+        difficulty: int,
+        on_question: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> None:
+        """
+        Complète les cibles sous-couvertes puis limite le quiz à `num_questions`.
+
+        Les questions du quiz sont déjà dédupliquées (`_generate_targets`).
+        S'il en manque, un seul appel de complément est fait pour chaque cible
+        n'ayant pas obtenu son quota.
+
+        Args:
+            quiz: Quiz à compléter (modifié sur place)
+            targets: Cibles utilisées pour générer le quiz
+            num_questions: Nombre de questions demandé
+            num_options: Nombre d'options pour les QCM
+            difficulty: Difficulté cible (1-5)
+            on_question: Callback recevant chaque question de complément retenue
+        """
+        questions = quiz["questions"]
+        removed = quiz.get("duplicates_removed", 0)
+        topup_calls = 0
+
+        missing = num_questions - len(questions)
+        if missing > 0:
+            field = targets[0]["field"]
+            coverage = Counter(q.get(field) for q in questions)
+            deficits = [max(0, target["count"] - coverage[target["value"]]) for target in targets]
+            if sum(deficits) == 0:
+                deficits = [target["count"] for target in targets]
+            counts = allocate_questions(deficits, missing)
+            topups = [{**target, "count": count} for target, count in zip(targets, counts) if count > 0]
+
+            if topups:
+                topup_calls = len(topups)
+                extra = self._generate_targets(
+                    topups, num_options, difficulty, on_question, existing=questions, limit=num_questions
+                )
+                questions = questions + extra["questions"]
+                removed += extra["duplicates_removed"]
+
+        questions = questions[:num_questions]
+        for i, question in enumerate(questions, 1):
+            question["id"] = i
+        quiz["questions"] = questions
+        quiz["duplicates_removed"] = removed
+        quiz["topup_calls"] = topup_calls
+
+    def _question_deduplicator(self) -> QuestionDeduplicator:
+        """Déduplicateur sémantique des questions (embedder du RAG, ou local hors ligne)."""
+        embedder = self.rag_extractor.embedder or HashingEmbedder(dim=settings.offline_embedding_dim)
+        return QuestionDeduplicator(embedder)
+
+    def _parse_partial_quiz(
+        self,
+        response: Any,
+        field: str,
+        value: Any,
+        count: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Lit un quiz partiel généré pour une cible.
+
+        Args:
+            response: Réponse LLM (ou exception) de l'appel
+            field: Champ ajouté à chaque question (ex: "section")
+            value: Valeur de ce champ (ex: "Page 3")
+            count: Nombre max de questions à garder
+
+        Returns:
+            Quiz partiel (au plus `count` questions), ou None si la réponse
+            est inexploitable
+        """
+        try:
+            if isinstance(response, Exception):
+                raise response
+            result = json.loads(response)
+        except Exception:
+            return None
+        if not isinstance(result, dict):
+            return None
+
+        questions = [q for q in result.get("questions", []) if isinstance(q, dict)][:count]
+        for question in questions:
+            question[field] = value
+        return {**result, "questions": questions}
+
+    def _extract_part_concepts(
+        self,
+        sections: Iterable[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[List[Dict[str, Any]]]]:
+        """
+        Découpe les sections en parties et extrait les concepts de chacune.
+
+        L'extraction d'une partie est lancée dès qu'elle est complète: avec
+        des sections produites au fil du parsing, les appels LLM avancent
+        pendant l'extraction des pages suivantes.
+
+        Args:
+            sections: Sections parseées (liste ou itérable)
+
+        Returns:
+            (parties avec 'title' et 'content', concepts de chaque partie)
+        """
+        parts: List[Dict[str, Any]] = []
+
+        def contents() -> Iterator[str]:
+            for part in self._iter_parts(sections, settings.quiz_part_size):
+                parts.append(part)
+                yield part["content"]
+
+        concepts_by_part = self.rag_extractor.extract_concepts_by_chunk(contents(), num_concepts=5)
+        return parts, concepts_by_part
+
+    def _iter_parts(self, sections: Iterable[Dict[str, Any]], part_size: int) -> Iterator[Dict[str, Any]]:
+        """
+        Regroupe les sections consécutives en parties d'environ `part_size` caractères.
+
+        Args:
+            sections: Sections parseées (liste ou itérable)
+            part_size: Taille cible d'une partie (en caractères)
+
+        Yields:
+            Parties avec 'title' et 'content', dès qu'elles sont complètes
+        """
+        titles: List[str] = []
+        buffer = ""
+
+        def part() -> Dict[str, Any]:
+            title = titles[0] if len(titles) == 1 else f"{titles[0]} - {titles[-1]}"
+            return {"title": title, "content": buffer}
+
+        for i, section in enumerate(sections, 1):
+            title = section.get("title") or (f"Page {section['page']}" if "page" in section else f"Section {i}")
+            content = section.get("content", "")
+            if not content.strip():
+                continue
+
+            # Une section trop longue est découpée en plusieurs parties
+            for piece in chunk_text(content, chunk_size=part_size, overlap=0):
+                block = f"## {title}\n\n{piece}\n\n"
+                if buffer and len(buffer) + len(block) > part_size:
+                    if buffer.strip():
+                        yield part()
+                    titles, buffer = [], ""
+                titles.append(title)
+                buffer += block
+
+        if buffer.strip():
+            yield part()
+
     def _generate_quiz_with_rag(
         self,
         full_content: str,
@@ -154,6 +627,7 @@ class QuizGenerator:
         num_options: int = 4,
         difficulty: int = None,
         question_types: List[str] = None,
+        on_question: Optional[Callable[[Dict[str, Any]], None]] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -166,6 +640,8 @@ class QuizGenerator:
             num_options: Number of MCQ options
             difficulty: Target difficulty
             question_types: Question types
+            on_question: If given, the response is streamed and this callback
+                receives each question as soon as it is complete
 
         Returns:
             Dictionary containing generated quiz
@@ -175,10 +651,55 @@ class QuizGenerator:
         question_types = question_types or ["qcm", "ouvert"]
         concepts = concepts or []
 
-        # Build enriched prompt with concepts
+        prompt = self._build_quiz_prompt(full_content, concepts, num_questions, num_options, difficulty)
+
+        if on_question:
+            response = self._stream_questions(prompt, on_question)
+        else:
+            response = self.client.generate(
+                prompt=prompt,
+                temperature=0.5,
+                max_tokens=4000,
+                response_format={"type": "json_object"}
+            )
+
+        try:
+            quiz = json.loads(response)
+        except json.JSONDecodeError:
+            quiz = self._generate_fallback_quiz(full_content, num_questions)
+
+        # Calibrate difficulties
+        self._calibrate_quiz_difficulties(quiz)
+
+        # Add metadata
+        self._add_metadata(quiz, difficulty)
+
+        return quiz
+
+    def _build_quiz_prompt(
+        self,
+        content: str,
+        concepts: List[Dict[str, Any]],
+        num_questions: int,
+        num_options: int,
+        difficulty: int
+    ) -> str:
+        """
+        Builds the quiz generation prompt enriched with key concepts.
+
+        Args:
+            content: Content to generate questions from
+            concepts: Key concepts to cover
+            num_questions: Number of questions
+            num_options: Number of MCQ options
+            difficulty: Target difficulty
+
+        Returns:
+            Prompt text
+        """
         concepts_text = "\n".join([f"- {c.get('name', '')}: {c.get('definition', '')}" for c in concepts[:5]])
 
-        prompt = f"""Vous êtes un expert pédagogique spécialisé dans la création de quiz.
+        return f"""Vous êtes un expert pédagogique spécialisé dans la création de quiz.
 
 Basé sur le contenu suivant et les concepts clés, générez un quiz avec {num_questions} questions.
 
@@ -209,25 +730,17 @@ Basé sur le contenu suivant et les concepts clés, générez un quiz avec {num_
 }}
 
 ## Contenu:
-{full_content[:8000]}
+{content}
 """
 
-        response = self.client.generate(
-            prompt=prompt,
-            temperature=0.5,
-            max_tokens=4000,
-            response_format={"type": "json_object"}
-        )
-
-        try:
-            quiz = json.loads(response)
-        except json.JSONDecodeError:
-            quiz = self._generate_fallback_quiz(full_content, num_questions)
-
-        # Calibrate difficulties
-        self._calibrate_quiz_difficulties(quiz)
+    def _add_metadata(self, quiz: Dict[str, Any], difficulty: int) -> None:
+        """
+        Adds generation metadata to a quiz (modified in place).
 
-        # Add metadata
+        Args:
+            quiz: Generated quiz
+            difficulty: Target difficulty
+        """
         quiz["metadata"] = {
             "generated_at": datetime.now().isoformat(),
             "model": self.model,
@@ -236,7 +749,34 @@ Basé sur le contenu suivant et les concepts clés, générez un quiz avec {num_
             "with_explanations": settings.include_explanations
         }
 
-        return quiz
+    def _stream_questions(
+        self,
+        prompt: str,
+        on_question: Callable[[Dict[str, Any]], None]
+    ) -> str:
+        """
+        Streams a quiz generation and reports each question as soon as it closes.
+
+        Args:
+            prompt: Generation prompt
+            on_question: Callback receiving each completed question
+
+        Returns:
+            Full response text
+        """
+        parser = JSONArrayStreamParser(key="questions")
+
+        for delta in self.client.stream(
+            prompt=prompt,
+            temperature=0.5,
+            max_tokens=4000,
+            response_format={"type": "json_object"}
+        ):
+            for question in parser.feed(delta):
+                if isinstance(question, dict):
+                    on_question(question)
+
+        return parser.text
 
     def _calibrate_quiz_difficulties(self, quiz: Dict[str, Any]) -> None:
         """
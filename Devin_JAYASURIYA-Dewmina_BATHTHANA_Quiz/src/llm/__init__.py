@@ -1,5 +1,14 @@
 """Module de communication avec les API LLM (OpenAI, Anthropic)."""
 
 from .client import LLMClient
+from .rate_limit import RateLimiter, get_rate_limiter
+from .cache import ResponseCache
+from .streaming import JSONArrayStreamParser
 
-__all__ = ["LLMClient"]
+__all__ = [
+    "LLMClient",
+    "RateLimiter",
+    "get_rate_limiter",
+    "ResponseCache",
+    "JSONArrayStreamParser",
+]
@@ -0,0 +1,205 @@
+"""Cache des réponses LLM (LRU en mémoire adossé à un stockage SQLite)."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import settings
+
+# Au-delà de cette température, les réponses sont considérées non déterministes
+DETERMINISTIC_MAX_TEMPERATURE = 0.3
+
+
+def response_key(
+    provider: str,
+    model: Optional[str],
+    prompt: str,
+    temperature: float,
+    response_format: Optional[Dict[str, Any]] = None,
+    max_tokens: Optional[int] = None
+) -> str:
+    """
+    Calcule la clé de cache d'un appel LLM.
+
+    Args:
+        provider: Fournisseur
+        model: Modèle
+        prompt: Prompt envoyé
+        temperature: Température d'échantillonnage
+        response_format: Format de réponse demandé
+        max_tokens: Nombre max de tokens générés
+
+    Returns:
+        Empreinte SHA-256 des paramètres de l'appel
+    """
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    payload = json.dumps(
+        [provider, model, prompt_hash, temperature, response_format, max_tokens],
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Cache des réponses LLM.
+
+    Les réponses sont conservées dans un LRU en mémoire et, si `path` est
+    fourni, dans une base SQLite partagée entre exécutions. Les entrées plus
+    anciennes que `ttl` secondes sont ignorées. En mode `deterministic_only`,
+    seuls les appels de température <= 0.3 sont mis en cache.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = ".cache/llm_responses.sqlite",
+        max_memory_entries: int = 1024,
+        ttl: Optional[float] = 7 * 24 * 3600,
+        deterministic_only: bool = True
+    ):
+        """
+        Initialise le cache.
+
+        Args:
+            path: Fichier SQLite (None pour un cache uniquement en mémoire)
+            max_memory_entries: Taille du LRU en mémoire
+            ttl: Durée de validité des réponses en secondes (None: illimitée)
+            deterministic_only: Ne mettre en cache que les appels à basse température
+        """
+        self.path = str(path) if path else None
+        self.max_memory_entries = max_memory_entries
+        self.ttl = ttl
+        self.deterministic_only = deterministic_only
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if self.path:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            self._conn.commit()
+
+    def is_cacheable(self, temperature: float) -> bool:
+        """Indique si un appel à cette température peut être mis en cache."""
+        return not self.deterministic_only or temperature <= DETERMINISTIC_MAX_TEMPERATURE
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl is not None and time.time() - created_at > self.ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Récupère une réponse en cache.
+
+        Args:
+            key: Clé calculée par `response_key`
+
+        Returns:
+            La réponse, ou None si absente ou expirée
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and not self._expired(entry[0]):
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and not self._expired(row[1]):
+                    self._remember(key, row[1], row[0])
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Enregistre une réponse.
+
+        Args:
+            key: Clé calculée par `response_key`
+            response: Réponse du modèle
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, response)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)",
+                    (key, response, now)
+                )
+                self._conn.commit()
+
+    def _remember(self, key: str, created_at: float, response: str) -> None:
+        self._memory[key] = (created_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        """Statistiques d'utilisation du cache."""
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / total if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        """Vide le cache (mémoire et disque) et remet les compteurs à zéro."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.commit()
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_response_cache() -> Optional[ResponseCache]:
+    """
+    Retourne le cache de réponses partagé du processus, s'il est activé.
+
+    Returns:
+        Instance partagée, ou None si LLM_CACHE_ENABLED est faux
+    """
+    global _default_cache
+
+    if not settings.llm_cache_enabled:
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache(
+                settings.llm_cache_path or None,
+                ttl=settings.llm_cache_ttl,
+                deterministic_only=settings.llm_cache_deterministic_only
+            )
+    return _default_cache
@@ -1,10 +1,18 @@
 """Client LLM pour OpenAI et Anthropic."""
 
+import asyncio
 import os
-from typing import Optional, Dict, Any, List
+import queue
+from typing import Optional, Dict, Any, Iterable, List, Iterator, Tuple
+
+from ..config import settings
+from .rate_limit import estimate_tokens, get_rate_limiter, retry_call, aretry_call
+from .cache import ResponseCache, get_default_response_cache, response_key
+
+from .registry import get_client, get_async_client, run_coroutine, submit_coroutine
 
 try:
-    from openai import OpenAI
+    import openai
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
@@ -23,7 +31,10 @@ class LLMClient:
         self,
         api_key: Optional[str] = None,
         model: Optional[str] = None,
-        provider: str = "openai"
+        provider: str = "openai",
+        max_retries: Optional[int] = None,
+        cache: Optional[ResponseCache] = None,
+        base_url: Optional[str] = None
     ):
         """
         Initialise le client LLM.
@@ -32,28 +43,41 @@ class LLMClient:
             api_key: Clé API pour l'accès au LLM
             model: Modèle à utiliser
             provider: Fournisseur ("openai" ou "anthropic")
+            max_retries: Nombre max de réessais sur 429/5xx (défaut: configuration)
+            cache: Cache de réponses (défaut: cache partagé si LLM_CACHE_ENABLED)
+            base_url: URL de base de l'API (ex: serveur compatible OpenAI)
         """
         self.provider = provider
         self.model = model
         self.api_key = api_key or os.getenv("OPENAI_API_KEY") or os.getenv("ANTHROPIC_API_KEY")
+        self.max_retries = settings.llm_max_retries if max_retries is None else max_retries
+        self.rate_limiter = get_rate_limiter(provider)
+        self.cache = cache if cache is not None else get_default_response_cache()
+        self.base_url = base_url or settings.llm_base_url
 
         if provider == "openai":
             if not OPENAI_AVAILABLE:
                 raise ImportError("Le package 'openai' n'est pas installé.")
             if not self.api_key:
                 raise ValueError("Une clé API OpenAI est requise.")
-            self.client = OpenAI(api_key=self.api_key)
 
         elif provider == "anthropic":
             if not ANTHROPIC_AVAILABLE:
                 raise ImportError("Le package 'anthropic' n'est pas installé.")
             if not self.api_key:
                 raise ValueError("Une clé API Anthropic est requise.")
-            self.client = anthropic.Anthropic(api_key=self.api_key)
 
         else:
             raise ValueError(f"Provider inconnu: {provider}")
 
+        # Client SDK partagé: un seul pool de connexions par (provider, clé, URL)
+        self.client = get_client(provider, self.api_key, self.base_url)
+
+    @property
+    def async_client(self):
+        """Client SDK asynchrone partagé, propre à la boucle asyncio courante."""
+        return get_async_client(self.provider, self.api_key, self.base_url)
+
     def generate(
         self,
         prompt: str,
@@ -65,6 +89,9 @@ class LLMClient:
         """
         Génère du texte à partir d'un prompt.
 
+        Les erreurs transitoires (429, 5xx) sont réessayées avec un délai
+        exponentiel, et le débit est limité par fournisseur.
+
         Args:
             prompt: Le prompt à envoyer au modèle
             response_format: Format de réponse attendu (ex: {"type": "json_object"})
@@ -74,19 +101,256 @@ class LLMClient:
         Returns:
             Texte généré par le modèle
         """
+        key = self._cache_key(prompt, response_format, max_tokens, temperature)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
         if self.provider == "openai":
-            return self._generate_openai(prompt, response_format, max_tokens, temperature)
+            call = lambda: self._generate_openai(prompt, response_format, max_tokens, temperature)
         else:
-            return self._generate_anthropic(prompt, max_tokens, temperature)
+            call = lambda: self._generate_anthropic(prompt, max_tokens, temperature)
 
-    def _generate_openai(
+        response = retry_call(
+            call,
+            max_retries=self.max_retries,
+            limiter=self.rate_limiter,
+            tokens=estimate_tokens(prompt) + max_tokens
+        )
+
+        if key and response is not None:
+            self.cache.put(key, response)
+        return response
+
+    def stream(
         self,
         prompt: str,
         response_format: Optional[Dict[str, Any]] = None,
         max_tokens: int = 4096,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Génère du texte en streaming.
+
+        Args:
+            prompt: Le prompt à envoyer au modèle
+            response_format: Format de réponse attendu (ex: {"type": "json_object"})
+            max_tokens: Nombre maximal de tokens à générer
+            temperature: Température pour la génération
+
+        Yields:
+            Fragments de texte, dans l'ordre de génération
+        """
+        key = self._cache_key(prompt, response_format, max_tokens, temperature)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        # Seule l'ouverture du flux est réessayée (rien n'a encore été émis)
+        if self.provider == "openai":
+            params = self._openai_params(prompt, response_format, max_tokens, temperature)
+            call = lambda: self.client.chat.completions.create(**params, stream=True)
+        else:
+            call = lambda: self.client.messages.create(
+                model=self.model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                messages=[{"role": "user", "content": prompt}],
+                stream=True
+            )
+
+        events = retry_call(
+            call,
+            max_retries=self.max_retries,
+            limiter=self.rate_limiter,
+            tokens=estimate_tokens(prompt) + max_tokens
+        )
+
+        parts = []
+        for event in events:
+            if self.provider == "openai":
+                delta = event.choices[0].delta.content if event.choices else None
+            else:
+                delta = getattr(event.delta, "text", None) if event.type == "content_block_delta" else None
+            if delta:
+                parts.append(delta)
+                yield delta
+
+        if key:
+            self.cache.put(key, "".join(parts))
+
+    async def agenerate(
+        self,
+        prompt: str,
+        response_format: Optional[Dict[str, Any]] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        **kwargs
     ) -> str:
-        """Génère du texte avec OpenAI."""
+        """
+        Version asynchrone de `generate`.
+
+        Args:
+            prompt: Le prompt à envoyer au modèle
+            response_format: Format de réponse attendu (ex: {"type": "json_object"})
+            max_tokens: Nombre maximal de tokens à générer
+            temperature: Température pour la génération
+
+        Returns:
+            Texte généré par le modèle
+        """
+        key = self._cache_key(prompt, response_format, max_tokens, temperature)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        if self.provider == "openai":
+            call = lambda: self._agenerate_openai(prompt, response_format, max_tokens, temperature)
+        else:
+            call = lambda: self._agenerate_anthropic(prompt, max_tokens, temperature)
+
+        response = await aretry_call(
+            call,
+            max_retries=self.max_retries,
+            limiter=self.rate_limiter,
+            tokens=estimate_tokens(prompt) + max_tokens
+        )
+
+        if key and response is not None:
+            self.cache.put(key, response)
+        return response
+
+    def _cache_key(
+        self,
+        prompt: str,
+        response_format: Optional[Dict[str, Any]],
+        max_tokens: int,
+        temperature: float
+    ) -> Optional[str]:
+        """Clé de cache de l'appel, ou None s'il ne doit pas être mis en cache."""
+        if self.cache is None or not self.cache.is_cacheable(temperature):
+            return None
+        # Anthropic ignore response_format: il ne fait pas partie de la clé
+        if self.provider != "openai":
+            response_format = None
+        return response_key(self.provider, self.model, prompt, temperature, response_format, max_tokens)
+
+    async def agenerate_many(
+        self,
+        prompts: List[str],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+        **kwargs
+    ) -> List[Any]:
+        """
+        Génère les réponses de plusieurs prompts en parallèle.
+
+        Args:
+            prompts: Prompts à envoyer
+            max_concurrency: Nombre max de requêtes simultanées (défaut: configuration)
+            return_exceptions: Retourner les exceptions à la place des réponses en échec
+            **kwargs: Paramètres communs transmis à `agenerate`
+
+        Returns:
+            Réponses dans l'ordre des prompts
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or settings.llm_max_concurrency)
+
+        async def run(prompt: str) -> str:
+            async with semaphore:
+                return await self.agenerate(prompt, **kwargs)
+
+        return await asyncio.gather(*(run(p) for p in prompts), return_exceptions=return_exceptions)
+
+    def generate_many(
+        self,
+        prompts: List[str],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+        **kwargs
+    ) -> List[Any]:
+        """
+        Version bloquante de `agenerate_many`: la durée totale est celle de
+        l'appel le plus lent (dans la limite de `max_concurrency`), pas la somme.
+
+        Args:
+            prompts: Prompts à envoyer
+            max_concurrency: Nombre max de requêtes simultanées (défaut: configuration)
+            return_exceptions: Retourner les exceptions à la place des réponses en échec
+            **kwargs: Paramètres communs transmis à `agenerate`
+
+        Returns:
+            Réponses dans l'ordre des prompts
+        """
+        if not prompts:
+            return []
+        return run_sync(self.agenerate_many(prompts, max_concurrency, return_exceptions, **kwargs))
+
+    def generate_as_completed(
+        self,
+        prompts: Iterable[str],
+        max_concurrency: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Comme `generate_many`, mais rend chaque réponse dès qu'elle arrive.
+
+        Les prompts peuvent provenir d'un générateur (ex: parties d'un
+        document en cours de parsing): chacun est envoyé dès qu'il est
+        produit, et les réponses déjà arrivées sont rendues sans attendre la
+        fin de la source.
+
+        Args:
+            prompts: Prompts à envoyer
+            max_concurrency: Nombre max de requêtes simultanées (défaut: configuration)
+            **kwargs: Paramètres communs transmis à `agenerate`
+
+        Yields:
+            (indice du prompt, réponse ou exception), dans l'ordre d'arrivée
+        """
+        results: "queue.Queue[Tuple[int, Any]]" = queue.Queue()
+        semaphore = asyncio.Semaphore(max_concurrency or settings.llm_max_concurrency)
+
+        async def run(index: int, prompt: str) -> None:
+            async with semaphore:
+                try:
+                    results.put((index, await self.agenerate(prompt, **kwargs)))
+                except Exception as exc:
+                    results.put((index, exc))
+
+        futures = []
+        received = 0
+        try:
+            for index, prompt in enumerate(prompts):
+                futures.append(submit_coroutine(run(index, prompt)))
+                while True:
+                    try:
+                        item = results.get_nowait()
+                    except queue.Empty:
+                        break
+                    received += 1
+                    yield item
+            while received < len(futures):
+                received += 1
+                yield results.get()
+        finally:
+            # Consommateur arrêté avant la fin: les requêtes restantes sont annulées
+            for future in futures:
+                future.cancel()
+
+    def _openai_params(
+        self,
+        prompt: str,
+        response_format: Optional[Dict[str, Any]],
+        max_tokens: int,
+        temperature: float
+    ) -> Dict[str, Any]:
+        """Construit les paramètres d'une requête OpenAI."""
         messages = [
             {"role": "system", "content": "Vous êtes un assistant expert et précis."},
             {"role": "user", "content": prompt}
@@ -102,9 +366,32 @@ class LLMClient:
         if response_format:
             params["response_format"] = response_format
 
+        return params
+
+    def _generate_openai(
+        self,
+        prompt: str,
+        response_format: Optional[Dict[str, Any]] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7
+    ) -> str:
+        """Génère du texte avec OpenAI."""
+        params = self._openai_params(prompt, response_format, max_tokens, temperature)
         response = self.client.chat.completions.create(**params)
         return response.choices[0].message.content
 
+    async def _agenerate_openai(
+        self,
+        prompt: str,
+        response_format: Optional[Dict[str, Any]] = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7
+    ) -> str:
+        """Génère du texte avec OpenAI (asynchrone)."""
+        params = self._openai_params(prompt, response_format, max_tokens, temperature)
+        response = await self.async_client.chat.completions.create(**params)
+        return response.choices[0].message.content
+
     def _generate_anthropic(
         self,
         prompt: str,
@@ -121,3 +408,32 @@ class LLMClient:
             ]
         )
         return message.content[0].text
+
+    async def _agenerate_anthropic(
+        self,
+        prompt: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.7
+    ) -> str:
+        """Génère du texte avec Anthropic (asynchrone)."""
+        message = await self.async_client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        return message.content[0].text
+
+
+def run_sync(coroutine):
+    """
+    Exécute une coroutine depuis du code synchrone.
+
+    La coroutine tourne dans la boucle d'arrière-plan du registre, y compris
+    si une boucle asyncio tourne déjà dans le thread appelant (ex: notebook):
+    les clients asynchrones et leurs connexions sont réutilisés d'un appel à
+    l'autre.
+    """
+    return run_coroutine(coroutine)
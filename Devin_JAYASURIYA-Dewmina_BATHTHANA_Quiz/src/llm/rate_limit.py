@@ -0,0 +1,166 @@
+"""Limitation de débit et réessais pour les appels aux API LLM."""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from ..config import settings
+
+T = TypeVar("T")
+
+# Codes HTTP justifiant un réessai (limite de débit, erreurs serveur)
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Erreurs réseau des SDK (sans code HTTP) justifiant un réessai
+RETRYABLE_ERROR_NAMES = {"APIConnectionError", "APITimeoutError"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimation grossière du nombre de tokens (~4 caractères par token)."""
+    return len(text) // 4 + 1
+
+
+class RateLimiter:
+    """
+    Limiteur de débit à double seau (requêtes/min et tokens/min).
+
+    Chaque appel réserve une requête et un nombre estimé de tokens; si un
+    seau est épuisé, l'appelant attend le temps nécessaire à son remplissage.
+    Utilisable depuis des threads (`acquire`) comme depuis asyncio (`aacquire`).
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        """
+        Initialise le limiteur.
+
+        Args:
+            requests_per_minute: Requêtes autorisées par minute (None: illimité)
+            tokens_per_minute: Tokens autorisés par minute (None: illimité)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute or 0)
+        self._tokens = float(tokens_per_minute or 0)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        """Réserve une requête et `tokens` tokens; retourne l'attente nécessaire."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._updated = now
+            wait = 0.0
+
+            if self.requests_per_minute:
+                rate = self.requests_per_minute / 60
+                self._requests = min(self.requests_per_minute, self._requests + elapsed * rate) - 1
+                if self._requests < 0:
+                    wait = max(wait, -self._requests / rate)
+
+            if self.tokens_per_minute:
+                rate = self.tokens_per_minute / 60
+                # Une requête plus grosse que le seau ne doit pas bloquer indéfiniment
+                cost = min(tokens, self.tokens_per_minute)
+                self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * rate) - cost
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / rate)
+
+            return wait
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Attend (en bloquant le thread) l'autorisation d'envoyer une requête."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        """Attend (sans bloquer la boucle asyncio) l'autorisation d'envoyer une requête."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    """
+    Retourne le limiteur partagé d'un fournisseur (selon la configuration).
+
+    Args:
+        provider: Fournisseur ("openai" ou "anthropic")
+
+    Returns:
+        Limiteur commun à tous les clients du processus pour ce fournisseur
+    """
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = RateLimiter(
+                requests_per_minute=getattr(settings, f"{provider}_requests_per_minute", None),
+                tokens_per_minute=getattr(settings, f"{provider}_tokens_per_minute", None),
+            )
+        return _limiters[provider]
+
+
+def is_retryable(error: Exception) -> bool:
+    """Indique si une erreur d'API est transitoire (429, 5xx, réseau)."""
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES or status >= 500
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+
+def backoff_delay(attempt: int, base_delay: float = 1.0, max_delay: float = 30.0) -> float:
+    """Délai exponentiel avec gigue complète (« full jitter »)."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def retry_call(
+    func: Callable[[], T],
+    max_retries: int = 3,
+    limiter: Optional[RateLimiter] = None,
+    tokens: int = 0
+) -> T:
+    """
+    Appelle `func` en réessayant les erreurs transitoires.
+
+    Args:
+        func: Fonction sans argument effectuant la requête
+        max_retries: Nombre max de réessais
+        limiter: Limiteur de débit à consulter avant chaque tentative
+        tokens: Nombre estimé de tokens de la requête
+
+    Returns:
+        Résultat de `func`
+    """
+    for attempt in range(max_retries + 1):
+        if limiter:
+            limiter.acquire(tokens)
+        try:
+            return func()
+        except Exception as exc:
+            if attempt >= max_retries or not is_retryable(exc):
+                raise
+            time.sleep(backoff_delay(attempt))
+
+
+async def aretry_call(
+    func: Callable[[], Awaitable[Any]],
+    max_retries: int = 3,
+    limiter: Optional[RateLimiter] = None,
+    tokens: int = 0
+) -> Any:
+    """Équivalent asynchrone de `retry_call` (`func` retourne une coroutine)."""
+    for attempt in range(max_retries + 1):
+        if limiter:
+            await limiter.aacquire(tokens)
+        try:
+            return await func()
+        except Exception as exc:
+            if attempt >= max_retries or not is_retryable(exc):
+                raise
+            await asyncio.sleep(backoff_delay(attempt))
@@ -0,0 +1,211 @@
+"""Registre des clients SDK (OpenAI, Anthropic) partagés par le processus.
+
+Tous les LLMClient d'un même (fournisseur, clé API, URL de base) réutilisent
+le même client SDK, donc le même pool de connexions HTTP keep-alive.
+
+Les appels asynchrones lancés depuis du code synchrone (`run_coroutine`)
+s'exécutent tous dans une boucle asyncio d'arrière-plan, persistante: ses
+clients asynchrones (et leurs connexions) servent d'un appel à l'autre et
+sont fermés à la sortie du processus.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import settings
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import openai
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+try:
+    import anthropic
+    ANTHROPIC_AVAILABLE = True
+except ImportError:
+    ANTHROPIC_AVAILABLE = False
+
+ClientKey = Tuple[str, str, Optional[str]]
+
+_clients: Dict[ClientKey, Any] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[ClientKey, Any]]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+
+
+def _http_options() -> Dict[str, Any]:
+    """Paramètres du pool de connexions (taille, keep-alive, timeouts)."""
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        "timeout": httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout),
+    }
+
+
+def _create_client(provider: str, api_key: str, base_url: Optional[str], asynchronous: bool) -> Any:
+    """Crée un client SDK avec un pool de connexions configuré."""
+    # Les réessais sont gérés par LLMClient (avec le limiteur), pas par le SDK
+    options: Dict[str, Any] = {"api_key": api_key, "max_retries": 0}
+    if base_url:
+        options["base_url"] = base_url
+
+    if provider == "openai":
+        if not OPENAI_AVAILABLE:
+            raise ImportError("Le package 'openai' n'est pas installé.")
+        if HTTPX_AVAILABLE:
+            http_client_class = httpx.AsyncClient if asynchronous else httpx.Client
+            options["http_client"] = http_client_class(**_http_options())
+        client_class = openai.AsyncOpenAI if asynchronous else openai.OpenAI
+
+    elif provider == "anthropic":
+        if not ANTHROPIC_AVAILABLE:
+            raise ImportError("Le package 'anthropic' n'est pas installé.")
+        if HTTPX_AVAILABLE:
+            http_client_class = httpx.AsyncClient if asynchronous else httpx.Client
+            options["http_client"] = http_client_class(**_http_options())
+        client_class = anthropic.AsyncAnthropic if asynchronous else anthropic.Anthropic
+
+    else:
+        raise ValueError(f"Provider inconnu: {provider}")
+
+    return client_class(**options)
+
+
+def get_client(provider: str, api_key: str, base_url: Optional[str] = None) -> Any:
+    """
+    Retourne le client SDK synchrone partagé.
+
+    Args:
+        provider: Fournisseur ("openai" ou "anthropic")
+        api_key: Clé API
+        base_url: URL de base de l'API (None: URL par défaut du SDK)
+
+    Returns:
+        Client OpenAI ou Anthropic commun au processus
+    """
+    key = (provider, api_key, base_url)
+    with _lock:
+        if key not in _clients:
+            _clients[key] = _create_client(provider, api_key, base_url, asynchronous=False)
+        return _clients[key]
+
+
+def get_async_client(provider: str, api_key: str, base_url: Optional[str] = None) -> Any:
+    """
+    Retourne le client SDK asynchrone partagé pour la boucle asyncio courante.
+
+    Les connexions asynchrones étant liées à leur boucle, un client est créé
+    par boucle et libéré avec elle. Dans la boucle d'arrière-plan (cas de
+    `run_coroutine`), le client est donc créé une seule fois.
+
+    Args:
+        provider: Fournisseur ("openai" ou "anthropic")
+        api_key: Clé API
+        base_url: URL de base de l'API (None: URL par défaut du SDK)
+
+    Returns:
+        Client AsyncOpenAI ou AsyncAnthropic
+    """
+    loop = asyncio.get_running_loop()
+    key = (provider, api_key, base_url)
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        if key not in clients:
+            clients[key] = _create_client(provider, api_key, base_url, asynchronous=True)
+        return clients[key]
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Retourne la boucle asyncio d'arrière-plan (démarrée au premier appel).
+
+    Returns:
+        Boucle tournant dans un thread dédié, commune au processus
+    """
+    global _loop, _loop_thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, name="llm-event-loop", daemon=True)
+            _loop_thread.start()
+        return _loop
+
+
+def submit_coroutine(coroutine) -> "concurrent.futures.Future":
+    """
+    Lance une coroutine dans la boucle d'arrière-plan, sans attendre.
+
+    Args:
+        coroutine: Coroutine à exécuter
+
+    Returns:
+        Future (thread-safe) du résultat
+    """
+    loop = get_event_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        # Attendre le résultat depuis la boucle elle-même la bloquerait
+        coroutine.close()
+        raise RuntimeError("Impossible d'attendre une coroutine depuis la boucle d'arrière-plan.")
+    return asyncio.run_coroutine_threadsafe(coroutine, loop)
+
+
+def run_coroutine(coroutine) -> Any:
+    """
+    Exécute une coroutine dans la boucle d'arrière-plan et attend son résultat.
+
+    Args:
+        coroutine: Coroutine à exécuter
+
+    Returns:
+        Résultat de la coroutine
+    """
+    return submit_coroutine(coroutine).result()
+
+
+async def _close_async_clients(clients: Dict[ClientKey, Any]) -> None:
+    for client in clients.values():
+        await client.close()
+
+
+def close_clients() -> None:
+    """Ferme les clients partagés, leurs connexions et la boucle d'arrière-plan."""
+    global _loop, _loop_thread
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+        loop, thread = _loop, _loop_thread
+        _loop = _loop_thread = None
+        async_clients = _async_clients.pop(loop, {}) if loop is not None else {}
+
+    if loop is None or loop.is_closed():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_close_async_clients(async_clients), loop).result(timeout=5)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+
+atexit.register(close_clients)
@@ -0,0 +1,102 @@
+"""Parsing incrémental de réponses JSON reçues en streaming."""
+
+import json
+from typing import Any, List, Optional
+
+
+class JSONArrayStreamParser:
+    """
+    Extrait les éléments d'un tableau JSON au fil de l'eau.
+
+    Le parser reçoit le texte par morceaux (`feed`) et retourne chaque
+    élément du tableau `key` de l'objet racine dès qu'il est fermé, sans
+    attendre la fin de la réponse. Exemple: pour `{"title": "...",
+    "questions": [{...}, {...}]}` et key="questions", chaque question est
+    émise dès son `}` final. Les éléments objets, tableaux et chaînes sont
+    pris en charge.
+    """
+
+    def __init__(self, key: str = "questions"):
+        """
+        Initialise le parser.
+
+        Args:
+            key: Clé (au premier niveau de l'objet racine) du tableau à extraire
+        """
+        self.key = key
+        self.text = ""
+        self.done = False
+
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._element_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Ajoute un morceau de texte.
+
+        Args:
+            chunk: Texte reçu
+
+        Returns:
+            Éléments du tableau complétés par ce morceau
+        """
+        self.text += chunk
+        completed = []
+        text = self.text
+
+        for i in range(self._pos, len(text)):
+            char = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._array_depth is None and self._depth == 1:
+                        self._last_key = text[self._string_start + 1:i]
+                    elif self._in_element_slot() and self._element_start == self._string_start:
+                        completed.append(self._close_element(i))
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+                if self._in_element_slot() and self._element_start is None:
+                    self._element_start = i
+
+            elif char in "{[":
+                if self._in_element_slot() and self._element_start is None:
+                    self._element_start = i
+                self._depth += 1
+                if char == "[" and self._depth == 2 and not self.done and self._last_key == self.key:
+                    self._array_depth = 2
+
+            elif char in "}]":
+                self._depth -= 1
+                if self._array_depth is not None:
+                    if self._depth < self._array_depth:
+                        # Fin du tableau suivi
+                        self._array_depth = None
+                        self.done = True
+                    elif self._in_element_slot() and self._element_start is not None:
+                        completed.append(self._close_element(i))
+
+        self._pos = len(text)
+        return completed
+
+    def _in_element_slot(self) -> bool:
+        """Indique si la position courante est au niveau des éléments du tableau."""
+        return self._array_depth is not None and self._depth == self._array_depth
+
+    def _close_element(self, end: int) -> Any:
+        element = json.loads(self.text[self._element_start:end + 1])
+        self._element_start = None
+        return element
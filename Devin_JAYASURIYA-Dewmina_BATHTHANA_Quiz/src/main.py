@@ -1,14 +1,13 @@
 """Point d'entrée CLI pour le Générateur de Quiz."""
 
 import sys
+import json
 import click
+from contextlib import ExitStack
 from pathlib import Path
 
 from .config import settings
-from .parsers.pdf_parser import PdfParser
-from .parsers.docx_parser import DocxParser
-from .parsers.pptx_parser import PptxParser
-from .parsers.text_parser import TextParser
+from .parsers.registry import get_parser_class, iter_document, supported_extensions
 from .generators.quiz_generator import QuizGenerator
 
 
@@ -27,7 +26,9 @@ def cli():
 @click.option("-t", "--question-type", type=click.Choice(["qcm", "ouvert", "mixed"]), default="mixed", help="Type de questions")
 @click.option("-d", "--difficulty", type=click.Choice(["1", "2", "3", "4", "5"]), default=None, help="Difficulté cible (1-5)")
 @click.option("--api-key", envvar="OPENAI_API_KEY", help="Clé API OpenAI")
-def generate(file_path, output, format, num_questions, question_type, difficulty, api_key):
+@click.option("--stream", is_flag=True, help="Afficher et enregistrer les questions au fur et à mesure")
+@click.option("--no-parse-cache", is_flag=True, help="Parser le document même s'il est inchangé")
+def generate(file_path, output, format, num_questions, question_type, difficulty, api_key, stream, no_parse_cache):
     """
     Génère un quiz à partir d'un document.
 
@@ -37,26 +38,21 @@ def generate(file_path, output, format, num_questions, question_type, difficulty
     output = Path(output)
 
     # Sélectionner le parser en fonction de l'extension
-    extension = file_path.suffix.lower()
-
-    parsers = {
-        ".pdf": PdfParser,
-        ".docx": DocxParser,
-        ".pptx": PptxParser,
-        ".txt": TextParser,
-        ".md": TextParser,
-    }
-
-    if extension not in parsers:
-        click.echo(f"Format de fichier non supporté: {extension}")
-        click.echo("Formats supportés: PDF, DOCX, PPTX, TXT, MD")
+    if get_parser_class(file_path) is None:
+        click.echo(f"Format de fichier non supporté: {file_path.suffix.lower()}")
+        click.echo(f"Formats supportés: {', '.join(supported_extensions())}")
         sys.exit(1)
 
-    # Parse le document
+    # Parse le document au fil de l'eau (résultat réutilisé si le fichier est
+    # inchangé): la génération commence pendant l'extraction des pages suivantes
     click.echo(f"Parsing du fichier: {file_path}")
-    parser = parsers[extension](file_path)
-    sections = parser.parse()
-    click.echo(f"Nombre de sections trouvées: {len(sections)}")
+    sections_read = 0
+
+    def sections():
+        nonlocal sections_read
+        for section in iter_document(file_path, use_cache=not no_parse_cache):
+            sections_read += 1
+            yield section
 
     # Génère le quiz
     click.echo("Génération du quiz avec l'IA...")
@@ -64,17 +60,37 @@ def generate(file_path, output, format, num_questions, question_type, difficulty
     # Configurer le générateur
     generator = QuizGenerator(api_key=api_key)
 
-    # Générer le quiz
-    quiz = generator.generate_quiz_from_sections(
-        sections,
-        num_questions=num_questions,
-        question_types=(
-            ["qcm"] if question_type == "qcm"
-            else ["ouvert"] if question_type == "ouvert"
-            else ["qcm", "ouvert"]
-        ),
-        difficulty=int(difficulty) if difficulty else None
-    )
+    # En streaming, chaque question est affichée et écrite dès qu'elle est complète
+    with ExitStack() as stack:
+        on_question = None
+        if stream:
+            output.mkdir(parents=True, exist_ok=True)
+            partial_path = output / f"quiz_{file_path.stem}.partial.jsonl"
+            partial_file = stack.enter_context(open(partial_path, "w", encoding="utf-8"))
+            received = []
+
+            def on_question(question):
+                received.append(question)
+                partial_file.write(json.dumps(question, ensure_ascii=False) + "\n")
+                partial_file.flush()
+                click.echo(f"  [{len(received)}] {question.get('question', '')}")
+
+        # Générer le quiz
+        quiz = generator.generate_quiz_from_sections(
+            sections(),
+            num_questions=num_questions,
+            question_types=(
+                ["qcm"] if question_type == "qcm"
+                else ["ouvert"] if question_type == "ouvert"
+                else ["qcm", "ouvert"]
+            ),
+            difficulty=int(difficulty) if difficulty else None,
+            on_question=on_question
+        )
+
+    click.echo(f"Nombre de sections trouvées: {sections_read}")
+    if stream:
+        click.echo(f"Questions reçues en streaming: {partial_path}")
 
     # Exporter le quiz
     output_path = generator.export_quiz(quiz, format=format, output_path=output)
@@ -87,6 +103,80 @@ def generate(file_path, output, format, num_questions, question_type, difficulty
     click.echo(f"  - Format: {format}")
 
 
+@cli.command()
+@click.argument("directory", type=click.Path(exists=True, file_okay=False))
+@click.option("-o", "--output", type=click.Path(), default="./output", help="Dossier de sortie")
+@click.option("-f", "--format", type=click.Choice(["json", "markdown", "anki", "quizlet"]), default="json", help="Format de sortie")
+@click.option("-n", "--num-questions", type=int, default=None, help="Nombre de questions par document")
+@click.option("-d", "--difficulty", type=click.Choice(["1", "2", "3", "4", "5"]), default=None, help="Difficulté cible (1-5)")
+@click.option("--api-key", envvar="OPENAI_API_KEY", help="Clé API OpenAI")
+@click.option("--manifest", type=click.Path(dir_okay=False), default=None, help="Manifeste de reprise (défaut: OUTPUT/manifest.json)")
+@click.option("--workers", type=int, default=None, help="Processus de parsing (défaut: nombre de CPU)")
+@click.option("--concurrency", type=int, default=None, help="Documents générés simultanément")
+@click.option("--no-recursive", is_flag=True, help="Ne pas parcourir les sous-dossiers")
+def batch(directory, output, format, num_questions, difficulty, api_key, manifest, workers, concurrency, no_recursive):
+    """
+    Génère un quiz pour chaque document d'un dossier.
+
+    Les documents déjà traités (d'après le manifeste) sont ignorés: un
+    traitement interrompu reprend là où il s'était arrêté.
+
+    DIRECTORY: Dossier contenant les documents
+    """
+    from .batch import BatchManifest, BatchRunner, discover_documents
+
+    output = Path(output)
+    paths = discover_documents(directory, recursive=not no_recursive)
+    if not paths:
+        click.echo(f"Aucun document pris en charge dans {directory}")
+        return
+
+    manifest = BatchManifest(manifest or output / "manifest.json")
+    click.echo(f"Documents trouvés: {len(paths)}")
+
+    def on_progress(progress):
+        eta = progress["eta"]
+        click.echo(
+            f"  [{progress['finished']}/{progress['total']}] {progress['status']:6} {progress['document']}"
+            f" - {progress['throughput'] * 60:.1f} doc/min"
+            + (f", reste ~{eta:.0f}s" if eta is not None else "")
+        )
+
+    runner = BatchRunner(
+        QuizGenerator(api_key=api_key),
+        root=directory,
+        output=output,
+        manifest=manifest,
+        format=format,
+        parse_workers=workers,
+        concurrency=concurrency or settings.llm_max_concurrency,
+        on_progress=on_progress,
+        num_questions=num_questions,
+        difficulty=int(difficulty) if difficulty else None
+    )
+    stats = runner.run(paths)
+
+    click.echo(f"\nTerminés: {stats['done']}, en échec: {stats['failed']}, déjà traités: {stats['skipped']}")
+    click.echo(f"Manifeste: {manifest.path}")
+
+
+@cli.command("convert-store")
+@click.argument("src", type=click.Path(exists=True, dir_okay=False))
+@click.argument("dst", type=click.Path(file_okay=False))
+@click.option("--dtype", type=click.Choice(["float32", "float16"]), default="float32", help="Type de stockage des embeddings")
+def convert_store(src, dst, dtype):
+    """
+    Convertit un ancien vector store JSON au format binaire.
+
+    SRC: Fichier JSON produit par l'ancien VectorStore.save
+    DST: Dossier de destination
+    """
+    from .rag.persistence import convert_legacy_store
+
+    path = convert_legacy_store(src, dst, dtype=dtype)
+    click.echo(f"Store converti: {path}")
+
+
 @cli.command()
 def config():
     """Affiche la configuration actuelle."""
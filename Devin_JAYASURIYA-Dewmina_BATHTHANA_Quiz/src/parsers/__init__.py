@@ -4,7 +4,26 @@
 # Import conditionnel pour éviter les erreurs avec python-docx sur Windows
 try:
     from .base_parser import BaseParser
+    from .pdf_parser import PdfParser
+    from .docx_parser import DocxParser
+    from .pptx_parser import PptxParser
+    from .text_parser import TextParser
+    from .cache import ParseCache
+    from .registry import register_parser, get_parser_class, create_parser, parse_document, iter_document, supported_extensions
 except ImportError:
     pass
 
-__all__ = ["BaseParser"]
+__all__ = [
+    "BaseParser",
+    "PdfParser",
+    "DocxParser",
+    "PptxParser",
+    "TextParser",
+    "ParseCache",
+    "register_parser",
+    "get_parser_class",
+    "create_parser",
+    "parse_document",
+    "iter_document",
+    "supported_extensions",
+]
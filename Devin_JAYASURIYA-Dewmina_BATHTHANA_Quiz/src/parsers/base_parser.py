@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 
 
 class BaseParser(ABC):
@@ -15,6 +15,17 @@ class BaseParser(ABC):
     def parse(self) -> List[Dict[str, Any]]:
         """Parse le document et retourne une liste de sections."""
 
+    def iter_sections(self) -> Iterator[Dict[str, Any]]:
+        """
+        Itère sur les sections du document au fil du parsing.
+
+        Permet au chunking et aux embeddings de consommer les premières
+        sections pendant que les suivantes sont extraites. Par défaut, délègue
+        à `parse()`; les parseurs de gros documents la redéfinissent pour ne
+        pas tout garder en mémoire.
+        """
+        yield from self.parse()
+
     @abstractmethod
     def extract_text(self) -> str:
         """Extract tout le texte du document."""
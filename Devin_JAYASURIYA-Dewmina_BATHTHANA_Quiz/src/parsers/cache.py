@@ -0,0 +1,181 @@
+"""Cache des résultats de parsing (SQLite), indexé par empreinte et date de modification."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config import settings
+
+# À incrémenter quand le format des sections produites par les parseurs change
+PARSE_CACHE_VERSION = 2
+
+
+def _compact(section: Dict[str, Any]) -> Dict[str, Any]:
+    """Section à stocker: "text", copie de "content" dans les parseurs, n'est stocké qu'une fois."""
+    if "text" in section and section.get("text") == section.get("content"):
+        return {key: value for key, value in section.items() if key != "text"}
+    return section
+
+
+def _expand(section: Dict[str, Any]) -> Dict[str, Any]:
+    """Section lue: restaure "text" à partir de "content"."""
+    if "text" not in section and "content" in section:
+        section["text"] = section["content"]
+    return section
+
+
+def file_digest(file_path: str | Path, block_size: int = 1 << 20) -> str:
+    """Empreinte SHA-256 du contenu d'un fichier (lu par blocs)."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_key(file_path: str | Path, parser_name: str, digest: Optional[str] = None) -> str:
+    """
+    Calcule la clé de cache du parsing d'un fichier.
+
+    Args:
+        file_path: Fichier à parser
+        parser_name: Nom de la classe de parseur utilisée
+        digest: Empreinte déjà calculée par `file_digest` (défaut: calculée ici)
+
+    Returns:
+        Clé dérivée du contenu, de la date de modification et du parseur
+    """
+    mtime = Path(file_path).stat().st_mtime_ns
+    payload = json.dumps([PARSE_CACHE_VERSION, parser_name, digest or file_digest(file_path), mtime])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+    """
+    Cache persistant des sections extraites de chaque document, avec éviction LRU.
+
+    Quand le nombre de documents dépasse `max_entries`, les moins récemment
+    utilisés sont supprimés.
+    """
+
+    def __init__(self, path: str | Path = ".cache/parsed.sqlite", max_entries: int = 1000, timeout: float = 30.0):
+        """
+        Initialise le cache.
+
+        Args:
+            path: Fichier SQLite (":memory:" pour un cache non persistant)
+            max_entries: Nombre max de documents conservés
+            timeout: Attente max (secondes) d'un verrou tenu par un autre
+                processus (ex: workers du traitement par lot)
+        """
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=timeout, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(parsed)")}
+        if columns and "last_access" not in columns:
+            # Table d'une version précédente (sans date d'accès): le cache est reconstruit
+            self._conn.execute("DROP TABLE parsed")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS parsed (
+                key TEXT PRIMARY KEY,
+                sections TEXT NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_parsed_last_access ON parsed(last_access)")
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM parsed").fetchone()[0]
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Récupère les sections d'un document déjà parsé.
+
+        Args:
+            key: Clé calculée par `parse_key`
+
+        Returns:
+            Sections, ou None si absentes
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT sections FROM parsed WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE parsed SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return [_expand(section) for section in json.loads(row[0])]
+
+    def put(self, key: str, sections: List[Dict[str, Any]]) -> None:
+        """
+        Enregistre les sections d'un document.
+
+        Args:
+            key: Clé calculée par `parse_key`
+            sections: Sections produites par le parseur
+        """
+        payload = json.dumps([_compact(section) for section in sections], ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parsed (key, sections, last_access) VALUES (?, ?, ?)",
+                (key, payload, time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Supprime les documents les moins récemment utilisés au-delà de max_entries."""
+        count = self._conn.execute("SELECT COUNT(*) FROM parsed").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM parsed WHERE key IN "
+                "(SELECT key FROM parsed ORDER BY last_access ASC LIMIT ?)",
+                (excess,)
+            )
+
+    def clear(self) -> None:
+        """Vide le cache."""
+        with self._lock:
+            self._conn.execute("DELETE FROM parsed")
+            self._conn.commit()
+            self.hits = self.misses = 0
+
+
+_default_cache: Optional[ParseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_parse_cache() -> Optional[ParseCache]:
+    """
+    Retourne le cache de parsing partagé du processus.
+
+    Returns:
+        Instance partagée, ou None si PARSE_CACHE_PATH est vide
+    """
+    global _default_cache
+
+    if not settings.parse_cache_path:
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ParseCache(
+                settings.parse_cache_path,
+                max_entries=settings.parse_cache_max_entries
+            )
+    return _default_cache
@@ -0,0 +1,76 @@
+"""Parseur pour les documents Word (DOCX)."""
+
+from typing import List, Dict, Any
+
+from .base_parser import BaseParser
+
+try:
+    import docx
+    DOCX_AVAILABLE = True
+except ImportError:
+    DOCX_AVAILABLE = False
+
+
+class DocxParser(BaseParser):
+    """
+    Parseur pour les documents Word.
+
+    Le document est découpé en sections selon ses titres (styles « Heading »
+    ou « Titre »); le texte des tableaux est rattaché à la dernière section.
+    """
+
+    def parse(self) -> List[Dict[str, Any]]:
+        """Parse le document et retourne une section par titre."""
+        document = self._open()
+
+        sections = []
+        title = self.file_path.stem
+        lines: List[str] = []
+
+        def flush():
+            text = "\n".join(lines)
+            if text.strip():
+                sections.append({
+                    "section": len(sections) + 1,
+                    "title": title,
+                    "content": text,
+                    "text": text
+                })
+
+        for paragraph in document.paragraphs:
+            text = paragraph.text.strip()
+            if not text:
+                continue
+            if self._is_heading(paragraph):
+                flush()
+                title = text
+                lines = []
+            else:
+                lines.append(text)
+
+        for table in document.tables:
+            for row in table.rows:
+                cells = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+                if cells:
+                    lines.append(" | ".join(cells))
+
+        flush()
+        return sections
+
+    def extract_text(self) -> str:
+        """Extract tout le texte du document."""
+        return "\n\n".join(
+            f"{section['title']}\n{section['content']}" for section in self.parse()
+        )
+
+    def _open(self):
+        if not DOCX_AVAILABLE:
+            raise ImportError("Le package 'python-docx' n'est pas installé.")
+        if not self.validate():
+            raise FileNotFoundError(f"Le fichier {self.file_path} n'existe pas.")
+        return docx.Document(str(self.file_path))
+
+    @staticmethod
+    def _is_heading(paragraph) -> bool:
+        style = (paragraph.style.name if paragraph.style is not None else "") or ""
+        return style.startswith(("Heading", "Titre", "Title"))
@@ -1,45 +1,168 @@
 """Parseur pour les documents PDF."""
 
+import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import PyPDF2
 
+from ..config import settings
 from .base_parser import BaseParser
 
 
+def _page_section(page_num: int, text: str) -> Dict[str, Any]:
+    """Section d'une page ("content" et "text" référencent la même chaîne)."""
+    return {
+        "page": page_num,
+        "content": text,
+        "text": text
+    }
+
+
+def _extract_pages(file_path: str, start: int, end: int) -> List[str]:
+    """
+    Extrait le texte des pages [start, end) (exécuté dans un processus fils).
+
+    Args:
+        file_path: Chemin du PDF
+        start: Index de la première page (0-based)
+        end: Index de fin (exclu)
+
+    Returns:
+        Texte de chaque page de l'intervalle
+    """
+    with open(file_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
 class PdfParser(BaseParser):
-    """Parseur pour les documents PDF."""
+    """
+    Parseur pour les documents PDF.
+
+    Le document est lu une seule fois: `parse()` et `extract_text()` partagent
+    le même résultat. Au-delà de `pdf_parallel_min_pages` pages, l'extraction
+    est répartie par plages de pages sur un pool de processus.
+    """
+
+    def __init__(self, file_path: str | Path, max_workers: Optional[int] = None):
+        """
+        Initialise le parseur.
+
+        Args:
+            file_path: Chemin du PDF
+            max_workers: Nombre de processus (défaut: configuration ou nombre de CPU)
+        """
+        super().__init__(file_path)
+        self.max_workers = max_workers or settings.parser_max_workers or os.cpu_count() or 1
+        self._pages: Optional[List[str]] = None
 
     def parse(self) -> List[Dict[str, Any]]:
         """Parse le PDF et retourne une liste de sections."""
+        return [_page_section(page_num, text) for page_num, text in enumerate(self._load_pages(), 1)]
+
+    def iter_sections(self) -> Iterator[Dict[str, Any]]:
+        """
+        Itère sur les pages dans l'ordre, au fil de l'extraction.
+
+        Les pages ne sont pas conservées: seules quelques plages sont en cours
+        d'extraction à la fois (deux par processus), ce qui borne la mémoire
+        et permet de traiter les premières pages pendant l'extraction des
+        suivantes.
+        """
+        if self._pages is not None:
+            yield from self.parse()
+            return
+
         if not self.validate():
             raise FileNotFoundError(f"Le fichier {self.file_path} n'existe pas.")
 
-        pages_content = []
+        num_pages = self._num_pages()
+        if self.max_workers <= 1 or num_pages < settings.pdf_parallel_min_pages:
+            yield from self._iter_serial(0)
+            return
+
+        shards = iter(self._shards(num_pages))
+        path = str(self.file_path)
+        page_num = 1
 
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                window = deque(
+                    executor.submit(_extract_pages, path, start, end)
+                    for start, end in _take(shards, 2 * self.max_workers)
+                )
+                while window:
+                    texts = window.popleft().result()
+                    for start, end in _take(shards, 1):
+                        window.append(executor.submit(_extract_pages, path, start, end))
+                    for text in texts:
+                        yield _page_section(page_num, text)
+                        page_num += 1
+        except (BrokenProcessPool, OSError):
+            # Pool de processus indisponible: pages restantes extraites séquentiellement
+            yield from self._iter_serial(page_num - 1)
+
+    def _iter_serial(self, start: int) -> Iterator[Dict[str, Any]]:
+        """Itère sur les pages à partir de l'index `start` (0-based), dans ce processus."""
         with open(self.file_path, 'rb') as file:
             reader = PyPDF2.PdfReader(file)
-            for page_num, page in enumerate(reader.pages, 1):
-                text = page.extract_text() or ""
-                pages_content.append({
-                    "page": page_num,
-                    "content": text,
-                    "text": text
-                })
-
-        return pages_content
+            for index in range(start, len(reader.pages)):
+                yield _page_section(index + 1, reader.pages[index].extract_text() or "")
 
     def extract_text(self) -> str:
         """Extract tout le texte du document."""
+        return "\n".join(self._load_pages())
+
+    def _load_pages(self) -> List[str]:
+        """Extrait (une seule fois) le texte de toutes les pages."""
+        if self._pages is not None:
+            return self._pages
+
         if not self.validate():
             raise FileNotFoundError(f"Le fichier {self.file_path} n'existe pas.")
 
-        text = []
+        num_pages = self._num_pages()
+
+        if self.max_workers > 1 and num_pages >= settings.pdf_parallel_min_pages:
+            try:
+                self._pages = self._extract_parallel(num_pages)
+            except (BrokenProcessPool, OSError):
+                # Pool de processus indisponible: extraction séquentielle
+                self._pages = None
+
+        if self._pages is None:
+            self._pages = _extract_pages(str(self.file_path), 0, num_pages)
 
+        return self._pages
+
+    def _num_pages(self) -> int:
         with open(self.file_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            for page in reader.pages:
-                page_text = page.extract_text() or ""
-                text.append(page_text)
+            return len(PyPDF2.PdfReader(file).pages)
+
+    def _extract_parallel(self, num_pages: int) -> List[str]:
+        """Répartit les pages par plages sur un pool de processus, dans l'ordre."""
+        shards = self._shards(num_pages)
+        path = str(self.file_path)
+
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(shards))) as executor:
+            results = executor.map(
+                _extract_pages,
+                [path] * len(shards),
+                [start for start, _ in shards],
+                [end for _, end in shards]
+            )
+            return [text for shard in results for text in shard]
+
+    def _shards(self, num_pages: int) -> List[Tuple[int, int]]:
+        """Plages de pages: quelques plages par processus pour équilibrer la charge."""
+        size = max(1, math.ceil(num_pages / (self.max_workers * 4)))
+        return [(start, min(start + size, num_pages)) for start in range(0, num_pages, size)]
+
 
-        return "\n".join(text)
+def _take(iterator: Iterator, n: int) -> List:
+    """Consomme au plus n éléments d'un itérateur."""
+    return [item for _, item in zip(range(n), iterator)]
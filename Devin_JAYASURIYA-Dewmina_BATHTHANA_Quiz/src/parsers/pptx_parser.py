@@ -0,0 +1,62 @@
+"""Parseur pour les présentations PowerPoint (PPTX)."""
+
+from typing import List, Dict, Any
+
+from .base_parser import BaseParser
+
+try:
+    from pptx import Presentation
+    PPTX_AVAILABLE = True
+except ImportError:
+    PPTX_AVAILABLE = False
+
+
+class PptxParser(BaseParser):
+    """Parseur pour les présentations: une section par diapositive (notes incluses)."""
+
+    def parse(self) -> List[Dict[str, Any]]:
+        """Parse la présentation et retourne une section par diapositive."""
+        if not PPTX_AVAILABLE:
+            raise ImportError("Le package 'python-pptx' n'est pas installé.")
+        if not self.validate():
+            raise FileNotFoundError(f"Le fichier {self.file_path} n'existe pas.")
+
+        presentation = Presentation(str(self.file_path))
+        sections = []
+
+        for slide_num, slide in enumerate(presentation.slides, 1):
+            title_shape = slide.shapes.title
+            title = title_shape.text_frame.text.strip() if title_shape is not None else ""
+
+            lines = []
+            for shape in slide.shapes:
+                if title_shape is not None and shape.shape_id == title_shape.shape_id:
+                    continue
+                if shape.has_text_frame:
+                    lines.extend(p.strip() for p in shape.text_frame.text.splitlines() if p.strip())
+                elif getattr(shape, "has_table", False) and shape.has_table:
+                    for row in shape.table.rows:
+                        cells = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+                        if cells:
+                            lines.append(" | ".join(cells))
+
+            if slide.has_notes_slide:
+                notes = slide.notes_slide.notes_text_frame.text.strip()
+                if notes:
+                    lines.append(notes)
+
+            text = "\n".join(lines)
+            sections.append({
+                "slide": slide_num,
+                "title": title or f"Diapositive {slide_num}",
+                "content": text,
+                "text": text
+            })
+
+        return sections
+
+    def extract_text(self) -> str:
+        """Extract tout le texte de la présentation."""
+        return "\n\n".join(
+            f"{section['title']}\n{section['content']}" for section in self.parse()
+        )
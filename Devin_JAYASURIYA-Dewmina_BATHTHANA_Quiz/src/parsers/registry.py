@@ -0,0 +1,175 @@
+"""Registre des parseurs par extension et type MIME."""
+
+import mimetypes
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type
+
+from .base_parser import BaseParser
+from .cache import ParseCache, get_default_parse_cache, parse_key
+from .docx_parser import DocxParser
+from .pdf_parser import PdfParser
+from .pptx_parser import PptxParser
+from .text_parser import TextParser
+
+_by_extension: Dict[str, Type[BaseParser]] = {}
+_by_mimetype: Dict[str, Type[BaseParser]] = {}
+
+
+def register_parser(
+    parser_class: Type[BaseParser],
+    extensions: Iterable[str] = (),
+    mime_types: Iterable[str] = ()
+) -> None:
+    """
+    Enregistre un parseur.
+
+    Args:
+        parser_class: Classe dérivée de BaseParser
+        extensions: Extensions prises en charge (ex: ".pdf")
+        mime_types: Types MIME pris en charge (ex: "application/pdf")
+    """
+    for extension in extensions:
+        _by_extension[extension.lower()] = parser_class
+    for mimetype in mime_types:
+        _by_mimetype[mimetype.lower()] = parser_class
+
+
+def get_parser_class(file_path: str | Path) -> Optional[Type[BaseParser]]:
+    """
+    Trouve le parseur d'un fichier, par extension puis par type MIME.
+
+    Args:
+        file_path: Chemin du document
+
+    Returns:
+        Classe de parseur, ou None si le format n'est pas pris en charge
+    """
+    path = Path(file_path)
+    parser_class = _by_extension.get(path.suffix.lower())
+    if parser_class is None:
+        mimetype, _ = mimetypes.guess_type(path.name)
+        parser_class = _by_mimetype.get((mimetype or "").lower())
+    return parser_class
+
+
+def supported_extensions() -> List[str]:
+    """Extensions prises en charge."""
+    return sorted(_by_extension)
+
+
+def create_parser(file_path: str | Path, **kwargs) -> BaseParser:
+    """
+    Crée le parseur adapté à un fichier.
+
+    Args:
+        file_path: Chemin du document
+        **kwargs: Paramètres du parseur (ex: max_workers pour PdfParser)
+
+    Returns:
+        Parseur du document
+    """
+    parser_class = get_parser_class(file_path)
+    if parser_class is None:
+        raise ValueError(f"Format de fichier non supporté: {Path(file_path).suffix}")
+    return parser_class(file_path, **kwargs)
+
+
+def parse_document(
+    file_path: str | Path,
+    cache: Optional[ParseCache] = None,
+    use_cache: bool = True,
+    digest: Optional[str] = None,
+    **kwargs
+) -> List[Dict[str, Any]]:
+    """
+    Parse un document, en réutilisant le résultat d'un parsing précédent.
+
+    Un fichier inchangé (même contenu et même date de modification) n'est
+    pas parsé à nouveau.
+
+    Args:
+        file_path: Chemin du document
+        cache: Cache de parsing (défaut: cache partagé configuré)
+        use_cache: Utiliser le cache
+        digest: Empreinte du fichier si elle est déjà connue (évite de le relire)
+        **kwargs: Paramètres du parseur
+
+    Returns:
+        Sections du document
+    """
+    parser = create_parser(file_path, **kwargs)
+    if not parser.validate():
+        raise FileNotFoundError(f"Le fichier {file_path} n'existe pas.")
+
+    cache = (cache if cache is not None else get_default_parse_cache()) if use_cache else None
+    if cache is None:
+        return parser.parse()
+
+    key = parse_key(file_path, type(parser).__name__, digest=digest)
+    sections = cache.get(key)
+    if sections is None:
+        sections = parser.parse()
+        cache.put(key, sections)
+    return sections
+
+
+def iter_document(
+    file_path: str | Path,
+    cache: Optional[ParseCache] = None,
+    use_cache: bool = True,
+    digest: Optional[str] = None,
+    **kwargs
+) -> Iterator[Dict[str, Any]]:
+    """
+    Itère sur les sections d'un document au fil du parsing (`iter_sections`).
+
+    Les premières sections peuvent être traitées (chunking, embeddings,
+    appels LLM) pendant que les suivantes sont extraites. Un document déjà
+    en cache est relu depuis le cache; sinon, ses sections sont mises en
+    cache une fois l'itération terminée (sans cache, elles ne sont pas
+    conservées).
+
+    Args:
+        file_path: Chemin du document
+        cache: Cache de parsing (défaut: cache partagé configuré)
+        use_cache: Utiliser le cache
+        digest: Empreinte du fichier si elle est déjà connue (évite de le relire)
+        **kwargs: Paramètres du parseur
+
+    Yields:
+        Sections du document, dans l'ordre
+    """
+    parser = create_parser(file_path, **kwargs)
+    if not parser.validate():
+        raise FileNotFoundError(f"Le fichier {file_path} n'existe pas.")
+
+    cache = (cache if cache is not None else get_default_parse_cache()) if use_cache else None
+    if cache is None:
+        yield from parser.iter_sections()
+        return
+
+    key = parse_key(file_path, type(parser).__name__, digest=digest)
+    sections = cache.get(key)
+    if sections is not None:
+        yield from sections
+        return
+
+    sections = []
+    for section in parser.iter_sections():
+        sections.append(section)
+        yield section
+    cache.put(key, sections)
+
+
+register_parser(PdfParser, [".pdf"], ["application/pdf"])
+register_parser(
+    DocxParser,
+    [".docx"],
+    ["application/vnd.openxmlformats-officedocument.wordprocessingml.document"]
+)
+register_parser(
+    PptxParser,
+    [".pptx"],
+    ["application/vnd.openxmlformats-officedocument.presentationml.presentation"]
+)
+register_parser(TextParser, [".txt", ".md", ".markdown"], ["text/plain", "text/markdown"])
@@ -0,0 +1,47 @@
+"""Parseur pour les fichiers texte et Markdown."""
+
+import re
+from typing import List, Dict, Any
+
+from .base_parser import BaseParser
+
+# Titres Markdown (« # Titre » à « ###### Titre »)
+HEADING_PATTERN = re.compile(r"^#{1,6}\s+(.+?)\s*#*\s*$", re.MULTILINE)
+
+
+class TextParser(BaseParser):
+    """
+    Parseur pour les fichiers texte (.txt) et Markdown (.md).
+
+    Les fichiers contenant des titres Markdown sont découpés en une section
+    par titre; sinon le fichier forme une seule section.
+    """
+
+    def parse(self) -> List[Dict[str, Any]]:
+        """Parse le fichier et retourne une section par titre."""
+        text = self.extract_text()
+
+        headings = list(HEADING_PATTERN.finditer(text))
+        bounds = [(self.file_path.stem, 0, headings[0].start() if headings else len(text))]
+        bounds += [
+            (match.group(1), match.end(), headings[i + 1].start() if i + 1 < len(headings) else len(text))
+            for i, match in enumerate(headings)
+        ]
+
+        sections = []
+        for title, start, end in bounds:
+            content = text[start:end].strip()
+            if content:
+                sections.append({
+                    "section": len(sections) + 1,
+                    "title": title,
+                    "content": content,
+                    "text": content
+                })
+        return sections
+
+    def extract_text(self) -> str:
+        """Extract tout le texte du fichier."""
+        if not self.validate():
+            raise FileNotFoundError(f"Le fichier {self.file_path} n'existe pas.")
+        return self.file_path.read_text(encoding="utf-8", errors="replace")
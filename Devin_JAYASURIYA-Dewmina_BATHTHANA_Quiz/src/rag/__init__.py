@@ -1,15 +1,48 @@
 """Module RAG pour extraction d'information."""
 
-from .extractor import RAGExtractor, chunk_text, chunk_by_sentences
+from .extractor import RAGExtractor, chunk_text, chunk_by_sentences, iter_chunks, merge_concepts
+from .chunker import chunk_document, count_tokens
+from .dedup import NearDuplicateFilter, deduplicate_texts, strip_repeated_lines, iter_strip_repeated_lines, cluster_near_duplicates, deduplicate_questions, QuestionDeduplicator
+from .index import FlatIndex, IVFIndex, HNSWIndex, create_index
+from .embeddings import OpenAIEmbedder, CachedEmbedder, HashingEmbedder
+from .cache import EmbeddingCache
 from .vectorstore import VectorStore
-from .reranker import SimpleReranker, LLMReranker, create_reranker
+from .persistence import convert_legacy_store
+from .reranker import SimpleReranker, HybridReranker, LLMReranker, create_reranker
+from .lexical import tokenize, bm25_scores, reciprocal_rank_fusion
+from .metadata import MetadataIndex
 
 __all__ = [
     "RAGExtractor",
     "chunk_text",
     "chunk_by_sentences",
+    "iter_chunks",
+    "chunk_document",
+    "count_tokens",
+    "NearDuplicateFilter",
+    "deduplicate_texts",
+    "strip_repeated_lines",
+    "iter_strip_repeated_lines",
+    "cluster_near_duplicates",
+    "deduplicate_questions",
+    "QuestionDeduplicator",
+    "merge_concepts",
     "VectorStore",
+    "MetadataIndex",
+    "FlatIndex",
+    "IVFIndex",
+    "HNSWIndex",
+    "create_index",
+    "OpenAIEmbedder",
+    "CachedEmbedder",
+    "HashingEmbedder",
+    "EmbeddingCache",
+    "convert_legacy_store",
     "SimpleReranker",
+    "HybridReranker",
     "LLMReranker",
+    "tokenize",
+    "bm25_scores",
+    "reciprocal_rank_fusion",
     "create_reranker",
 ]
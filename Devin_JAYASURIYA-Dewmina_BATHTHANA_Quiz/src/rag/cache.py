@@ -0,0 +1,196 @@
+"""Cache persistant d'embeddings (SQLite), adressé par contenu."""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..config import settings
+
+# Taille max des listes de paramètres SQL (limite SQLite: 999 par défaut)
+_SQL_BATCH = 500
+
+
+def normalize_text(text: str) -> str:
+    """Normalise un texte avant hachage (espaces redondants supprimés)."""
+    return " ".join(text.split())
+
+
+def embedding_key(model: str, text: str) -> str:
+    """
+    Calcule la clé de cache d'un texte.
+
+    Args:
+        model: Modèle d'embedding
+        text: Texte encodé
+
+    Returns:
+        Empreinte SHA-256 de (modèle, texte normalisé)
+    """
+    payload = f"{model}\0{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Cache d'embeddings sur disque avec éviction LRU.
+
+    Les vecteurs sont stockés en float32 dans une base SQLite, indexés par
+    (modèle, empreinte du texte normalisé). Quand le nombre d'entrées dépasse
+    `max_entries`, les moins récemment utilisées sont supprimées.
+    """
+
+    def __init__(self, path: str | Path = ".cache/embeddings.sqlite", max_entries: int = 100_000):
+        """
+        Initialise le cache.
+
+        Args:
+            path: Fichier SQLite (":memory:" pour un cache non persistant)
+            max_entries: Nombre max d'embeddings conservés
+        """
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON embeddings(last_access)")
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Récupère les embeddings en cache.
+
+        Args:
+            model: Modèle d'embedding
+            texts: Textes recherchés
+
+        Returns:
+            Liste alignée sur `texts`: le vecteur, ou None si absent
+        """
+        keys = [embedding_key(model, text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            unique_keys = list(dict.fromkeys(keys))
+            for i in range(0, len(unique_keys), _SQL_BATCH):
+                batch = unique_keys[i:i + _SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+
+            results = [found.get(key) for key in keys]
+            hits = sum(vector is not None for vector in results)
+            self.hits += hits
+            self.misses += len(results) - hits
+
+        return results
+
+    def put_many(self, model: str, texts: List[str], vectors: np.ndarray) -> None:
+        """
+        Ajoute des embeddings au cache.
+
+        Args:
+            model: Modèle d'embedding
+            texts: Textes encodés
+            vectors: Matrice (len(texts), d) des embeddings
+        """
+        now = time.time()
+        rows = [
+            (embedding_key(model, text), model, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for text, vector in zip(texts, vectors)
+        ]
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, last_access) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Supprime les entrées les moins récemment utilisées au-delà de max_entries."""
+        count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+                (excess,)
+            )
+
+    def stats(self) -> Dict[str, float]:
+        """Statistiques d'utilisation du cache."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        """Vide le cache et remet les compteurs à zéro."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+
+_default_cache: Optional[EmbeddingCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_embedding_cache() -> Optional[EmbeddingCache]:
+    """
+    Retourne le cache d'embeddings partagé du processus (selon la configuration).
+
+    Returns:
+        Instance partagée, ou None si le cache est désactivé (EMBEDDING_CACHE_PATH vide)
+    """
+    global _default_cache
+
+    if not settings.embedding_cache_path:
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = EmbeddingCache(
+                settings.embedding_cache_path,
+                max_entries=settings.embedding_cache_max_entries
+            )
+    return _default_cache
@@ -0,0 +1,240 @@
+"""Découpage structuré des textes en chunks sous un budget de tokens.
+
+Le texte est parcouru une seule fois: les lignes de titre, les paragraphes
+puis les phrases forment des unités dont les tokens sont comptés une fois.
+Les unités sont ensuite regroupées jusqu'au budget, en coupant de préférence
+aux titres, puis aux paragraphes, puis aux phrases (et aux mots en dernier
+recours). Chaque chunk est une tranche exacte du texte source, avec ses
+positions de début et de fin pour les citations.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Titres Markdown (« ## Titre ») sur une ligne
+HEADING_PATTERN = re.compile(r"#{1,6}\s+\S.*")
+# Titres numérotés (« 2.1 Titre »): majuscule après le numéro, sans ponctuation finale
+NUMBERED_HEADING_PATTERN = re.compile(r"\d+(?:\.\d+)*\.?\s+[^\W\d_][^.!?]{0,78}[^.!?:;,]")
+# Au-delà, une ligne numérotée est du texte (ex: ligne de PDF coupée « 3 millions de ... »)
+MAX_NUMBERED_HEADING_WORDS = 10
+# Fin de phrase: ponctuation finale suivie d'espaces
+SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?…])\s+")
+# Mots (avec leurs espaces), pour couper une phrase trop longue
+WORD_PATTERN = re.compile(r"\S+\s*")
+# Tokens approchés quand tiktoken n'est pas installé
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+TIKTOKEN_ENCODING = "cl100k_base"
+
+_encoding = None
+
+# (début, fin, tokens, titre courant, début de bloc, est un titre)
+Unit = Tuple[int, int, int, Optional[str], bool, bool]
+
+
+def count_tokens(text: str) -> int:
+    """
+    Compte les tokens d'un texte.
+
+    Utilise tiktoken s'il est installé, sinon une approximation par
+    expression régulière (mots et ponctuation).
+
+    Args:
+        text: Texte à mesurer
+
+    Returns:
+        Nombre de tokens
+    """
+    global _encoding
+
+    if TIKTOKEN_AVAILABLE:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding(TIKTOKEN_ENCODING)
+        return len(_encoding.encode(text, disallowed_special=()))
+    return len(TOKEN_PATTERN.findall(text))
+
+
+def _segment(text: str, count: Callable[[str], int], max_tokens: int) -> List[Unit]:
+    """
+    Découpe le texte en unités (titres et phrases) en un seul passage.
+
+    Une unité « début de bloc » commence un titre ou un paragraphe; aucune
+    unité ne dépasse `max_tokens` (les phrases trop longues sont coupées aux
+    mots, puis aux caractères).
+    """
+    units: List[Unit] = []
+    heading: Optional[str] = None
+    paragraph_start: Optional[int] = None
+    paragraph_end = 0
+
+    def add(start: int, end: int, block_start: bool, is_heading: bool = False) -> None:
+        tokens = count(text[start:end])
+        if tokens <= max_tokens:
+            units.append((start, end, tokens, heading, block_start, is_heading))
+            return
+        for word in WORD_PATTERN.finditer(text, start, end):
+            word_start, word_end = word.start(), word.end()
+            word_tokens = count(text[word_start:word_end])
+            if word_tokens <= max_tokens:
+                units.append((word_start, word_end, word_tokens, heading, block_start, is_heading))
+            else:
+                # Mot plus long que le budget: coupe proportionnelle aux caractères
+                step = max(1, (word_end - word_start) * max_tokens // word_tokens)
+                for piece_start in range(word_start, word_end, step):
+                    piece_end = min(piece_start + step, word_end)
+                    units.append((piece_start, piece_end, count(text[piece_start:piece_end]), heading, block_start, is_heading))
+                    block_start = False
+            block_start = False
+
+    def flush_paragraph() -> None:
+        nonlocal paragraph_start
+        if paragraph_start is None:
+            return
+        block_start = True
+        sentence_start = paragraph_start
+        for match in SENTENCE_END_PATTERN.finditer(text, paragraph_start, paragraph_end):
+            add(sentence_start, match.start(), block_start)
+            block_start = False
+            sentence_start = match.end()
+        if sentence_start < paragraph_end:
+            add(sentence_start, paragraph_end, block_start)
+        paragraph_start = None
+
+    pos = 0
+    length = len(text)
+    # Une ligne numérotée n'est un titre qu'après une ligne vide ou une fin de phrase
+    at_boundary = True
+    while pos < length:
+        newline = text.find("\n", pos)
+        line_end = length if newline < 0 else newline
+        line = text[pos:line_end]
+        stripped = line.strip()
+
+        if not stripped:
+            flush_paragraph()
+        elif HEADING_PATTERN.fullmatch(stripped) or (at_boundary and _is_numbered_heading(stripped)):
+            flush_paragraph()
+            heading = stripped.lstrip("#").strip()
+            start = pos + len(line) - len(line.lstrip())
+            add(start, start + len(stripped), True, is_heading=True)
+        else:
+            if paragraph_start is None:
+                paragraph_start = pos + len(line) - len(line.lstrip())
+            paragraph_end = pos + len(line.rstrip())
+
+        at_boundary = not stripped or stripped.endswith((".", "!", "?", "…", ":"))
+        pos = line_end + 1
+
+    flush_paragraph()
+    return units
+
+
+def _is_numbered_heading(line: str) -> bool:
+    """Indique si une ligne est un titre numéroté court (« 2.1 Les mitochondries »)."""
+    if not NUMBERED_HEADING_PATTERN.fullmatch(line):
+        return False
+    title = line.split(None, 1)[1]
+    return title[0].isupper() and len(title.split()) <= MAX_NUMBERED_HEADING_WORDS
+
+
+def chunk_document(
+    text: str,
+    max_tokens: int = 256,
+    overlap_tokens: int = 0,
+    count: Callable[[str], int] = count_tokens
+) -> List[Dict[str, Any]]:
+    """
+    Découpe un texte en chunks respectant titres, paragraphes et phrases.
+
+    Args:
+        text: Texte à découper
+        max_tokens: Budget de tokens par chunk
+        overlap_tokens: Tokens (phrases entières) repris du chunk précédent
+        count: Fonction de mesure (par défaut `count_tokens`; `len` pour un
+            budget en caractères)
+
+    Returns:
+        Liste de chunks {"text", "start", "end", "tokens", "heading"}, où
+        text == texte_source[start:end]
+    """
+    units = _segment(text, count, max_tokens)
+    block_tokens = _block_tokens(units)
+    chunks: List[Dict[str, Any]] = []
+    current: List[Unit] = []
+    current_tokens = 0
+    new_units = 0
+    # Un titre reste attaché au contenu qui le suit
+    has_body = False
+
+    def emit() -> None:
+        start, end = current[0][0], current[-1][1]
+        chunks.append({
+            "text": text[start:end],
+            "start": start,
+            "end": end,
+            "tokens": current_tokens,
+            "heading": current[-1][3],
+        })
+
+    for i, unit in enumerate(units):
+        tokens, block_start = unit[2], unit[4]
+
+        if current and new_units:
+            full = current_tokens + tokens > max_tokens
+            # Couper avant un titre, ou avant un paragraphe qui ne tient pas entier
+            at_heading = block_start and unit[5]
+            at_paragraph = block_start and has_body and current_tokens + block_tokens[i] > max_tokens
+            if full or at_heading or at_paragraph:
+                emit()
+                # Chevauchement: dernières phrases du chunk, sans traverser un titre
+                kept: List[Unit] = []
+                kept_tokens = 0
+                if not at_heading:
+                    for previous in reversed(current):
+                        if kept_tokens + previous[2] > overlap_tokens or kept_tokens + previous[2] + tokens > max_tokens:
+                            break
+                        kept.insert(0, previous)
+                        kept_tokens += previous[2]
+                current, current_tokens, new_units = kept, kept_tokens, 0
+                has_body = any(not previous[5] for previous in kept)
+
+        current.append(unit)
+        current_tokens += tokens
+        new_units += 1
+        has_body = has_body or not unit[5]
+
+    if current and new_units:
+        emit()
+
+    return chunks
+
+
+def _block_tokens(units: List[Unit]) -> List[int]:
+    """Pour chaque unité, tokens restants jusqu'à la fin de son bloc (paragraphe ou titre)."""
+    totals = [0] * len(units)
+    remaining = 0
+    for i in range(len(units) - 1, -1, -1):
+        remaining += units[i][2]
+        totals[i] = remaining
+        if units[i][4]:
+            remaining = 0
+    return totals
+
+
+def split_sentences(text: str) -> List[Tuple[int, int]]:
+    """
+    Positions (début, fin) des phrases d'un texte, titres inclus.
+
+    Args:
+        text: Texte à découper
+
+    Returns:
+        Liste des positions des phrases dans le texte
+    """
+    return [(unit[0], unit[1]) for unit in _segment(text, len, max(len(text), 1))]
@@ -0,0 +1,465 @@
+"""Détection des chunks quasi dupliqués (MinHash + LSH).
+
+Les supports de cours répètent en-têtes, pieds de page, gabarits de
+diapositives et mentions légales: ces chunks sont écartés avant les
+embeddings et la génération de questions.
+"""
+
+import hashlib
+import re
+import zlib
+from collections import Counter, defaultdict
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Premier de Mersenne 2^31 - 1: (a * x + b) tient sur 64 bits pour x < 2^32
+_PRIME = (1 << 31) - 1
+
+
+def _shingles(text: str, size: int) -> np.ndarray:
+    """Empreintes CRC32 des n-grammes de mots (casse ignorée)."""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return np.unique(np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams)))
+
+
+class NearDuplicateFilter:
+    """
+    Filtre incrémental de textes quasi dupliqués.
+
+    Chaque texte est résumé par une signature MinHash (`num_perm`
+    permutations de ses n-grammes de mots); les signatures sont rangées par
+    bandes (LSH) pour ne comparer que les candidats probables. Un texte est
+    écarté si sa similarité de Jaccard estimée avec un texte déjà retenu
+    atteint `threshold`. Les doublons exacts (après normalisation des
+    espaces et de la casse) sont écartés sans calcul de signature.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 3,
+        seed: int = 0
+    ):
+        """
+        Initialise le filtre.
+
+        Args:
+            threshold: Similarité de Jaccard (0-1) à partir de laquelle un texte est un doublon
+            num_perm: Nombre de permutations MinHash
+            bands: Nombre de bandes LSH (doit diviser num_perm)
+            shingle_size: Taille des n-grammes de mots
+            seed: Graine des permutations
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm doit être un multiple de bands")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+
+        # Empreinte du texte normalisé -> position de sa signature (None si sans mot)
+        self._exact: Dict[bytes, Optional[int]] = {}
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(bands)]
+        self._signatures: List[Optional[np.ndarray]] = []
+
+        self.stats: Dict[str, int] = {"seen": 0, "kept": 0, "exact_duplicates": 0, "near_duplicates": 0}
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        Calcule la signature MinHash d'un texte.
+
+        Args:
+            text: Texte à résumer
+
+        Returns:
+            Vecteur (num_perm,) de minima, ou None si le texte n'a aucun mot
+        """
+        shingles = _shingles(text, self.shingle_size)
+        if shingles.size == 0:
+            return None
+        hashed = (self._a[:, None] * shingles[None, :] + self._b[:, None]) % _PRIME
+        return hashed.min(axis=1)
+
+    def is_duplicate(self, text: str) -> bool:
+        """
+        Teste un texte et, s'il est nouveau, le mémorise.
+
+        Args:
+            text: Texte à tester
+
+        Returns:
+            True si le texte (quasi) duplique un texte déjà retenu
+        """
+        self.stats["seen"] += 1
+        kind = self._match(text)
+        if kind is not None:
+            self.stats[kind] += 1
+            return True
+        self.stats["kept"] += 1
+        return False
+
+    def add(self, texts: Iterable[str]) -> None:
+        """
+        Mémorise des textes déjà retenus (ex: documents d'un store chargé),
+        sans les compter dans les statistiques.
+
+        Args:
+            texts: Textes à mémoriser
+        """
+        for text in texts:
+            self._match(text)
+
+    def discard(self, texts: Iterable[str]) -> None:
+        """
+        Oublie des textes retenus (ex: documents dont l'embedding a échoué),
+        pour qu'ils puissent être ajoutés à nouveau.
+
+        Args:
+            texts: Textes à oublier (ceux qui n'ont pas été retenus sont ignorés)
+        """
+        for text in texts:
+            idx = self._exact.pop(self._digest(text), None)
+            if idx is None:
+                continue
+            signature = self._signatures[idx]
+            for band in range(self.bands):
+                key = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+                self._buckets[band][key].remove(idx)
+            self._signatures[idx] = None
+
+    @staticmethod
+    def _digest(text: str) -> bytes:
+        normalized = " ".join(text.lower().split())
+        return hashlib.sha1(normalized.encode("utf-8")).digest()
+
+    def _match(self, text: str) -> Optional[str]:
+        """Type de doublon du texte ("exact_duplicates" ou "near_duplicates"); un texte nouveau est mémorisé."""
+        digest = self._digest(text)
+        if digest in self._exact:
+            return "exact_duplicates"
+
+        idx = None
+        signature = self.signature(text)
+        if signature is not None:
+            keys = [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+            candidates = {other for band, key in enumerate(keys) for other in self._buckets[band].get(key, ())}
+            for other in candidates:
+                if np.mean(self._signatures[other] == signature) >= self.threshold:
+                    return "near_duplicates"
+
+            idx = len(self._signatures)
+            self._signatures.append(signature)
+            for band, key in enumerate(keys):
+                self._buckets[band][key].append(idx)
+
+        self._exact[digest] = idx
+        return None
+
+    def filter(self, texts: Iterable[str]) -> List[bool]:
+        """
+        Teste une suite de textes.
+
+        Args:
+            texts: Textes à tester, dans l'ordre
+
+        Returns:
+            Pour chaque texte, True s'il est retenu (non dupliqué)
+        """
+        return [not self.is_duplicate(text) for text in texts]
+
+    def reset(self) -> None:
+        """Oublie les textes mémorisés et remet les statistiques à zéro."""
+        self._exact = {}
+        self._buckets = [defaultdict(list) for _ in range(self.bands)]
+        self._signatures = []
+        self.stats = {key: 0 for key in self.stats}
+
+
+def create_dedup_filter(threshold: Optional[float] = None) -> Optional[NearDuplicateFilter]:
+    """
+    Crée un filtre de doublons selon la configuration.
+
+    Args:
+        threshold: Seuil de similarité (défaut: configuration)
+
+    Returns:
+        Filtre, ou None si la déduplication est désactivée
+    """
+    if not settings.dedup_enabled:
+        return None
+    return NearDuplicateFilter(threshold=threshold or settings.dedup_threshold)
+
+
+def deduplicate_texts(texts: List[str], threshold: Optional[float] = None) -> List[str]:
+    """
+    Retire les textes quasi dupliqués d'une liste (premier exemplaire conservé).
+
+    Args:
+        texts: Textes à filtrer
+        threshold: Seuil de similarité (défaut: configuration)
+
+    Returns:
+        Textes retenus, dans l'ordre d'origine
+    """
+    dedup = create_dedup_filter(threshold)
+    if dedup is None:
+        return list(texts)
+    return [text for text, keep in zip(texts, dedup.filter(texts)) if keep]
+
+
+def strip_repeated_lines(
+    sections: List[Dict[str, Any]],
+    min_fraction: float = 0.5,
+    min_sections: int = 3
+) -> List[Dict[str, Any]]:
+    """
+    Retire les lignes répétées sur la plupart des sections (en-têtes, pieds de page).
+
+    Args:
+        sections: Sections produites par un parseur
+        min_fraction: Part minimale des sections contenant la ligne
+        min_sections: Nombre minimal de sections pour appliquer le filtre
+
+    Returns:
+        Nouvelles sections, sans les lignes répétées
+    """
+    repeated = _repeated_lines(sections, min_fraction, min_sections)
+    if not repeated:
+        return sections
+    return [_strip_lines(section, repeated) for section in sections]
+
+
+def iter_strip_repeated_lines(
+    sections: Iterable[Dict[str, Any]],
+    sample_size: int = 32,
+    min_fraction: float = 0.5,
+    min_sections: int = 3
+) -> Iterator[Dict[str, Any]]:
+    """
+    Version au fil de l'eau de `strip_repeated_lines` (ex: sur `parser.iter_sections()`).
+
+    Les lignes répétées sont repérées sur les `sample_size` premières
+    sections, puis retirées de toutes les sections, sans attendre la fin du
+    parsing. Pour un document d'au plus `sample_size` sections, le résultat
+    est celui de `strip_repeated_lines`.
+
+    Args:
+        sections: Sections produites par un parseur
+        sample_size: Nombre de sections examinées pour repérer les répétitions
+        min_fraction: Part minimale des sections (de l'échantillon) contenant la ligne
+        min_sections: Nombre minimal de sections pour appliquer le filtre
+
+    Yields:
+        Sections sans les lignes répétées, dans l'ordre
+    """
+    sections = iter(sections)
+    head = list(islice(sections, sample_size))
+    repeated = _repeated_lines(head, min_fraction, min_sections)
+    for section in chain(head, sections):
+        yield _strip_lines(section, repeated) if repeated else section
+
+
+def _section_lines(section: Dict[str, Any]) -> List[str]:
+    return (section.get("content") or section.get("text") or "").splitlines()
+
+
+def _repeated_lines(sections: List[Dict[str, Any]], min_fraction: float, min_sections: int) -> set:
+    """Lignes (espaces normalisés) présentes dans au moins `min_fraction` des sections."""
+    if len(sections) < min_sections:
+        return set()
+    counts = Counter()
+    for section in sections:
+        counts.update({" ".join(line.split()) for line in _section_lines(section) if line.strip()})
+    return {line for line, count in counts.items() if count >= max(min_sections, min_fraction * len(sections))}
+
+
+def _strip_lines(section: Dict[str, Any], repeated: set) -> Dict[str, Any]:
+    text = "\n".join(line for line in _section_lines(section) if " ".join(line.split()) not in repeated)
+    return {**section, "content": text, "text": text}
+
+
+def cluster_near_duplicates(
+    vectors: np.ndarray,
+    threshold: float,
+    order: Optional[List[int]] = None
+) -> List[int]:
+    """
+    Regroupe des vecteurs quasi identiques (similarité cosinus >= threshold).
+
+    Les éléments sont parcourus dans `order` (les meilleurs d'abord): chacun
+    devient représentant de son groupe, sauf s'il est proche d'un
+    représentant déjà choisi.
+
+    Args:
+        vectors: Matrice (n, d) des embeddings
+        threshold: Similarité cosinus minimale entre deux doublons
+        order: Ordre de priorité des éléments (défaut: ordre d'origine)
+
+    Returns:
+        Pour chaque élément, l'indice du représentant de son groupe
+    """
+    n = len(vectors)
+    if n == 0:
+        return []
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    normalized = vectors / np.where(norms == 0, 1, norms)
+    similarities = normalized @ normalized.T
+
+    representatives = [-1] * n
+    kept: List[int] = []
+    for i in (order if order is not None else range(n)):
+        if kept:
+            row = similarities[i, kept]
+            best = int(np.argmax(row))
+            if row[best] >= threshold:
+                representatives[i] = kept[best]
+                continue
+        representatives[i] = i
+        kept.append(i)
+    return representatives
+
+
+def question_quality(question: Dict[str, Any]) -> int:
+    """Score de complétude d'une question, pour garder la meilleure d'un groupe de doublons."""
+    score = 0
+    options = question.get("options") or []
+    if question.get("correct_answer") and (not options or question["correct_answer"] in options):
+        score += 2
+    if question.get("explanation"):
+        score += 1
+    if len(options) >= 3:
+        score += 1
+    return score
+
+
+class QuestionDeduplicator:
+    """
+    Déduplication sémantique incrémentale de questions.
+
+    Les embeddings des questions retenues sont gardés: chaque nouveau lot
+    n'est encodé qu'une fois et comparé aux questions déjà retenues, sans
+    ré-encoder celles-ci.
+    """
+
+    def __init__(self, embedder: Any, threshold: Optional[float] = None):
+        """
+        Initialise le déduplicateur.
+
+        Args:
+            embedder: Embedder des énoncés (méthode `embed`)
+            threshold: Similarité cosinus des doublons (défaut: configuration)
+        """
+        self.embedder = embedder
+        self.threshold = threshold or settings.question_dedup_threshold
+        self._vectors: Optional[np.ndarray] = None
+
+    def add(self, questions: List[Dict[str, Any]]) -> None:
+        """
+        Retient des questions sans les filtrer (ex: questions déjà posées).
+
+        Args:
+            questions: Questions retenues
+        """
+        vectors = self._embed(questions)
+        if vectors is not None:
+            self._append(vectors)
+
+    def filter(self, questions: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Retire d'un lot les doublons des questions retenues et du lot lui-même.
+
+        Dans chaque groupe de doublons du lot, la question la plus complète
+        (`question_quality`) est gardée; les questions gardées sont retenues.
+
+        Args:
+            questions: Nouvelles questions ('question' ou 'text')
+
+        Returns:
+            (questions gardées dans l'ordre d'origine, nombre de questions retirées)
+        """
+        vectors = self._embed(questions)
+        if vectors is None:
+            # Sans embeddings, mieux vaut garder des doublons que perdre des questions
+            return questions, 0
+
+        previous = self._vectors
+        order = sorted(range(len(questions)), key=lambda i: question_quality(questions[i]), reverse=True)
+        kept: List[int] = []
+        for i in order:
+            row = vectors[kept] @ vectors[i]
+            if previous is not None:
+                row = np.concatenate([previous @ vectors[i], row])
+            if len(row) and row.max() >= self.threshold:
+                continue
+            kept.append(i)
+
+        kept.sort()
+        self._append(vectors[kept])
+        return [questions[i] for i in kept], len(questions) - len(kept)
+
+    def _embed(self, questions: List[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Embeddings normalisés des énoncés (None si l'embedder échoue)."""
+        if not questions:
+            return None
+        try:
+            vectors = self.embedder.embed([q.get("question") or q.get("text", "") for q in questions])
+        except Exception:
+            return None
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def _append(self, vectors: np.ndarray) -> None:
+        if len(vectors):
+            self._vectors = vectors if self._vectors is None else np.vstack([self._vectors, vectors])
+
+
+def deduplicate_questions(
+    questions: List[Dict[str, Any]],
+    embedder: Any,
+    threshold: Optional[float] = None,
+    keep_first: int = 0
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Retire les questions sémantiquement dupliquées.
+
+    Dans chaque groupe de doublons, la question la plus complète
+    (`question_quality`) est gardée, sauf parmi les `keep_first` premières,
+    déjà retenues, qui sont prioritaires.
+
+    Args:
+        questions: Questions à filtrer ('question' ou 'text')
+        embedder: Embedder des énoncés (méthode `embed`)
+        threshold: Similarité cosinus des doublons (défaut: configuration)
+        keep_first: Nombre de questions de tête prioritaires (déjà retenues)
+
+    Returns:
+        (questions retenues dans l'ordre d'origine, nombre de questions retirées)
+    """
+    if len(questions) < 2:
+        return questions, 0
+
+    dedup = QuestionDeduplicator(embedder, threshold)
+    dedup.add(questions[:keep_first])
+    kept, removed = dedup.filter(questions[keep_first:])
+    return questions[:keep_first] + kept, removed
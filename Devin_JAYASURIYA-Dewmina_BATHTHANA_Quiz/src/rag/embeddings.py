@@ -0,0 +1,357 @@
+"""Calcul d'embeddings par lots (plusieurs textes par requête)."""
+
+import queue
+import random
+import re
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+from ..llm.rate_limit import RateLimiter, estimate_tokens, get_rate_limiter, retry_call
+from .cache import EmbeddingCache
+
+# Limites de l'API OpenAI embeddings (par requête)
+MAX_ITEMS_PER_REQUEST = 2048
+MAX_TOKENS_PER_REQUEST = 300_000
+
+# Termes dont l'empreinte CRC32 est gardée par HashingEmbedder (cache LRU borné)
+TERM_HASH_CACHE_SIZE = 1 << 16
+
+
+def batch_texts(
+    texts: List[str],
+    max_items: int = 256,
+    max_tokens: int = 100_000
+) -> Iterator[Tuple[int, int]]:
+    """
+    Découpe une liste de textes en lots respectant un budget par requête.
+
+    Args:
+        texts: Textes à regrouper
+        max_items: Nombre max de textes par lot
+        max_tokens: Nombre max (estimé) de tokens par lot
+
+    Yields:
+        Bornes (début, fin) de chaque lot dans la liste
+    """
+    start = 0
+    tokens = 0
+
+    for i, text in enumerate(texts):
+        cost = estimate_tokens(text)
+        if i > start and (i - start >= max_items or tokens + cost > max_tokens):
+            yield start, i
+            start = i
+            tokens = 0
+        tokens += cost
+
+    if start < len(texts):
+        yield start, len(texts)
+
+
+class OpenAIEmbedder:
+    """Calcule des embeddings via l'API OpenAI, par lots et en parallèle."""
+
+    def __init__(
+        self,
+        client: Any,
+        model: str = "text-embedding-3-large",
+        max_items: int = 256,
+        max_tokens: int = 100_000,
+        max_concurrency: int = 4,
+        dimensions: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        """
+        Initialise l'embedder.
+
+        Args:
+            client: Client SDK OpenAI (ex: LLMClient.client)
+            model: Modèle d'embedding
+            max_items: Nombre max de textes par requête
+            max_tokens: Nombre max (estimé) de tokens par requête
+            max_concurrency: Nombre max de requêtes simultanées
+            dimensions: Dimension des embeddings retournés (troncature des
+                modèles text-embedding-3; défaut: dimension native du modèle)
+            max_retries: Nombre max de réessais sur 429/5xx (défaut: configuration)
+            rate_limiter: Limiteur de débit (défaut: limiteur partagé "openai")
+        """
+        self.client = client
+        self.model = model
+        self.dimensions = dimensions
+        self.max_items = min(max_items, MAX_ITEMS_PER_REQUEST)
+        self.max_tokens = min(max_tokens, MAX_TOKENS_PER_REQUEST)
+        self.max_concurrency = max_concurrency
+        # Les clients du registre n'ont pas de réessais SDK: ils sont faits ici
+        self.max_retries = settings.llm_max_retries if max_retries is None else max_retries
+        self.rate_limiter = rate_limiter or get_rate_limiter("openai")
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Calcule les embeddings d'une liste de textes.
+
+        Args:
+            texts: Textes à encoder
+
+        Returns:
+            Matrice float32 (len(texts), d), dans l'ordre des textes
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        # L'API refuse les chaînes vides
+        texts = [text if text.strip() else " " for text in texts]
+        bounds = list(batch_texts(texts, self.max_items, self.max_tokens))
+
+        if len(bounds) == 1 or self.max_concurrency <= 1:
+            blocks = [self._embed_batch(texts[start:end]) for start, end in bounds]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(bounds))) as executor:
+                blocks = list(executor.map(lambda b: self._embed_batch(texts[b[0]:b[1]]), bounds))
+
+        return np.vstack(blocks)
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """Envoie un lot de textes en une seule requête (réessais sur 429/5xx)."""
+        kwargs = {"dimensions": self.dimensions} if self.dimensions else {}
+        response = retry_call(
+            lambda: self.client.embeddings.create(model=self.model, input=texts, **kwargs),
+            max_retries=self.max_retries,
+            limiter=self.rate_limiter,
+            tokens=sum(estimate_tokens(text) for text in texts)
+        )
+        # L'API renvoie les embeddings avec leur index d'entrée
+        data = sorted(response.data, key=lambda item: item.index)
+        return np.array([item.embedding for item in data], dtype=np.float32)
+
+
+@lru_cache(maxsize=TERM_HASH_CACHE_SIZE)
+def _term_hash(term: str) -> int:
+    return zlib.crc32(term.encode("utf-8"))
+
+
+class HashingEmbedder:
+    """
+    Embedder local et déterministe par hachage de termes (feature hashing).
+
+    Chaque terme (unigrammes et bigrammes en minuscules) est projeté dans
+    l'une des `dim` dimensions via CRC32, avec un signe pseudo-aléatoire,
+    et pondéré par log(1 + tf). Aucun appel réseau: sert de repli hors ligne.
+    Les vecteurs ne sont pas comparables à ceux d'un modèle distant.
+    """
+
+    TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+    def __init__(self, dim: int = 1024, ngrams: int = 2):
+        """
+        Initialise l'embedder.
+
+        Args:
+            dim: Dimension des vecteurs
+            ngrams: Taille max des n-grammes de mots
+        """
+        self.dim = dim
+        self.ngrams = ngrams
+        self.model = f"hashing-{dim}-{ngrams}"
+
+    def _terms(self, text: str) -> List[str]:
+        tokens = self.TOKEN_PATTERN.findall(text.lower())
+        terms = list(tokens)
+        for n in range(2, self.ngrams + 1):
+            terms.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return terms
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Calcule les embeddings d'une liste de textes.
+
+        Args:
+            texts: Textes à encoder
+
+        Returns:
+            Matrice float32 (len(texts), dim)
+        """
+        rows, hashes = [], []
+        for row, text in enumerate(texts):
+            terms = self._terms(text)
+            rows.extend([row] * len(terms))
+            hashes.extend(map(_term_hash, terms))
+
+        hashes = np.asarray(hashes, dtype=np.uint32)
+        columns = (hashes % self.dim).astype(np.int64)
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+
+        # Comptes signés par (texte, dimension), puis pondération sous-linéaire
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(matrix, (np.asarray(rows, dtype=np.int64), columns), signs)
+        return np.sign(matrix) * np.log1p(np.abs(matrix))
+
+
+class EmbeddingRetryQueue:
+    """
+    File de réessai en arrière-plan pour les embeddings en échec.
+
+    Les lots soumis sont réessayés par un thread dédié avec un délai
+    exponentiel (et une gigue aléatoire). En cas de succès, `on_success`
+    reçoit les éléments et leurs vecteurs; après `max_attempts` échecs,
+    `on_failure` reçoit les éléments et la dernière exception.
+    """
+
+    def __init__(
+        self,
+        embedder: Any,
+        on_success: Callable[[List[Any], np.ndarray], None],
+        on_failure: Optional[Callable[[List[Any], Exception], None]] = None,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0
+    ):
+        """
+        Initialise la file.
+
+        Args:
+            embedder: Embedder utilisé pour les réessais
+            on_success: Callback appelé avec (éléments, vecteurs)
+            on_failure: Callback appelé avec (éléments, exception) après abandon
+            max_attempts: Nombre max de tentatives par lot
+            base_delay: Délai initial entre tentatives (secondes)
+            max_delay: Délai max entre tentatives (secondes)
+        """
+        self.embedder = embedder
+        self.on_success = on_success
+        self.on_failure = on_failure
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._queue: "queue.Queue[Tuple[float, int, List[Any], List[str]]]" = queue.Queue()
+        self._pending = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> int:
+        """Nombre d'éléments en attente de réessai."""
+        with self._condition:
+            return self._pending
+
+    def submit(self, items: List[Any], texts: List[str]) -> None:
+        """
+        Soumet un lot en échec pour réessai.
+
+        Args:
+            items: Éléments associés aux textes (ex: documents)
+            texts: Textes à encoder
+        """
+        with self._condition:
+            self._pending += len(items)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="embedding-retry", daemon=True)
+                self._thread.start()
+        self._queue.put((time.monotonic() + self._delay(0), 0, items, texts))
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend que tous les lots soumis soient traités.
+
+        Args:
+            timeout: Délai max d'attente (secondes)
+
+        Returns:
+            True si la file est vide
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def _delay(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _done(self, count: int) -> None:
+        with self._condition:
+            self._pending -= count
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            not_before, attempt, items, texts = self._queue.get()
+            wait = not_before - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+            try:
+                vectors = self.embedder.embed(texts)
+            except Exception as exc:
+                if attempt + 1 >= self.max_attempts:
+                    try:
+                        if self.on_failure:
+                            self.on_failure(items, exc)
+                    finally:
+                        self._done(len(items))
+                else:
+                    self._queue.put((time.monotonic() + self._delay(attempt + 1), attempt + 1, items, texts))
+                continue
+
+            try:
+                self.on_success(items, vectors)
+            finally:
+                self._done(len(items))
+
+
+class CachedEmbedder:
+    """Embedder qui consulte un cache persistant avant d'appeler l'API."""
+
+    def __init__(self, embedder: Any, cache: Optional[EmbeddingCache]):
+        """
+        Initialise l'embedder avec cache.
+
+        Args:
+            embedder: Embedder sous-jacent (doit exposer `model` et `embed`)
+            cache: Cache d'embeddings (None pour le désactiver)
+        """
+        self.embedder = embedder
+        self.cache = cache
+
+    @property
+    def model(self) -> str:
+        return self.embedder.model
+
+    @property
+    def cache_key(self) -> str:
+        """Espace de noms du cache: le modèle, et sa dimension si elle est tronquée."""
+        dimensions = getattr(self.embedder, "dimensions", None)
+        return f"{self.model}@{dimensions}" if dimensions else self.model
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Calcule les embeddings, en n'appelant l'API que pour les textes absents du cache.
+
+        Args:
+            texts: Textes à encoder
+
+        Returns:
+            Matrice float32 (len(texts), d), dans l'ordre des textes
+        """
+        if self.cache is None or not texts:
+            return self.embedder.embed(texts)
+
+        cached = self.cache.get_many(self.cache_key, texts)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+
+        if missing:
+            # Dédupliquer les textes manquants avant l'appel
+            unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+            computed = self.embedder.embed(unique_texts)
+            self.cache.put_many(self.cache_key, unique_texts, computed)
+            by_text = dict(zip(unique_texts, computed))
+            for i in missing:
+                cached[i] = by_text[texts[i]]
+
+        return np.vstack(cached).astype(np.float32, copy=False)
@@ -1,41 +1,42 @@
 """Module RAG pour l'extraction d'information des documents."""
 
 import json
+import unicodedata
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from pathlib import Path
 
+from ..config import settings
 from ..llm.client import LLMClient
+from .cache import get_default_embedding_cache
+from .embeddings import OpenAIEmbedder, CachedEmbedder, HashingEmbedder
+from .chunker import chunk_document, split_sentences
+from .dedup import deduplicate_texts, deduplicate_questions
+from .lexical import bm25_scores
+
+# Taille des chunks envoyés aux prompts d'extraction, et nombre max de
+# chunks par prompt: au-delà, le texte est traité chunk par chunk
+# (concepts) ou seuls les chunks pertinents sont envoyés (détails)
+PROMPT_CHUNK_SIZE = 3000
+MAX_PROMPT_CHUNKS = 3
 
 
 def chunk_text(text: str, chunk_size: int = 500, overlap: int = 50) -> List[str]:
     """
     Découpe un texte en chunks avec chevauchement.
 
+    Les coupures respectent titres, paragraphes et phrases (voir
+    `chunker.chunk_document`); la taille est mesurée en caractères.
+
     Args:
         text: Texte à découper
         chunk_size: Taille max d'un chunk (en caractères)
-        overlap: Chevauchement entre chunks
+        overlap: Chevauchement entre chunks (en caractères, phrases entières)
 
     Returns:
         Liste des chunks
     """
-    chunks = []
-    start = 0
-
-    while start < len(text):
-        end = min(start + chunk_size, len(text))
-        chunk = text[start:end]
-
-        if chunk.strip():
-            chunks.append(chunk)
-
-        if end >= len(text):
-            break
-
-        start += chunk_size - overlap
-
-    return chunks
+    return [chunk["text"] for chunk in chunk_document(text, chunk_size, overlap, count=len)]
 
 
 def chunk_by_sentences(text: str, sentences_per_chunk: int = 5) -> List[str]:
@@ -49,23 +50,99 @@ def chunk_by_sentences(text: str, sentences_per_chunk: int = 5) -> List[str]:
     Returns:
         Liste des chunks
     """
-    import re
-    # Split sur . ! ?
-    sentences = re.split(r'(?<=[.!?])\s+', text)
+    sentences = split_sentences(text)
+    chunks = [
+        text[sentences[i][0]:sentences[min(i + sentences_per_chunk, len(sentences)) - 1][1]]
+        for i in range(0, len(sentences), sentences_per_chunk)
+    ]
+    return [c for c in chunks if c.strip()]
 
-    chunks = []
-    current_chunk = []
 
-    for sentence in sentences:
-        current_chunk.append(sentence)
-        if len(current_chunk) >= sentences_per_chunk:
-            chunks.append(' '.join(current_chunk))
-            current_chunk = []
+def iter_chunks(
+    sections: Iterable[Dict[str, Any]],
+    max_tokens: int = 256,
+    overlap_tokens: int = 32
+) -> Iterator[Dict[str, Any]]:
+    """
+    Découpe au fil de l'eau les sections produites par un parseur.
 
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
+    Args:
+        sections: Sections (ex: `parser.iter_sections()`), avec 'content' ou 'text'
+        max_tokens: Budget de tokens par chunk
+        overlap_tokens: Chevauchement entre chunks (en tokens, phrases entières)
+
+    Yields:
+        Documents {"text", "chunk_id", "page", "start", "end", "heading"} prêts
+        à être indexés; start/end sont les positions dans le contenu de la section
+    """
+    chunk_id = 0
+    for section in sections:
+        content = section.get("content") or section.get("text") or ""
+        for chunk in chunk_document(content, max_tokens, overlap_tokens):
+            yield {
+                "text": chunk["text"],
+                "chunk_id": chunk_id,
+                "page": section.get("page"),
+                "start": chunk["start"],
+                "end": chunk["end"],
+                "heading": chunk["heading"],
+            }
+            chunk_id += 1
 
-    return [c for c in chunks if c.strip()]
+
+IMPORTANCE_RANK = {"haute": 3, "moyenne": 2, "basse": 1}
+
+# Tokens de sortie prévus par concept détaillé (pour dimensionner les lots)
+DETAIL_TOKENS_PER_CONCEPT = 400
+
+
+def concept_key(name: str) -> str:
+    """Clé de déduplication d'un concept (casse, accents et espaces ignorés)."""
+    normalized = unicodedata.normalize("NFKD", name.lower())
+    normalized = "".join(c for c in normalized if not unicodedata.combining(c))
+    return " ".join(normalized.split())
+
+
+def merge_concepts(
+    concept_lists: List[List[Dict[str, Any]]],
+    num_concepts: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fusionne et déduplique des listes de concepts (étape « reduce »).
+
+    Les concepts de même nom sont regroupés; ils sont ensuite classés par
+    importance puis par nombre de chunks où ils apparaissent.
+
+    Args:
+        concept_lists: Concepts extraits de chaque chunk
+        num_concepts: Nombre max de concepts à retourner
+
+    Returns:
+        Liste des concepts fusionnés, avec le champ 'occurrences'
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+
+    for concepts in concept_lists:
+        for concept in concepts:
+            name = str(concept.get("name", "")).strip()
+            if not name:
+                continue
+            key = concept_key(name)
+            if key not in merged:
+                merged[key] = {**concept, "name": name, "occurrences": 0}
+            entry = merged[key]
+            entry["occurrences"] += 1
+            if IMPORTANCE_RANK.get(concept.get("importance"), 0) > IMPORTANCE_RANK.get(entry.get("importance"), 0):
+                entry["importance"] = concept["importance"]
+            if not entry.get("definition") and concept.get("definition"):
+                entry["definition"] = concept["definition"]
+
+    ranked = sorted(
+        merged.values(),
+        key=lambda c: (IMPORTANCE_RANK.get(c.get("importance"), 0), c["occurrences"]),
+        reverse=True
+    )
+    return ranked[:num_concepts] if num_concepts else ranked
 
 
 class RAGExtractor:
@@ -81,12 +158,65 @@ class RAGExtractor:
         """
         self.client = LLMClient(api_key=api_key, model=model)
         self.model = model
-        self.embeddings_cache: Dict[str, List[float]] = {}
+        self.embeddings_cache = get_default_embedding_cache()
+        self.embedder = (
+            CachedEmbedder(
+                OpenAIEmbedder(
+                    self.client.client,
+                    model=settings.embedding_model,
+                    dimensions=settings.embedding_dimensions
+                ),
+                self.embeddings_cache
+            )
+            if self.client.provider == "openai" else None
+        )
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Calcule les embeddings de textes (via le cache d'embeddings partagé).
+
+        Args:
+            texts: Textes à encoder
+
+        Returns:
+            Matrice float32 (len(texts), d)
+        """
+        if self.embedder is None:
+            raise ValueError("Aucun modèle d'embedding disponible pour ce fournisseur.")
+        return self.embedder.embed(texts)
+
+    def build_vector_store(self, chunks: Iterable[str | Dict[str, Any]], **kwargs) -> "VectorStore":
+        """
+        Indexe des chunks dans un VectorStore partageant l'embedder (et son cache).
+
+        Les chunks peuvent provenir d'un générateur (ex: `iter_chunks`
+        appliqué à `parser.iter_sections()`): ils sont encodés par lots au fil
+        du parsing.
+
+        Args:
+            chunks: Chunks de texte, ou documents {"text", ...}, à indexer
+            **kwargs: Paramètres du VectorStore (index_type, index_params...)
+
+        Returns:
+            Vector store contenant les chunks
+        """
+        from .vectorstore import VectorStore
+
+        store = VectorStore(model=settings.embedding_model, embedder=self.embedder, **kwargs)
+        store.add_documents_stream(
+            chunk if isinstance(chunk, dict) else {"text": chunk, "chunk_id": i}
+            for i, chunk in enumerate(chunks)
+        )
+        return store
 
     def extract_key_concepts(self, text: str, num_concepts: int = 10) -> List[Dict[str, Any]]:
         """
         Extrait les concepts clés d'un texte.
 
+        Un texte plus long que MAX_PROMPT_CHUNKS chunks est traité en
+        map-reduce (`extract_concepts_by_chunk` puis `merge_concepts`) plutôt
+        que tronqué.
+
         Args:
             text: Texte à analyser
             num_concepts: Nombre de concepts à extraire
@@ -95,10 +225,27 @@ class RAGExtractor:
             Liste des concepts avec descriptions
         """
         # Découper le texte
-        chunks = chunk_text(text, chunk_size=3000)
-        combined_text = "\n---\n".join(chunks[:3])  # Limiter à 3 chunks
+        chunks = chunk_text(text, chunk_size=PROMPT_CHUNK_SIZE)
+        if len(chunks) > MAX_PROMPT_CHUNKS:
+            return merge_concepts(self.extract_concepts_by_chunk(chunks, num_concepts), num_concepts)
+
+        prompt = self._concepts_prompt("\n---\n".join(chunks), num_concepts)
 
-        prompt = f"""Analysez le texte suivant et extrayez les {num_concepts} concepts clés les plus importants.
+        response = self.client.generate(
+            prompt=prompt,
+            temperature=0.3,
+            response_format={"type": "json_object"}
+        )
+
+        try:
+            result = json.loads(response)
+            return result.get("concepts", [])
+        except json.JSONDecodeError:
+            return self._default_concepts(text, num_concepts)
+
+    def _concepts_prompt(self, text: str, num_concepts: int) -> str:
+        """Construit le prompt d'extraction de concepts."""
+        return f"""Analysez le texte suivant et extrayez les {num_concepts} concepts clés les plus importants.
         Pour chaque concept, fournissez:
         1. Le nom du concept
         2. Une courte définition (1-2 phrases)
@@ -116,20 +263,52 @@ class RAGExtractor:
         }}
 
         TEXTE À ANALYSER:
-        {combined_text}
+        {text}
         """
 
-        response = self.client.generate(
-            prompt=prompt,
+    def extract_concepts_by_chunk(
+        self,
+        chunks: Iterable[str],
+        num_concepts: int = 5
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Extrait les concepts clés de chaque chunk, en parallèle (étape « map »).
+
+        Les chunks peuvent provenir d'un générateur (ex: parties d'un document
+        en cours de parsing): chaque appel est lancé dès que son chunk est
+        disponible.
+
+        Args:
+            chunks: Chunks couvrant tout le document
+            num_concepts: Nombre de concepts par chunk
+
+        Returns:
+            Liste (alignée sur `chunks`) des concepts de chaque chunk
+        """
+        received: List[str] = []
+
+        def prompts() -> Iterator[str]:
+            for chunk in chunks:
+                received.append(chunk)
+                yield self._concepts_prompt(chunk, num_concepts)
+
+        responses = dict(self.client.generate_as_completed(
+            prompts(),
             temperature=0.3,
             response_format={"type": "json_object"}
-        )
+        ))
 
-        try:
-            result = json.loads(response)
-            return result.get("concepts", [])
-        except json.JSONDecodeError:
-            return self._default_concepts(text, num_concepts)
+        concepts_by_chunk = []
+        for i, chunk in enumerate(received):
+            try:
+                response = responses[i]
+                if isinstance(response, Exception):
+                    raise response
+                concepts_by_chunk.append(json.loads(response).get("concepts", []))
+            except Exception:
+                concepts_by_chunk.append(self._default_concepts(chunk, num_concepts))
+
+        return concepts_by_chunk
 
     def _default_concepts(self, text: str, num_concepts: int) -> List[Dict[str, Any]]:
         """Fallback pour extraire des concepts si JSON échoue."""
@@ -154,14 +333,25 @@ class RAGExtractor:
     def extract_detailed_information(
         self,
         text: str,
-        concepts: Optional[List[str]] = None
+        concepts: Optional[List[str]] = None,
+        batch_size: Optional[int] = None,
+        max_tokens: int = 4000
     ) -> Dict[str, Any]:
         """
         Extrait des informations détaillées sur les concepts.
 
+        Plusieurs concepts sont traités par appel (un seul envoi du texte),
+        la réponse étant indexée par nom de concept. Pour un texte long, chaque
+        lot reçoit les chunks les plus pertinents pour ses concepts (BM25)
+        plutôt que le début du texte. Un lot dont la réponse
+        est invalide ou incomplète (ex: tronquée à max_tokens) est redécoupé
+        et seuls ses concepts manquants sont redemandés.
+
         Args:
             text: Texte à analyser
             concepts: Liste des concepts à détailler
+            batch_size: Concepts par appel (défaut: configuration, borné par max_tokens)
+            max_tokens: Nombre max de tokens générés par appel
 
         Returns:
             Dictionnaire avec informations détaillées
@@ -170,49 +360,109 @@ class RAGExtractor:
             concept_list = self.extract_key_concepts(text)
             concepts = [c["name"] for c in concept_list]
 
-        chunks = chunk_text(text, chunk_size=3000)
-        combined_text = "\n---\n".join(chunks[:3])
+        chunks = chunk_text(text, chunk_size=PROMPT_CHUNK_SIZE)
+
+        selected = concepts[:5]  # Limiter à 5 concepts pour l'API
+        batch_size = max(1, min(
+            batch_size or settings.concept_batch_size,
+            max_tokens // DETAIL_TOKENS_PER_CONCEPT
+        ))
 
         details = {}
+        pending = [selected[i:i + batch_size] for i in range(0, len(selected), batch_size)]
+        while pending:
+            responses = self.client.generate_many(
+                [self._details_prompt(self._select_context(chunks, batch), batch) for batch in pending],
+                return_exceptions=True,
+                temperature=0.3,
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"}
+            )
 
-        for concept in concepts[:5]:  # Limiter à 5 concepts pour l'API
-            prompt = f"""À partir du texte suivant, extrayez toutes les informations importantes concernant "{concept}".
+            retry = []
+            for batch, response in zip(pending, responses):
+                found = self._parse_details(response, batch)
+                details.update(found)
+                missing = [concept for concept in batch if concept not in found]
+                if not missing:
+                    continue
+                if len(missing) == 1 and len(batch) == 1:
+                    details[missing[0]] = self._default_details()
+                elif len(missing) < len(batch):
+                    retry.append(missing)
+                else:
+                    # Réponse inexploitable: couper le lot en deux
+                    half = len(missing) // 2
+                    retry.extend([missing[:half], missing[half:]])
+            pending = retry
+
+        return {concept: details[concept] for concept in selected}
+
+    def _select_context(self, chunks: List[str], concepts: List[str]) -> str:
+        """Chunks à envoyer pour un lot de concepts (les plus pertinents, dans l'ordre du texte)."""
+        if len(chunks) > MAX_PROMPT_CHUNKS:
+            scores = bm25_scores(" ".join(concepts), chunks)
+            best = sorted(range(len(chunks)), key=lambda i: scores[i], reverse=True)[:MAX_PROMPT_CHUNKS]
+            chunks = [chunks[i] for i in sorted(best)]
+        return "\n---\n".join(chunks)
+
+    def _details_prompt(self, text: str, concepts: List[str]) -> str:
+        """Construit le prompt de détail d'un lot de concepts."""
+        names = "\n".join(f"- {concept}" for concept in concepts)
+        return f"""À partir du texte suivant, extrayez toutes les informations importantes concernant chacun des concepts ci-dessous.
+
+        CONCEPTS:
+        {names}
 
-            Fournissez:
-            1. Définition claire
-            2. Caractéristiques principales
-            3. Exemples
-            4. Contexte d'utilisation
+        Pour chaque concept, fournissez:
+        1. Définition claire
+        2. Caractéristiques principales
+        3. Exemples
+        4. Contexte d'utilisation
 
-            Retournez le résultat en JSON:
-            {{
-                "definition": "...",
-                "characteristics": ["...", "...", "..."],
-                "examples": ["...", "..."],
-                "context": "..."
+        Retournez le résultat en JSON, indexé par le nom exact du concept:
+        {{
+            "details": {{
+                "Nom du concept": {{
+                    "definition": "...",
+                    "characteristics": ["...", "...", "..."],
+                    "examples": ["...", "..."],
+                    "context": "..."
+                }}
             }}
+        }}
 
-            TEXTE:
-            {combined_text}
-            """
-
-            response = self.client.generate(
-                prompt=prompt,
-                temperature=0.3,
-                response_format={"type": "json_object"}
-            )
-
-            try:
-                details[concept] = json.loads(response)
-            except json.JSONDecodeError:
-                details[concept] = {
-                    "definition": "Information disponible dans le document",
-                    "characteristics": [],
-                    "examples": [],
-                    "context": "N/A"
-                }
+        TEXTE:
+        {text}
+        """
 
-        return details
+    def _parse_details(self, response: Any, concepts: List[str]) -> Dict[str, Any]:
+        """Associe les détails d'une réponse aux concepts demandés (noms normalisés)."""
+        if isinstance(response, Exception):
+            return {}
+        try:
+            result = json.loads(response)
+        except (TypeError, json.JSONDecodeError):
+            return {}
+
+        entries = result.get("details", result) if isinstance(result, dict) else {}
+        if not isinstance(entries, dict):
+            return {}
+        by_key = {concept_key(name): value for name, value in entries.items() if isinstance(value, dict)}
+        return {
+            concept: by_key[concept_key(concept)]
+            for concept in concepts
+            if concept_key(concept) in by_key
+        }
+
+    def _default_details(self) -> Dict[str, Any]:
+        """Détails par défaut d'un concept non extrait."""
+        return {
+            "definition": "Information disponible dans le document",
+            "characteristics": [],
+            "examples": [],
+            "context": "N/A"
+        }
 
     def generate_questions_from_chunks(
         self,
@@ -229,10 +479,10 @@ class RAGExtractor:
         Returns:
             Liste des questions générées
         """
-        all_questions = []
-
-        for chunk in chunks[:5]:  # Limiter à 5 chunks
-            prompt = f"""À partir du texte suivant, générez exactement {num_questions} questions d'examen.
+        # Les chunks répétés (gabarits, mentions légales...) ne sont pas envoyés
+        chunks = deduplicate_texts(chunks)
+        prompts = [
+            f"""À partir du texte suivant, générez exactement {num_questions} questions d'examen.
             
             Pour chaque question:
             1. Posez une question claire et spécifique
@@ -255,17 +505,34 @@ class RAGExtractor:
             TEXTE:
             {chunk[:2000]}
             """
+            for chunk in chunks[:5]  # Limiter à 5 chunks
+        ]
 
-            response = self.client.generate(
-                prompt=prompt,
-                temperature=0.5,
-                response_format={"type": "json_object"}
-            )
+        # Les chunks sont traités en parallèle; un chunk en échec n'interrompt pas les autres
+        responses = self.client.generate_many(
+            prompts,
+            return_exceptions=True,
+            temperature=0.5,
+            response_format={"type": "json_object"}
+        )
 
+        questions_by_chunk = []
+        for response in responses:
             try:
-                result = json.loads(response)
-                all_questions.extend(result.get("questions", []))
-            except json.JSONDecodeError:
-                pass
-
-        return all_questions[:num_questions]
+                if isinstance(response, Exception):
+                    raise response
+                questions = json.loads(response).get("questions", [])
+            except Exception:
+                continue
+            questions_by_chunk.append([q for q in questions if isinstance(q, dict)])
+
+        # Alterner entre chunks pour que la troncature n'écarte pas les derniers
+        all_questions = [
+            questions[i]
+            for i in range(max((len(q) for q in questions_by_chunk), default=0))
+            for questions in questions_by_chunk
+            if i < len(questions)
+        ]
+        embedder = self.embedder or HashingEmbedder(dim=settings.offline_embedding_dim)
+        questions, _ = deduplicate_questions(all_questions, embedder)
+        return questions[:num_questions]
@@ -0,0 +1,711 @@
+"""Index de similarité (exact et approximatif) pour le vector store."""
+
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .quantization import create_quantizer
+
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
+
+# Au-delà (sélectivité < 1 / MAX_FILTER_OVERFETCH), un filtre est résolu par
+# recherche exacte sur le sous-ensemble plutôt que par sur-échantillonnage du graphe
+MAX_FILTER_OVERFETCH = 10
+
+# Défauts des index quantifiés: vecteurs avant l'entraînement, facteur de re-score
+QUANTIZED_DEFAULTS = {
+    "int8": {"train_size": 256, "rescore": 4},
+    "pq": {"train_size": 4096, "rescore": 16},
+}
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """
+    Normalise des vecteurs (L2) en float32.
+
+    Args:
+        vectors: Matrice (n, d) ou vecteur (d,)
+
+    Returns:
+        Matrice (n, d) de vecteurs unitaires (les vecteurs nuls restent nuls)
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sélectionne les k meilleurs scores par ligne sans tri complet.
+
+    Args:
+        scores: Matrice (m, n) de similarités
+        k: Nombre de résultats par ligne
+
+    Returns:
+        Tuple (scores, indices) de forme (m, k), triés par score décroissant
+    """
+    n = scores.shape[1]
+    k = min(k, n)
+    if k <= 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.float32), empty.astype(np.int64)
+
+    if k < n:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.tile(np.arange(n), (scores.shape[0], 1))
+
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1)
+    return (
+        np.take_along_axis(part_scores, order, axis=1),
+        np.take_along_axis(part, order, axis=1),
+    )
+
+
+class _VectorBuffer:
+    """Matrice extensible par ajout (croissance géométrique)."""
+
+    def __init__(self, dtype: type = np.float32):
+        self.dtype = dtype
+        self._data: Optional[np.ndarray] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def data(self) -> np.ndarray:
+        """Vue sur les vecteurs stockés."""
+        if self._data is None:
+            return np.empty((0, 0), dtype=self.dtype)
+        return self._data[:self._size]
+
+    def wrap(self, vectors: np.ndarray) -> None:
+        """Adopte une matrice existante (ex: np.memmap) sans la copier."""
+        self._data = vectors
+        self._size = len(vectors)
+
+    def append(self, vectors: np.ndarray) -> None:
+        """Ajoute des vecteurs sans recopier à chaque appel."""
+        needed = self._size + len(vectors)
+        if self._data is None:
+            self._data = np.empty((max(needed, 64), vectors.shape[1]), dtype=self.dtype)
+        elif needed > len(self._data) or not self._data.flags.writeable:
+            grown = np.empty((max(needed, 2 * len(self._data)), self._data.shape[1]), dtype=self.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+
+        self._data[self._size:needed] = vectors
+        self._size = needed
+
+    def clear(self) -> None:
+        self._data = None
+        self._size = 0
+
+
+class _MappedVectorBuffer(_VectorBuffer):
+    """
+    Matrice extensible stockée dans un fichier temporaire (np.memmap).
+
+    Les vecteurs ajoutés restent sur disque: seules les pages lues (ex: les
+    lignes des candidats à re-scorer) passent par le cache du système.
+    """
+
+    # Lignes recopiées à la fois lors d'un agrandissement
+    COPY_BLOCK = 16_384
+
+    def __init__(self, dtype: type = np.float32):
+        super().__init__(dtype)
+        self._file = None
+
+    def append(self, vectors: np.ndarray) -> None:
+        needed = self._size + len(vectors)
+        if self._data is None or needed > len(self._data) or not self._data.flags.writeable:
+            capacity = max(needed, 64) if self._data is None else max(needed, 2 * len(self._data))
+            self._grow(capacity, vectors.shape[1])
+
+        self._data[self._size:needed] = vectors
+        self._size = needed
+
+    def _grow(self, capacity: int, dim: int) -> None:
+        """Recopie les vecteurs dans un nouveau fichier de `capacity` lignes."""
+        file = tempfile.TemporaryFile(prefix="quiz-index-")
+        grown = np.memmap(file, dtype=self.dtype, mode="w+", shape=(capacity, dim))
+        for start in range(0, self._size, self.COPY_BLOCK):
+            end = min(start + self.COPY_BLOCK, self._size)
+            grown[start:end] = self._data[start:end]
+
+        self._close()
+        self._data = grown
+        self._file = file
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def clear(self) -> None:
+        super().clear()
+        self._close()
+
+
+class BaseIndex(ABC):
+    """Classe de base des index de similarité cosinus."""
+
+    def __init__(self):
+        self._vectors = _VectorBuffer()
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    @property
+    def dim(self) -> Optional[int]:
+        """Dimension des vecteurs indexés (None si vide)."""
+        return self._vectors.data.shape[1] if len(self) else None
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Vecteurs normalisés indexés, dans l'ordre d'insertion."""
+        return self._vectors.data
+
+    @property
+    def nbytes(self) -> int:
+        """Octets gardés en mémoire par les vecteurs (hors np.memmap, sur disque)."""
+        vectors = self.vectors
+        return 0 if isinstance(vectors, np.memmap) else vectors.nbytes
+
+    def add(self, vectors: np.ndarray) -> None:
+        """
+        Ajoute des vecteurs à l'index (sans reconstruction complète).
+
+        Args:
+            vectors: Matrice (n, d) d'embeddings
+        """
+        vectors = normalize(vectors)
+        if len(vectors) == 0 or vectors.shape[1] == 0:
+            return
+        if self.dim is not None and vectors.shape[1] != self.dim:
+            raise ValueError(
+                f"Dimension incompatible: {vectors.shape[1]} (index: {self.dim})"
+            )
+
+        start = len(self)
+        self._vectors.append(vectors)
+        self._on_add(vectors, start)
+
+    def attach(self, vectors: np.ndarray, state: Optional[Dict[str, np.ndarray]] = None) -> None:
+        """
+        Remplace le contenu de l'index par une matrice déjà normalisée, sans copie.
+
+        Utilisé au chargement d'un store: la matrice peut être un np.memmap
+        en lecture seule, recopié en mémoire seulement au premier ajout.
+
+        Args:
+            vectors: Matrice (n, d) de vecteurs normalisés
+            state: Structures sauvegardées par `state()` (évite de les recalculer)
+        """
+        self.reset()
+        if len(vectors) == 0:
+            return
+        self._vectors.wrap(vectors)
+        if state:
+            self._load_state(state)
+        else:
+            self._on_add(vectors, 0)
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Structures entraînées à sauvegarder avec le store (aucune par défaut)."""
+        return {}
+
+    def _load_state(self, state: Dict[str, np.ndarray]) -> None:
+        """Restaure les structures de `state()`; par défaut, elles sont recalculées."""
+        self._on_add(self.vectors, 0)
+
+    def _on_add(self, vectors: np.ndarray, start: int) -> None:
+        """Hook appelé après l'ajout de vecteurs normalisés."""
+
+    @abstractmethod
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        ids: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Recherche les k plus proches voisins de chaque query.
+
+        Args:
+            queries: Matrice (m, d) de queries
+            k: Nombre de voisins
+            ids: Sous-ensemble (trié) des vecteurs candidats, issu d'un
+                pré-filtre sur les métadonnées (défaut: tous)
+
+        Returns:
+            Tuple (scores, indices) de forme (m, k); les cases vides valent -1
+        """
+
+    def _search_subset(self, queries: np.ndarray, k: int, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Recherche exacte restreinte aux vecteurs `ids` (coût proportionnel au sous-ensemble)."""
+        queries = normalize(queries)
+        if len(ids) == 0:
+            return _empty_result(len(queries), k)
+        scores, positions = top_k(queries @ self.vectors[ids].T, k)
+        return _pad(scores, ids[positions], k)
+
+    def reset(self) -> None:
+        """Vide l'index."""
+        self._vectors.clear()
+
+
+class FlatIndex(BaseIndex):
+    """Index exact: produit scalaire sur une matrice float32 pré-normalisée."""
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        ids: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if len(self) == 0:
+            return _empty_result(len(np.atleast_2d(queries)), k)
+        if ids is not None:
+            return self._search_subset(queries, k, ids)
+        scores = normalize(queries) @ self.vectors.T
+        return _pad(*top_k(scores, k), k)
+
+
+class IVFIndex(BaseIndex):
+    """
+    Index approximatif par listes inversées (IVF).
+
+    Les vecteurs sont répartis entre `nlist` centroïdes (k-means sphérique);
+    une recherche ne parcourt que les `nprobe` listes les plus proches.
+    `nprobe` est le compromis rappel / latence: nprobe = nlist équivaut
+    à une recherche exacte.
+    """
+
+    def __init__(self, nlist: int = 64, nprobe: int = 8, train_size: Optional[int] = None, seed: int = 0):
+        """
+        Initialise l'index IVF.
+
+        Args:
+            nlist: Nombre de listes (centroïdes)
+            nprobe: Nombre de listes parcourues par recherche
+            train_size: Nombre de vecteurs avant l'entraînement (défaut: 4 * nlist)
+            seed: Graine du k-means
+        """
+        super().__init__()
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_size = train_size or 4 * nlist
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        # Listes inversées: tableau d'ids (éventuellement mappé depuis le disque)
+        # et ids ajoutés depuis, concaténés au premier parcours
+        self._list_arrays: List[np.ndarray] = []
+        self._pending: List[List[int]] = []
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def _on_add(self, vectors: np.ndarray, start: int) -> None:
+        if not self.is_trained:
+            if len(self) >= self.train_size:
+                self.train()
+            return
+        self._assign(vectors, start)
+
+    def train(self, iterations: int = 10) -> None:
+        """Entraîne les centroïdes sur les vecteurs présents et les réassigne."""
+        data = np.asarray(self.vectors, dtype=np.float32)
+        nlist = min(self.nlist, len(data))
+        rng = np.random.default_rng(self.seed)
+        centroids = data[rng.choice(len(data), nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, data)
+            counts = np.bincount(labels, minlength=nlist)
+            # Les centroïdes vides gardent leur position
+            filled = counts > 0
+            centroids[filled] = normalize(sums[filled])
+
+        self.centroids = centroids
+        self._list_arrays = [np.empty(0, dtype=np.int64) for _ in range(nlist)]
+        self._pending = [[] for _ in range(nlist)]
+        self._assign(data, 0)
+
+    def _assign(self, vectors: np.ndarray, start: int) -> None:
+        labels = np.argmax(vectors @ self.centroids.T, axis=1)
+        for offset, label in enumerate(labels):
+            self._pending[label].append(start + offset)
+
+    def _list_ids(self, label: int) -> np.ndarray:
+        if self._pending[label]:
+            self._list_arrays[label] = np.concatenate([
+                self._list_arrays[label], np.asarray(self._pending[label], dtype=np.int64)
+            ])
+            self._pending[label] = []
+        return self._list_arrays[label]
+
+    def state(self) -> Dict[str, np.ndarray]:
+        if not self.is_trained:
+            return {}
+        lists = [self._list_ids(label) for label in range(len(self.centroids))]
+        return {
+            "centroids": self.centroids,
+            "list_ids": np.concatenate(lists),
+            "list_offsets": np.cumsum([0] + [len(ids) for ids in lists], dtype=np.int64),
+        }
+
+    def _load_state(self, state: Dict[str, np.ndarray]) -> None:
+        # Pas de k-means ni de réassignation: les listes sont des vues sur les tableaux chargés
+        self.centroids = state["centroids"]
+        list_ids, offsets = state["list_ids"], state["list_offsets"]
+        self._list_arrays = [list_ids[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+        self._pending = [[] for _ in range(len(self._list_arrays))]
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        ids: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        queries = normalize(queries)
+        if len(self) == 0:
+            return _empty_result(len(queries), k)
+
+        nprobe = min(self.nprobe, len(self.centroids)) if self.is_trained else 0
+        # Sous-ensemble plus petit que les listes parcourues: recherche exacte
+        if ids is not None and (not self.is_trained or len(ids) * len(self.centroids) <= len(self) * nprobe):
+            return self._search_subset(queries, k, ids)
+        if not self.is_trained:
+            return _pad(*top_k(queries @ self.vectors.T, k), k)
+
+        allowed = None
+        if ids is not None:
+            allowed = np.zeros(len(self), dtype=bool)
+            allowed[ids] = True
+
+        _, probes = top_k(queries @ self.centroids.T, nprobe)
+
+        all_scores, all_ids = _empty_result(len(queries), k)
+        for row, query in enumerate(queries):
+            candidates = np.concatenate([self._list_ids(label) for label in probes[row]])
+            if allowed is not None:
+                candidates = candidates[allowed[candidates]]
+            if len(candidates) == 0:
+                continue
+            scores, positions = top_k((self.vectors[candidates] @ query)[None, :], k)
+            found = positions.shape[1]
+            all_scores[row, :found] = scores[0]
+            all_ids[row, :found] = candidates[positions[0]]
+
+        return all_scores, all_ids
+
+    def reset(self) -> None:
+        super().reset()
+        self.centroids = None
+        self._list_arrays = []
+        self._pending = []
+
+
+class HNSWIndex(BaseIndex):
+    """
+    Index approximatif HNSW (via hnswlib).
+
+    `ef_search` est le compromis rappel / latence: plus il est grand,
+    meilleur est le rappel et plus la recherche est lente.
+    """
+
+    def __init__(self, M: int = 16, ef_construction: int = 200, ef_search: int = 64, initial_capacity: int = 1024):
+        """
+        Initialise l'index HNSW.
+
+        Args:
+            M: Nombre de liens par noeud
+            ef_construction: Taille de la liste candidate à la construction
+            ef_search: Taille de la liste candidate à la recherche
+            initial_capacity: Capacité initiale du graphe
+        """
+        if not HNSWLIB_AVAILABLE:
+            raise ImportError("Le package 'hnswlib' n'est pas installé.")
+        super().__init__()
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.initial_capacity = initial_capacity
+        self._graph = None
+
+    def _on_add(self, vectors: np.ndarray, start: int) -> None:
+        if self._graph is None:
+            self._graph = hnswlib.Index(space="ip", dim=vectors.shape[1])
+            self._graph.init_index(
+                max_elements=max(self.initial_capacity, len(vectors)),
+                ef_construction=self.ef_construction,
+                M=self.M,
+            )
+        capacity = self._graph.get_max_elements()
+        if len(self) > capacity:
+            self._graph.resize_index(max(len(self), 2 * capacity))
+
+        self._graph.add_items(vectors, np.arange(start, start + len(vectors)))
+
+    def state(self) -> Dict[str, np.ndarray]:
+        if self._graph is None:
+            return {}
+        # Graphe sérialisé par hnswlib, gardé en octets avec les autres structures du store
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "graph.bin")
+            self._graph.save_index(path)
+            return {"graph": np.fromfile(path, dtype=np.uint8)}
+
+    def _load_state(self, state: Dict[str, np.ndarray]) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "graph.bin")
+            np.asarray(state["graph"]).tofile(path)
+            self._graph = hnswlib.Index(space="ip", dim=self.dim)
+            self._graph.load_index(path, max_elements=max(self.initial_capacity, len(self)))
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        ids: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        queries = normalize(queries)
+        if len(self) == 0:
+            return _empty_result(len(queries), k)
+        if ids is not None:
+            return self._search_filtered(queries, k, ids)
+
+        found = min(k, len(self))
+        self._graph.set_ef(max(self.ef_search, found))
+        labels, distances = self._graph.knn_query(queries, k=found)
+        # Espace "ip" de hnswlib: distance = 1 - produit scalaire
+        return _pad(1.0 - distances.astype(np.float32), labels.astype(np.int64), k)
+
+    def _search_filtered(self, queries: np.ndarray, k: int, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Recherche restreinte à `ids`.
+
+        Un sous-ensemble sélectif est parcouru exactement; sinon le graphe est
+        interrogé avec k / sélectivité candidats, filtrés ensuite, et les
+        queries restées incomplètes sont recalculées exactement.
+        """
+        if len(ids) * MAX_FILTER_OVERFETCH <= len(self):
+            return self._search_subset(queries, k, ids)
+
+        fetch = min(len(self), k * -(-len(self) // len(ids)))
+        self._graph.set_ef(max(self.ef_search, fetch))
+        labels, distances = self._graph.knn_query(queries, k=fetch)
+
+        allowed = np.zeros(len(self), dtype=bool)
+        allowed[ids] = True
+        scores, result_ids = _empty_result(len(queries), k)
+        expected = min(k, len(ids))
+        for row in range(len(queries)):
+            keep = allowed[labels[row]]
+            found = min(k, int(keep.sum()))
+            if found < expected:
+                exact_scores, exact_ids = self._search_subset(queries[row:row + 1], k, ids)
+                scores[row], result_ids[row] = exact_scores[0], exact_ids[0]
+                continue
+            scores[row, :found] = 1.0 - distances[row][keep][:found]
+            result_ids[row, :found] = labels[row][keep][:found]
+        return scores, result_ids
+
+    def reset(self) -> None:
+        super().reset()
+        self._graph = None
+
+
+class QuantizedIndex(BaseIndex):
+    """
+    Index approximatif sur des codes quantifiés, avec re-score.
+
+    La recherche parcourt les codes compressés (int8: 4x moins de mémoire
+    que float32; PQ: jusqu'à 32x) avec des queries float32 (ADC), puis
+    recalcule le score des `k * rescore` meilleurs candidats sur les
+    vecteurs d'origine. Seuls les codes et les tables du quantificateur
+    sont gardés en mémoire: les vecteurs float32 ajoutés sont écrits dans
+    un fichier temporaire et ceux d'un store chargé restent dans son
+    embeddings.npy, tous deux ouverts en np.memmap; le re-score ne lit que
+    les lignes des candidats. `rescore` est le compromis rappel /
+    latence (0: scores approchés, sans re-score).
+    """
+
+    def __init__(
+        self,
+        method: str = "int8",
+        rescore: Optional[int] = None,
+        train_size: Optional[int] = None,
+        max_train_size: int = 10_000,
+        seed: int = 0,
+        **quantizer_params
+    ):
+        """
+        Initialise l'index quantifié.
+
+        Args:
+            method: Quantification ("int8" scalaire ou "pq" produit)
+            rescore: Facteur de candidats re-scorés en float32 (k * rescore;
+                défaut: 4 pour "int8", 16 pour "pq")
+            train_size: Nombre de vecteurs avant l'entraînement (défaut: 256
+                pour "int8", 4096 pour "pq"; recherche exacte en attendant)
+            max_train_size: Nombre max de vecteurs (échantillon) pour l'entraînement
+            seed: Graine de l'échantillonnage et du k-means
+            **quantizer_params: Paramètres du quantificateur (ex: m=96 pour "pq")
+        """
+        super().__init__()
+        self._vectors = _MappedVectorBuffer()
+        if method not in QUANTIZED_DEFAULTS:
+            raise ValueError(f"Méthode de quantification inconnue: {method}")
+        defaults = QUANTIZED_DEFAULTS[method]
+        self.method = method
+        self.rescore = defaults["rescore"] if rescore is None else rescore
+        self.train_size = train_size or defaults["train_size"]
+        self.max_train_size = max_train_size
+        self.seed = seed
+        if method == "pq":
+            quantizer_params.setdefault("seed", seed)
+        self.quantizer = create_quantizer(method, **quantizer_params)
+        self._codes = _VectorBuffer(dtype=np.uint8)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.quantizer.is_trained
+
+    @property
+    def codes(self) -> np.ndarray:
+        """Codes quantifiés, dans l'ordre d'insertion."""
+        return self._codes.data
+
+    @property
+    def code_size(self) -> int:
+        """Octets par vecteur encodé (contre 4 * d en float32)."""
+        return self.codes.shape[1] if len(self._codes) else self.quantizer.code_size(self.dim or 0)
+
+    @property
+    def nbytes(self) -> int:
+        """Octets gardés en mémoire: codes et tables du quantificateur (vecteurs sur disque)."""
+        if not self.is_trained:
+            return super().nbytes
+        return self.codes.nbytes + sum(array.nbytes for array in self.quantizer.state().values())
+
+    def _on_add(self, vectors: np.ndarray, start: int) -> None:
+        if not self.is_trained:
+            if len(self) >= self.train_size:
+                self.train()
+            return
+        self._codes.append(self.quantizer.encode(vectors))
+
+    def train(self) -> None:
+        """Entraîne le quantificateur sur (un échantillon de) les vecteurs présents et les encode."""
+        sample = np.arange(len(self))
+        if len(sample) > self.max_train_size:
+            rng = np.random.default_rng(self.seed)
+            sample = np.sort(rng.choice(len(self), self.max_train_size, replace=False))
+        self.quantizer.train(self.vectors[sample])
+
+        self._codes.clear()
+        step = max(1, self.max_train_size)
+        for start in range(0, len(self), step):
+            self._codes.append(self.quantizer.encode(self.vectors[start:start + step]))
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        ids: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        queries = normalize(queries)
+        if len(self) == 0:
+            return _empty_result(len(queries), k)
+        if ids is not None and len(ids) == 0:
+            return _empty_result(len(queries), k)
+        if not self.is_trained:
+            if ids is not None:
+                return self._search_subset(queries, k, ids)
+            return _pad(*top_k(queries @ self.vectors.T, k), k)
+
+        codes = self.codes if ids is None else self.codes[ids]
+        approx = self.quantizer.scores(queries, codes)
+        fetch = k * self.rescore if self.rescore else k
+        approx_scores, positions = top_k(approx, fetch)
+        candidates = positions if ids is None else ids[positions]
+        if not self.rescore:
+            return _pad(approx_scores, candidates, k)
+
+        # Re-score des candidats: seules leurs lignes sont lues
+        rows = np.asarray(self.vectors[candidates.ravel()], dtype=np.float32)
+        exact = np.einsum("qcd,qd->qc", rows.reshape(*candidates.shape, -1), queries)
+        scores, order = top_k(exact, k)
+        return _pad(scores, np.take_along_axis(candidates, order, axis=1), k)
+
+    def state(self) -> Dict[str, np.ndarray]:
+        if not self.is_trained:
+            return {}
+        return {"codes": self.codes, **self.quantizer.state()}
+
+    def _load_state(self, state: Dict[str, np.ndarray]) -> None:
+        state = dict(state)
+        self._codes.wrap(state.pop("codes"))
+        self.quantizer.load_state(state)
+
+    def reset(self) -> None:
+        super().reset()
+        self._codes.clear()
+
+
+def _empty_result(num_queries: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    return (
+        np.full((num_queries, k), -np.inf, dtype=np.float32),
+        np.full((num_queries, k), -1, dtype=np.int64),
+    )
+
+
+def _pad(scores: np.ndarray, ids: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Complète les résultats à k colonnes (scores -inf, indices -1)."""
+    if scores.shape[1] >= k:
+        return scores, ids
+    padded_scores, padded_ids = _empty_result(len(scores), k)
+    padded_scores[:, :scores.shape[1]] = scores
+    padded_ids[:, :ids.shape[1]] = ids
+    return padded_scores, padded_ids
+
+
+def create_index(type: str = "flat", **kwargs) -> BaseIndex:
+    """
+    Factory pour créer un index de similarité.
+
+    Args:
+        type: Type d'index ("flat", "ivf", "hnsw", ou "int8" / "pq" quantifiés)
+        **kwargs: Paramètres de l'index
+
+    Returns:
+        Instance d'index
+    """
+    if type == "flat":
+        return FlatIndex(**kwargs)
+    elif type == "ivf":
+        return IVFIndex(**kwargs)
+    elif type == "hnsw":
+        return HNSWIndex(**kwargs)
+    elif type in ("int8", "pq"):
+        return QuantizedIndex(method=type, **kwargs)
+    else:
+        raise ValueError(f"Type d'index inconnu: {type}")
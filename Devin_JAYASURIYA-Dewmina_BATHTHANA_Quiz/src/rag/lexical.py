@@ -0,0 +1,252 @@
+"""Recherche lexicale: tokenisation, BM25 et fusion de classements."""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .index import top_k
+
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Mots vides français et anglais les plus fréquents
+STOPWORDS = frozenset("""
+le la les un une des du de d l et ou en à au aux ce ces cet cette dans par pour sur
+avec sans est sont être a ont qui que quoi dont où il elle ils elles on nous vous
+se sa son ses leur leurs ne pas plus the of and or to in on for is are be a an with
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Découpe un texte en termes pour l'indexation lexicale.
+
+    Casse et accents sont ignorés, les mots vides retirés.
+
+    Args:
+        text: Texte à découper
+
+    Returns:
+        Liste des termes
+    """
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    normalized = "".join(c for c in normalized if not unicodedata.combining(c))
+    return [token for token in TOKEN_PATTERN.findall(normalized) if token not in STOPWORDS]
+
+
+def bm25_scores(
+    query: str,
+    documents: Sequence[str],
+    k1: float = 1.5,
+    b: float = 0.75
+) -> List[float]:
+    """
+    Calcule les scores BM25 d'une requête sur un petit ensemble de documents.
+
+    Les statistiques (IDF, longueur moyenne) sont celles de l'ensemble
+    fourni: adapté au reclassement de quelques candidats.
+
+    Args:
+        query: Requête
+        documents: Textes candidats
+        k1: Saturation de la fréquence des termes
+        b: Normalisation par la longueur
+
+    Returns:
+        Score BM25 de chaque document
+    """
+    query_terms = set(tokenize(query))
+    if not documents or not query_terms:
+        return [0.0] * len(documents)
+
+    doc_terms = [Counter(tokenize(doc)) for doc in documents]
+    lengths = [sum(terms.values()) for terms in doc_terms]
+    avg_length = (sum(lengths) / len(lengths)) or 1.0
+
+    n = len(documents)
+    idf: Dict[str, float] = {}
+    for term in query_terms:
+        df = sum(1 for terms in doc_terms if term in terms)
+        idf[term] = math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    scores = []
+    for terms, length in zip(doc_terms, lengths):
+        norm = k1 * (1 - b + b * length / avg_length)
+        scores.append(sum(
+            idf[term] * terms[term] * (k1 + 1) / (terms[term] + norm)
+            for term in query_terms if term in terms
+        ))
+    return scores
+
+
+def reciprocal_rank_fusion(
+    scores: Sequence[Sequence[Optional[float]]],
+    k: int = 60
+) -> List[float]:
+    """
+    Fusionne plusieurs classements par rang réciproque (RRF).
+
+    Args:
+        scores: Pour chaque classement, le score de chaque document (plus
+            haut = meilleur; None si le document n'y figure pas)
+        k: Constante d'amortissement des rangs
+
+    Returns:
+        Score fusionné de chaque document: somme des 1 / (k + rang) sur les
+        seuls classements où il figure
+    """
+    if not scores:
+        return []
+
+    fused = [0.0] * len(scores[0])
+    for ranking in scores:
+        present = [i for i, score in enumerate(ranking) if score is not None]
+        order = sorted(present, key=lambda i: ranking[i], reverse=True)
+        for rank, i in enumerate(order, 1):
+            fused[i] += 1.0 / (k + rank)
+    return fused
+
+
+class SparseIndex:
+    """
+    Index inversé BM25 en mémoire (matrices creuses scipy).
+
+    Les poids BM25 de chaque (document, terme) sont précalculés dans une
+    matrice creuse; une requête, ou un lot de requêtes, est un simple
+    produit matrice creuse x vecteur, sans appel réseau. Les ajouts sont
+    incrémentaux: la matrice n'est recalculée qu'à la recherche suivante.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialise l'index.
+
+        Args:
+            k1: Saturation de la fréquence des termes
+            b: Normalisation par la longueur
+        """
+        if not SCIPY_AVAILABLE:
+            raise ImportError("Le package 'scipy' est requis pour la recherche lexicale.")
+
+        self.k1 = k1
+        self.b = b
+        self.vocabulary: Dict[str, int] = {}
+        self._rows: List[int] = []
+        self._cols: List[int] = []
+        self._counts: List[int] = []
+        self._lengths: List[int] = []
+        self._weights = None
+        self._idf: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, texts: Sequence[str]) -> None:
+        """
+        Ajoute des documents à l'index.
+
+        Args:
+            texts: Textes des documents (leurs ids suivent ceux déjà indexés)
+        """
+        for text in texts:
+            row = len(self._lengths)
+            terms = Counter(tokenize(text))
+            for term, count in terms.items():
+                col = self.vocabulary.setdefault(term, len(self.vocabulary))
+                self._rows.append(row)
+                self._cols.append(col)
+                self._counts.append(count)
+            self._lengths.append(sum(terms.values()))
+        self._weights = None
+
+    def _build(self) -> None:
+        """Calcule la matrice des poids BM25 (documents x termes)."""
+        n, vocab_size = len(self._lengths), len(self.vocabulary)
+        rows = np.asarray(self._rows, dtype=np.int64)
+        cols = np.asarray(self._cols, dtype=np.int64)
+        tf = np.asarray(self._counts, dtype=np.float32)
+        lengths = np.asarray(self._lengths, dtype=np.float32)
+
+        df = np.bincount(cols, minlength=vocab_size).astype(np.float32)
+        self._idf = np.log1p((n - df + 0.5) / (df + 0.5)).astype(np.float32)
+        avg_length = lengths.mean() if n and lengths.mean() > 0 else 1.0
+        norm = self.k1 * (1 - self.b + self.b * lengths[rows] / avg_length)
+
+        data = self._idf[cols] * tf * (self.k1 + 1) / (tf + norm)
+        self._weights = sparse.csr_matrix((data, (rows, cols)), shape=(n, vocab_size))
+
+    def search(
+        self,
+        queries: Sequence[str],
+        k: int,
+        ids: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Recherche les documents les plus pertinents pour un lot de requêtes.
+
+        Les scores sont normalisés par le score maximal atteignable pour la
+        requête (tous ses termes saturés): ils sont compris entre 0 et 1.
+
+        Args:
+            queries: Requêtes
+            k: Nombre de résultats par requête
+            ids: Sous-ensemble (trié) des documents candidats (défaut: tous)
+
+        Returns:
+            Tuple (scores, ids) de forme (len(queries), k), complété par 0 / -1
+        """
+        m = len(queries)
+        scores = np.zeros((m, k), dtype=np.float32)
+        result_ids = np.full((m, k), -1, dtype=np.int64)
+        if not len(self) or not m or (ids is not None and len(ids) == 0):
+            return scores, result_ids
+        if self._weights is None:
+            self._build()
+
+        # Matrice creuse termes x requêtes
+        rows, cols = [], []
+        for j, query in enumerate(queries):
+            for term in set(tokenize(query)):
+                col = self.vocabulary.get(term)
+                if col is not None:
+                    rows.append(col)
+                    cols.append(j)
+        if not rows:
+            return scores, result_ids
+
+        query_matrix = sparse.csc_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(self.vocabulary), m)
+        )
+        max_scores = query_matrix.T @ (self._idf * (self.k1 + 1))
+        max_scores[max_scores == 0] = 1.0
+
+        # Seules les lignes des documents candidats sont multipliées
+        weights = self._weights if ids is None else self._weights[ids]
+        # (documents x requêtes) -> (requêtes x documents)
+        all_scores = np.asarray((weights @ query_matrix).todense()).T / max_scores[:, None]
+        found_scores, found_ids = top_k(all_scores, k)
+        if ids is not None:
+            found_ids = ids[found_ids]
+        found_ids = np.where(found_scores > 0, found_ids, -1)
+
+        width = found_scores.shape[1]
+        scores[:, :width] = found_scores
+        result_ids[:, :width] = found_ids
+        return scores, result_ids
+
+    def reset(self) -> None:
+        """Vide l'index."""
+        self.vocabulary = {}
+        self._rows, self._cols, self._counts, self._lengths = [], [], [], []
+        self._weights = None
+        self._idf = None
@@ -0,0 +1,192 @@
+"""Index des métadonnées des documents (pré-filtrage des recherches).
+
+Un filtre est résolu en tableau trié d'ids de documents *avant* le calcul
+des similarités: seuls les vecteurs de ce sous-ensemble sont comparés à la
+query. Syntaxe d'un filtre (conditions combinées par ET):
+
+- ``{"source": "cours1.pdf"}``: égalité;
+- ``{"course": ["algo", "réseaux"]}``: appartenance à une liste;
+- ``{"page": {"gte": 3, "lte": 10}}``: intervalle (``gt``, ``gte``, ``lt``,
+  ``lte``), éventuellement avec ``eq`` ou ``in``.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+RANGE_OPERATORS = ("gt", "gte", "lt", "lte")
+SCALAR_TYPES = (str, int, float, bool)
+
+
+class MetadataIndex:
+    """
+    Index inversé des champs scalaires des documents.
+
+    Pour chaque champ, les ids des documents sont rangés par valeur (listes
+    triées, par construction); les champs numériques ont en plus une colonne
+    triée par valeur pour les intervalles (recherche dichotomique). Les
+    ajouts sont incrémentaux: les tableaux NumPy sont recalculés à la
+    demande, seulement pour les champs modifiés.
+    """
+
+    def __init__(self, exclude: Iterable[str] = ("text", "embedding")):
+        """
+        Initialise l'index.
+
+        Args:
+            exclude: Champs non indexés (texte, embedding...)
+        """
+        self.exclude = set(exclude)
+        self._size = 0
+        self._postings: Dict[str, Dict[Any, List[int]]] = {}
+        self._posting_arrays: Dict[Tuple[str, Any], np.ndarray] = {}
+        self._numeric: Dict[str, Tuple[List[float], List[int]]] = {}
+        self._sorted: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def fields(self) -> List[str]:
+        """Champs indexés."""
+        return sorted(self._postings)
+
+    def add(self, documents: Iterable[Dict[str, Any]]) -> None:
+        """
+        Indexe des documents (leurs ids suivent ceux déjà indexés).
+
+        Args:
+            documents: Documents dont les champs scalaires sont indexés
+        """
+        for doc in documents:
+            doc_id = self._size
+            for field, value in doc.items():
+                if field in self.exclude or not isinstance(value, SCALAR_TYPES):
+                    continue
+                self._postings.setdefault(field, {}).setdefault(value, []).append(doc_id)
+                self._posting_arrays.pop((field, value), None)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    values, ids = self._numeric.setdefault(field, ([], []))
+                    values.append(value)
+                    ids.append(doc_id)
+                    self._sorted.pop(field, None)
+            self._size += 1
+
+    def values(self, field: str) -> Dict[Any, int]:
+        """
+        Valeurs d'un champ et nombre de documents pour chacune.
+
+        Args:
+            field: Nom du champ
+
+        Returns:
+            Dictionnaire {valeur: nombre de documents}
+        """
+        return {value: len(ids) for value, ids in self._postings.get(field, {}).items()}
+
+    def resolve(self, filters: Dict[str, Any]) -> np.ndarray:
+        """
+        Résout un filtre en ids de documents.
+
+        Args:
+            filters: Conditions par champ (voir la docstring du module)
+
+        Returns:
+            Tableau trié des ids satisfaisant toutes les conditions
+        """
+        if not filters:
+            return np.arange(self._size, dtype=np.int64)
+
+        # Intersection en partant des conditions les plus sélectives
+        matches = sorted((self._match(field, condition) for field, condition in filters.items()), key=len)
+        result = matches[0]
+        for ids in matches[1:]:
+            if len(result) == 0:
+                break
+            result = np.intersect1d(result, ids, assume_unique=True)
+        return result
+
+    def _match(self, field: str, condition: Any) -> np.ndarray:
+        """Ids des documents dont le champ satisfait une condition."""
+        if isinstance(condition, dict):
+            unknown = set(condition) - set(RANGE_OPERATORS) - {"eq", "in"}
+            if unknown:
+                raise ValueError(f"Opérateur de filtre inconnu pour '{field}': {', '.join(sorted(unknown))}")
+
+            parts = []
+            if "eq" in condition:
+                parts.append(self._equal(field, condition["eq"]))
+            if "in" in condition:
+                parts.append(self._any_of(field, condition["in"]))
+            if any(op in condition for op in RANGE_OPERATORS):
+                parts.append(self._range(field, condition))
+            if not parts:
+                return np.arange(self._size, dtype=np.int64)
+            result = parts[0]
+            for ids in parts[1:]:
+                result = np.intersect1d(result, ids, assume_unique=True)
+            return result
+
+        if isinstance(condition, (list, tuple, set, frozenset)):
+            return self._any_of(field, condition)
+        return self._equal(field, condition)
+
+    def _equal(self, field: str, value: Any) -> np.ndarray:
+        key = (field, value)
+        if key not in self._posting_arrays:
+            ids = self._postings.get(field, {}).get(value, [])
+            self._posting_arrays[key] = np.asarray(ids, dtype=np.int64)
+        return self._posting_arrays[key]
+
+    def _any_of(self, field: str, values: Iterable[Any]) -> np.ndarray:
+        parts = [self._equal(field, value) for value in values]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(parts))
+
+    def _range(self, field: str, condition: Dict[str, Any]) -> np.ndarray:
+        if field not in self._numeric:
+            return np.empty(0, dtype=np.int64)
+        if field not in self._sorted:
+            values, ids = self._numeric[field]
+            order = np.argsort(values, kind="stable")
+            self._sorted[field] = (np.asarray(values, dtype=np.float64)[order], np.asarray(ids, dtype=np.int64)[order])
+        values, ids = self._sorted[field]
+
+        low, high = 0, len(values)
+        if "gte" in condition:
+            low = max(low, np.searchsorted(values, condition["gte"], side="left"))
+        if "gt" in condition:
+            low = max(low, np.searchsorted(values, condition["gt"], side="right"))
+        if "lte" in condition:
+            high = min(high, np.searchsorted(values, condition["lte"], side="right"))
+        if "lt" in condition:
+            high = min(high, np.searchsorted(values, condition["lt"], side="left"))
+        return np.sort(ids[low:high]) if low < high else np.empty(0, dtype=np.int64)
+
+    def reset(self) -> None:
+        """Vide l'index."""
+        self._size = 0
+        self._postings = {}
+        self._posting_arrays = {}
+        self._numeric = {}
+        self._sorted = {}
+
+
+def build_filters(
+    filters: Optional[Dict[str, Any]] = None,
+    collection: Optional[str | List[str]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Combine un filtre et une ou plusieurs collections.
+
+    Args:
+        filters: Conditions sur les métadonnées
+        collection: Nom (ou liste de noms) de collection
+
+    Returns:
+        Filtre combiné, ou None si aucune condition
+    """
+    if collection is None:
+        return filters or None
+    return {**(filters or {}), "collection": collection}
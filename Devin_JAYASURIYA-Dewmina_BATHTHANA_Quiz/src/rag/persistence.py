@@ -0,0 +1,214 @@
+"""Format de persistance binaire (memory-mapped) du vector store.
+
+Un store sauvegardé est un dossier contenant:
+
+- ``embeddings.npy``: matrice (n, d) des embeddings normalisés (float32 ou float16),
+  ouverte avec ``np.load(mmap_mode="r")`` au chargement;
+- ``documents.jsonl``: un document par ligne, sans les embeddings;
+- ``meta.json``: version du format, dimensions, dtype et configuration du store;
+- ``index_<nom>.npy`` (optionnel): structures entraînées de l'index (centroïdes
+  et listes inversées IVF, graphe HNSW, codes et dictionnaires d'un index
+  quantifié), listées dans ``meta["index_state"]``: le chargement ne
+  ré-entraîne ni ne reconstruit l'index.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+EMBEDDINGS_FILE = "embeddings.npy"
+DOCUMENTS_FILE = "documents.jsonl"
+META_FILE = "meta.json"
+
+SUPPORTED_DTYPES = ("float32", "float16")
+
+
+def save_store(
+    path: str | Path,
+    documents: List[Dict[str, Any]],
+    embeddings: np.ndarray,
+    meta: Dict[str, Any],
+    dtype: str = "float32",
+    index_state: Optional[Dict[str, np.ndarray]] = None
+) -> Path:
+    """
+    Sauvegarde un store au format binaire.
+
+    Args:
+        path: Dossier de destination
+        documents: Documents (le champ embedding est retiré)
+        embeddings: Matrice (n, d) des embeddings
+        meta: Métadonnées du store (modèle, colonne d'embedding, index...)
+        dtype: Type de stockage ("float32" ou "float16")
+        index_state: Structures de l'index à sauvegarder (voir BaseIndex.state)
+
+    Returns:
+        Chemin du dossier créé
+    """
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"dtype non supporté: {dtype}")
+    if len(documents) != len(embeddings):
+        raise ValueError(
+            f"Nombre de documents ({len(documents)}) différent du nombre d'embeddings ({len(embeddings)})"
+        )
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    embedding_col = meta.get("embedding_col", "embedding")
+
+    np.save(path / EMBEDDINGS_FILE, np.ascontiguousarray(embeddings, dtype=dtype))
+    index_state = index_state or {}
+    for name, array in index_state.items():
+        np.save(path / f"index_{name}.npy", np.ascontiguousarray(array))
+
+    with open(path / DOCUMENTS_FILE, "w", encoding="utf-8") as f:
+        for doc in documents:
+            record = {key: value for key, value in doc.items() if key != embedding_col}
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str))
+            f.write("\n")
+
+    header = {
+        **meta,
+        "format_version": FORMAT_VERSION,
+        "count": len(documents),
+        "dim": int(embeddings.shape[1]) if len(embeddings) else 0,
+        "dtype": dtype,
+        "normalized": True,
+        "index_state": sorted(index_state),
+    }
+    with open(path / META_FILE, "w", encoding="utf-8") as f:
+        json.dump(header, f, indent=2)
+
+    return path
+
+
+def load_store(path: str | Path, mmap: bool = True) -> Tuple[List[Dict[str, Any]], np.ndarray, Dict[str, Any]]:
+    """
+    Charge un store binaire.
+
+    Args:
+        path: Dossier du store
+        mmap: Ouvrir les embeddings en lecture seule via np.memmap (pages partagées
+            entre processus) plutôt que de les charger en mémoire
+
+    Returns:
+        Tuple (documents, embeddings, meta)
+    """
+    path = Path(path)
+    with open(path / META_FILE, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+
+    version = meta.get("format_version")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Version de format non supportée: {version} (attendu: {FORMAT_VERSION})")
+
+    embeddings = np.load(path / EMBEDDINGS_FILE, mmap_mode="r" if mmap else None)
+
+    documents = []
+    with open(path / DOCUMENTS_FILE, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                documents.append(json.loads(line))
+
+    if len(documents) != len(embeddings):
+        raise ValueError(f"Store corrompu: {len(documents)} documents pour {len(embeddings)} embeddings")
+
+    return documents, embeddings, meta
+
+
+def load_index_state(path: str | Path, meta: Dict[str, Any], mmap: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Charge les structures de l'index sauvegardées avec un store.
+
+    Args:
+        path: Dossier du store
+        meta: Métadonnées retournées par `load_store`
+        mmap: Ouvrir les tableaux en lecture seule via np.memmap
+
+    Returns:
+        Tableaux par nom (vide si l'index n'en a pas sauvegardé)
+    """
+    path = Path(path)
+    return {
+        name: np.load(path / f"index_{name}.npy", mmap_mode="r" if mmap else None)
+        for name in meta.get("index_state", [])
+    }
+
+
+def is_legacy_store(path: str | Path) -> bool:
+    """Indique si le chemin pointe vers un ancien store JSON."""
+    return Path(path).is_file()
+
+
+def read_legacy_store(path: str | Path) -> Tuple[List[Dict[str, Any]], np.ndarray, List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Lit un ancien store JSON (VectorStore.save historique).
+
+    Les embeddings sont lus dans la liste "embeddings" du fichier ou, à
+    défaut, dans le champ embedding de chaque document (retiré du document).
+    Les documents sans embedding sont retournés à part.
+
+    Args:
+        path: Fichier JSON
+
+    Returns:
+        Tuple (documents avec embedding, matrice (n, d) de leurs embeddings,
+        documents sans embedding, meta)
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    documents = data.get("documents", [])
+    embedding_col = data.get("embedding_col", "embedding")
+    in_documents = [doc.pop(embedding_col, None) for doc in documents]
+    stored = data.get("embeddings")
+    vectors = stored if stored and len(stored) == len(documents) else in_documents
+
+    indexed = [i for i, vector in enumerate(vectors) if vector is not None and len(vector)]
+    embeddings = (
+        np.array([vectors[i] for i in indexed], dtype=np.float32) if indexed
+        else np.empty((0, 0), dtype=np.float32)
+    )
+    with_vectors = set(indexed)
+    missing = [doc for i, doc in enumerate(documents) if i not in with_vectors]
+    meta = {
+        "embedding_col": embedding_col,
+        "model": data.get("model", "text-embedding-3-large"),
+    }
+    return [documents[i] for i in indexed], embeddings, missing, meta
+
+
+def convert_legacy_store(
+    src: str | Path,
+    dst: str | Path,
+    dtype: str = "float32",
+    embedder: Optional[Any] = None
+) -> Path:
+    """
+    Convertit un ancien store JSON (VectorStore.save historique) au format binaire.
+
+    Args:
+        src: Fichier JSON source
+        dst: Dossier de destination
+        dtype: Type de stockage ("float32" ou "float16")
+        embedder: Embedder des documents sans embedding (ajoutés à la fin du
+            store); sans embedder, ces documents ne sont pas convertis
+
+    Returns:
+        Chemin du dossier créé
+    """
+    from .index import normalize
+
+    documents, embeddings, missing, meta = read_legacy_store(src)
+    if missing and embedder is not None:
+        created = embedder.embed([doc.get("text", "") for doc in missing])
+        embeddings = np.concatenate([embeddings, created]) if len(embeddings) else np.asarray(created, dtype=np.float32)
+        documents = documents + missing
+
+    if len(embeddings):
+        embeddings = normalize(embeddings)
+    return save_store(dst, documents, embeddings, meta, dtype=dtype)
@@ -0,0 +1,266 @@
+"""Quantification des embeddings (scalaire 8 bits et produit).
+
+Les vecteurs sont compressés en codes uint8; le score d'une query (gardée en
+float32) contre un code est calculé directement sur le code (calcul de
+distance asymétrique, ADC), sans décompresser la matrice:
+
+- ``ScalarQuantizer``: un octet par dimension (4x moins que float32);
+- ``ProductQuantizer``: un octet par sous-espace de `d / m` dimensions
+  (32x moins que float32 avec des sous-espaces de 8 dimensions).
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+# Octets de codes traités à la fois (borne la mémoire temporaire du parcours)
+SCAN_BLOCK_ELEMENTS = 1 << 22
+
+
+class ScalarQuantizer:
+    """
+    Quantification scalaire sur 8 bits, par dimension.
+
+    Chaque dimension est ramenée sur 256 niveaux entre ses valeurs min et
+    max d'entraînement: x ≈ offset + scale * code. Le produit scalaire avec
+    une query q vaut alors q·offset + (q * scale)·code.
+    """
+
+    def __init__(self):
+        self.offset: Optional[np.ndarray] = None
+        self.scale: Optional[np.ndarray] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.scale is not None
+
+    def code_size(self, dim: int) -> int:
+        """Octets par vecteur encodé."""
+        return dim
+
+    def train(self, vectors: np.ndarray) -> None:
+        """
+        Calcule les bornes de chaque dimension.
+
+        Args:
+            vectors: Matrice (n, d) d'entraînement
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        low, high = vectors.min(axis=0), vectors.max(axis=0)
+        scale = (high - low) / 255.0
+        scale[scale == 0] = 1.0
+        self.offset, self.scale = low, scale.astype(np.float32)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Encode des vecteurs (valeurs hors bornes écrêtées).
+
+        Args:
+            vectors: Matrice (n, d)
+
+        Returns:
+            Codes uint8 (n, d)
+        """
+        codes = np.rint((np.asarray(vectors, dtype=np.float32) - self.offset) / self.scale)
+        return np.clip(codes, 0, 255).astype(np.uint8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Reconstruit des vecteurs approchés à partir de leurs codes."""
+        return self.offset + codes.astype(np.float32) * self.scale
+
+    def scores(self, queries: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """
+        Produits scalaires approchés entre queries et vecteurs encodés.
+
+        Args:
+            queries: Matrice (m, d) float32
+            codes: Codes (n, d)
+
+        Returns:
+            Matrice (m, n) de scores
+        """
+        weights = (queries * self.scale).T
+        bias = queries @ self.offset
+        result = np.empty((len(queries), len(codes)), dtype=np.float32)
+        step = _block_rows(codes)
+        for start in range(0, len(codes), step):
+            block = np.asarray(codes[start:start + step], dtype=np.float32)
+            result[:, start:start + len(block)] = (block @ weights).T
+        return result + bias[:, None]
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Paramètres entraînés, à sauvegarder avec les codes."""
+        return {"offset": self.offset, "scale": self.scale}
+
+    def load_state(self, state: Dict[str, np.ndarray]) -> None:
+        """Restaure les paramètres entraînés."""
+        self.offset = np.asarray(state["offset"], dtype=np.float32)
+        self.scale = np.asarray(state["scale"], dtype=np.float32)
+
+
+class ProductQuantizer:
+    """
+    Quantification produit (PQ).
+
+    Les vecteurs sont découpés en `m` sous-vecteurs; chaque sous-espace a
+    son dictionnaire de 256 centroïdes (k-means) et un sous-vecteur est
+    remplacé par l'indice de son centroïde le plus proche. Pour une query,
+    une table (m, 256) des produits scalaires avec les centroïdes est
+    calculée une fois; le score d'un code est la somme de m lectures de
+    cette table.
+    """
+
+    def __init__(self, m: Optional[int] = None, sub_dim: int = 8, iterations: int = 10, seed: int = 0):
+        """
+        Initialise le quantificateur.
+
+        Args:
+            m: Nombre de sous-espaces (doit diviser la dimension; défaut:
+                dimension / sub_dim)
+            sub_dim: Dimension visée des sous-espaces quand m n'est pas fourni
+            iterations: Itérations du k-means
+            seed: Graine du k-means
+        """
+        self.m = m
+        self.sub_dim = sub_dim
+        self.iterations = iterations
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def code_size(self, dim: int) -> int:
+        """Octets par vecteur encodé."""
+        return self.m or _default_subspaces(dim, self.sub_dim)
+
+    def train(self, vectors: np.ndarray) -> None:
+        """
+        Entraîne un dictionnaire de centroïdes par sous-espace (k-means).
+
+        Args:
+            vectors: Matrice (n, d) d'entraînement
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        n, dim = vectors.shape
+        m = self.m or _default_subspaces(dim, self.sub_dim)
+        if dim % m:
+            raise ValueError(f"m={m} ne divise pas la dimension {dim}")
+        self.m = m
+
+        sub = vectors.reshape(n, m, dim // m)
+        ksub = min(256, n)
+        rng = np.random.default_rng(self.seed)
+        centroids = np.zeros((m, 256, dim // m), dtype=np.float32)
+
+        for j in range(m):
+            data = sub[:, j]
+            codebook = data[rng.choice(n, ksub, replace=False)].copy()
+            for _ in range(self.iterations):
+                labels = _nearest(data, codebook)
+                sums = np.zeros_like(codebook)
+                np.add.at(sums, labels, data)
+                counts = np.bincount(labels, minlength=ksub)
+                # Les centroïdes vides gardent leur position
+                filled = counts > 0
+                codebook[filled] = sums[filled] / counts[filled, None]
+            centroids[j, :ksub] = codebook
+            # Centroïdes inutilisés (moins de 256 vecteurs): jamais choisis
+            centroids[j, ksub:] = codebook[0]
+
+        self.centroids = centroids
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Encode des vecteurs.
+
+        Args:
+            vectors: Matrice (n, d)
+
+        Returns:
+            Codes uint8 (n, m)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        sub = vectors.reshape(len(vectors), self.m, -1)
+        codes = np.empty((len(vectors), self.m), dtype=np.uint8)
+        for j in range(self.m):
+            codes[:, j] = _nearest(sub[:, j], self.centroids[j])
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Reconstruit des vecteurs approchés à partir de leurs codes."""
+        parts = self.centroids[np.arange(self.m), codes]
+        return parts.reshape(len(codes), -1)
+
+    def scores(self, queries: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """
+        Produits scalaires approchés (ADC) entre queries et vecteurs encodés.
+
+        Args:
+            queries: Matrice (q, d) float32
+            codes: Codes (n, m)
+
+        Returns:
+            Matrice (q, n) de scores
+        """
+        # Tables (q, m, 256): produit scalaire de chaque sous-query avec chaque centroïde
+        tables = np.einsum("qjs,jks->qjk", queries.reshape(len(queries), self.m, -1), self.centroids)
+        # Une table aplatie par query: l'entrée (j, code) est à j * 256 + code
+        flat_tables = tables.reshape(len(queries), -1)
+        offsets = np.arange(self.m, dtype=np.intp) * 256
+
+        result = np.empty((len(queries), len(codes)), dtype=np.float32)
+        step = _block_rows(codes)
+        for start in range(0, len(codes), step):
+            block = np.asarray(codes[start:start + step]).astype(np.intp) + offsets
+            for row, table in enumerate(flat_tables):
+                result[row, start:start + len(block)] = table[block].sum(axis=1)
+        return result
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Paramètres entraînés, à sauvegarder avec les codes."""
+        return {"centroids": self.centroids}
+
+    def load_state(self, state: Dict[str, np.ndarray]) -> None:
+        """Restaure les paramètres entraînés."""
+        self.centroids = np.asarray(state["centroids"], dtype=np.float32)
+        self.m = self.centroids.shape[0]
+
+
+def _default_subspaces(dim: int, sub_dim: int) -> int:
+    """Nombre de sous-espaces: plus petite dimension >= sub_dim divisant dim."""
+    for size in range(min(sub_dim, dim), dim + 1):
+        if dim % size == 0:
+            return dim // size
+    return 1
+
+
+def _block_rows(codes: np.ndarray) -> int:
+    """Nombre de lignes de codes par bloc de parcours."""
+    return max(1, SCAN_BLOCK_ELEMENTS // max(1, codes.shape[1]))
+
+
+def _nearest(data: np.ndarray, codebook: np.ndarray) -> np.ndarray:
+    """Indice du centroïde le plus proche (L2) de chaque ligne."""
+    # argmin ||x - c||² = argmax (2 x·c - ||c||²)
+    return np.argmax(2 * data @ codebook.T - (codebook ** 2).sum(axis=1), axis=1)
+
+
+def create_quantizer(method: str = "int8", **kwargs) -> ScalarQuantizer | ProductQuantizer:
+    """
+    Factory pour créer un quantificateur.
+
+    Args:
+        method: "int8" (scalaire) ou "pq" (produit)
+        **kwargs: Paramètres du quantificateur
+
+    Returns:
+        Instance de quantificateur
+    """
+    if method == "int8":
+        return ScalarQuantizer(**kwargs)
+    elif method == "pq":
+        return ProductQuantizer(**kwargs)
+    else:
+        raise ValueError(f"Méthode de quantification inconnue: {method}")
@@ -2,6 +2,7 @@
 
 from typing import List, Dict, Any, Optional
 from .vectorstore import VectorStore
+from .lexical import bm25_scores, reciprocal_rank_fusion
 
 
 class SimpleReranker:
@@ -78,6 +79,108 @@ class SimpleReranker:
         }
 
 
+class HybridReranker:
+    """
+    Reranker local: BM25 sur les candidats fusionné au score vectoriel (RRF).
+
+    Sans appel réseau, il reclasse les résultats d'une recherche vectorielle
+    en tenant compte des termes exacts de la requête. Si les scores bruts
+    (vectoriel et BM25, normalisés par leur maximum) ne départagent pas les
+    deux premiers résultats et qu'un reranker de repli (LLMReranker) est
+    fourni, la décision lui est déléguée. Le rang fusionné ne sert pas à ce
+    test: deux signaux en désaccord donnent une égalité RRF même quand l'un
+    des deux est nettement plus tranché que l'autre.
+    """
+
+    def __init__(
+        self,
+        max_results: int = 5,
+        rrf_k: int = 60,
+        margin: float = 0.05,
+        fallback: Optional["LLMReranker"] = None
+    ):
+        """
+        Initialise le reranker.
+
+        Args:
+            max_results: Nombre max de résultats à conserver
+            rrf_k: Constante de la fusion par rang réciproque
+            margin: Écart moyen minimal entre les deux premiers résultats
+                (scores vectoriel et BM25 normalisés) en dessous duquel le
+                repli est sollicité
+            fallback: Reranker plus coûteux utilisé pour les cas indécis
+        """
+        self.max_results = max_results
+        self.rrf_k = rrf_k
+        self.margin = margin
+        self.fallback = fallback
+
+        self.calls = 0
+        self.escalations = 0
+
+    def rerank(
+        self,
+        query: str,
+        results: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Reranke les résultats.
+
+        Args:
+            query: Query originale
+            results: Liste de résultats (avec 'text' et 'score')
+
+        Returns:
+            Liste de résultats rerankés, avec 'rerank_score' et 'bm25_score'
+        """
+        if not results:
+            return []
+        self.calls += 1
+
+        lexical = bm25_scores(query, [r.get("text", "") for r in results])
+        fused = reciprocal_rank_fusion([[r.get("score", 0) for r in results], lexical], k=self.rrf_k)
+
+        ordered = []
+        for i in sorted(range(len(results)), key=lambda i: fused[i], reverse=True):
+            doc = results[i].copy()
+            doc["bm25_score"] = lexical[i]
+            doc["rerank_score"] = fused[i]
+            ordered.append(doc)
+
+        if self.fallback is not None and self._too_close(ordered):
+            self.escalations += 1
+            return self.fallback.rerank(query, ordered)[:self.max_results]
+
+        return ordered[:self.max_results]
+
+    def _too_close(self, ordered: List[Dict[str, Any]]) -> bool:
+        """
+        Indique si les deux premiers résultats ne peuvent être départagés.
+
+        Pour chaque signal, l'écart entre les deux premiers est rapporté au
+        meilleur score du signal sur les candidats (signé: positif s'il
+        favorise le premier). Un signal nettement tranché l'emporte sur un
+        léger désaccord de l'autre; des écarts faibles ou qui se compensent
+        déclenchent le repli.
+        """
+        if len(ordered) < 2:
+            return False
+
+        gaps = []
+        for key in ("score", "bm25_score"):
+            best = max(abs(r.get(key, 0)) for r in ordered)
+            if best > 0:
+                gaps.append((ordered[0].get(key, 0) - ordered[1].get(key, 0)) / best)
+            else:
+                gaps.append(0.0)
+        return abs(sum(gaps)) / len(gaps) < self.margin
+
+    @property
+    def escalation_rate(self) -> float:
+        """Part des requêtes déléguées au reranker de repli."""
+        return self.escalations / self.calls if self.calls else 0.0
+
+
 class LLMReranker:
     """Reranker utilisant un LLM pour évaluer la pertinence."""
 
@@ -168,19 +271,26 @@ class LLMReranker:
             return results
 
 
-def create_reranker(type: str = "simple", **kwargs) -> SimpleReranker | LLMReranker:
+def create_reranker(type: str = "simple", **kwargs) -> SimpleReranker | HybridReranker | LLMReranker:
     """
     Factory pour créer un reranker.
 
     Args:
-        type: Type de reranker ("simple" ou "llm")
-        **kwargs: Paramètres du reranker
+        type: Type de reranker ("simple", "hybrid" ou "llm")
+        **kwargs: Paramètres du reranker; pour "hybrid", escalate=True ajoute
+            un LLMReranker de repli (paramètres model et api_key)
 
     Returns:
         Instance de reranker
     """
     if type == "simple":
         return SimpleReranker(**kwargs)
+    elif type == "hybrid":
+        escalate = kwargs.pop("escalate", False)
+        llm_kwargs = {key: kwargs.pop(key) for key in ("model", "api_key") if key in kwargs}
+        if escalate:
+            kwargs["fallback"] = LLMReranker(**llm_kwargs)
+        return HybridReranker(**kwargs)
     elif type == "llm":
         return LLMReranker(**kwargs)
     else:
@@ -1,73 +1,314 @@
 """Vector store pour la recherche vectorielle en RAG."""
 
+import threading
+from collections import OrderedDict
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Any, Optional
-from sklearn.neighbors import NearestNeighbors
+from typing import List, Dict, Any, Iterable, Optional
 
+from ..config import settings
 from ..llm.client import LLMClient
+from .index import BaseIndex, create_index
+from .embeddings import OpenAIEmbedder, CachedEmbedder, HashingEmbedder, EmbeddingRetryQueue
+from .cache import get_default_embedding_cache
+from .persistence import save_store, load_store, load_index_state, is_legacy_store, read_legacy_store
+from .dedup import NearDuplicateFilter
+from .lexical import SparseIndex, reciprocal_rank_fusion
+from .metadata import MetadataIndex, build_filters
+
+# Seuil de score par défaut de chaque mode de recherche. Les scores BM25
+# normalisés et les scores hybrides sont plus bas que les similarités
+# cosine: un seuil dense les viderait.
+DEFAULT_MIN_SCORES = {"dense": 0.5, "sparse": 0.0, "hybrid": 0.0}
+# Fusion hybride: constante RRF et score maximal (premier des deux classements)
+RRF_K = 60
+RRF_MAX_SCORE = 2 / (RRF_K + 1)
 
 
 class VectorStore:
-    """Store de vecteurs pour la recherche vectorielle (k-NN)."""
+    """
+    Store de vecteurs pour la recherche vectorielle (k-NN).
+
+    Les documents peuvent être rangés dans des collections nommées (ex: un
+    cours) et filtrés sur leurs métadonnées (source, page...): le filtre est
+    résolu avant le calcul des scores, qui ne porte que sur le sous-ensemble.
+    """
 
     def __init__(
         self,
         documents: List[Dict[str, Any]] = None,
         embedding_col: str = "embedding",
         model: str = "text-embedding-3-large",
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        index_type: str = "flat",
+        index_params: Optional[Dict[str, Any]] = None,
+        max_concurrency: int = 4,
+        embedder: Optional[Any] = None,
+        deduplicate: Optional[bool] = None,
+        query_cache_size: Optional[int] = None
     ):
         """
         Initialise le vector store.
 
         Args:
             documents: Liste de documents avec contenu et embeddings
-            embedding_col: Nom de la colonne contenant les embeddings
+            embedding_col: Champ des embeddings précalculés des documents
+                ajoutés (retiré des documents: les vecteurs ne sont gardés
+                que dans l'index)
             model: Modèle d'embedding à utiliser
             api_key: Clé API OpenAI
+            index_type: Type d'index ("flat" exact, "ivf" ou "hnsw" approximatifs,
+                "int8" ou "pq" quantifiés avec re-score)
+            index_params: Paramètres de l'index (ex: {"nprobe": 8}, {"ef_search": 64}
+                ou {"rescore": 4})
+            max_concurrency: Nombre max de requêtes d'embedding simultanées
+            embedder: Embedder à utiliser (par défaut: OpenAI avec le cache d'embeddings
+                partagé, ou un embedder local par hachage si aucune clé API n'est fournie)
+            deduplicate: Écarter les documents quasi dupliqués avant l'embedding
+                (défaut: configuration DEDUP_ENABLED)
+            query_cache_size: Nombre d'embeddings de queries gardés en mémoire
+                (défaut: configuration; 0 pour désactiver)
         """
         self.embedding_col = embedding_col
         self.model = model
         self.api_key = api_key
         self.client = LLMClient(api_key=api_key, model=model) if api_key else None
+        if embedder is None and self.client:
+            embedder = CachedEmbedder(
+                OpenAIEmbedder(
+                    self.client.client,
+                    model=model,
+                    max_concurrency=max_concurrency,
+                    dimensions=settings.embedding_dimensions
+                ),
+                get_default_embedding_cache()
+            )
+        elif embedder is None:
+            # Mode hors ligne: embeddings déterministes, sans réseau
+            embedder = HashingEmbedder(dim=settings.offline_embedding_dim)
+        self.embedder = embedder
 
         # Stockage des documents
         self.documents: List[Dict[str, Any]] = []
-        self.embeddings: np.ndarray = np.array([])
-
-        # Index k-NN
-        self.nn_model = None
+        self.failed_documents: List[Dict[str, Any]] = []
+        self._lock = threading.RLock()
+
+        # Les embeddings en échec ne sont pas indexés mais réessayés en arrière-plan
+        self.retry_queue = EmbeddingRetryQueue(
+            self.embedder,
+            on_success=self._on_retry_success,
+            on_failure=self._on_retry_failure
+        )
+
+        # Filtre des doublons, partagé par tous les ajouts hors collection;
+        # chaque collection a le sien (un même passage peut servir deux cours)
+        if deduplicate is None:
+            deduplicate = settings.dedup_enabled
+        self.dedup = NearDuplicateFilter(threshold=settings.dedup_threshold) if deduplicate else None
+        self._collection_dedup: Dict[str, NearDuplicateFilter] = {}
+        # Nombre de documents du store déjà mémorisés par les filtres
+        self._dedup_size = 0
+
+        # Embeddings des queries récentes (LRU): une query répétée ne coûte plus d'appel
+        self.query_cache_size = settings.query_cache_size if query_cache_size is None else query_cache_size
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.query_cache_hits = 0
+        self.query_cache_misses = 0
+
+        # Index k-NN (ajout incrémental, sans reconstruction)
+        self.index_type = index_type
+        self.index_params = index_params or {}
+        self.index: BaseIndex = create_index(index_type, **self.index_params)
+        # Index lexical (BM25) et index des métadonnées, synchronisés à la
+        # demande avec self.documents
+        self._sparse_index: Optional[SparseIndex] = None
+        self._metadata_index: Optional[MetadataIndex] = None
 
         if documents:
             self.add_documents(documents)
 
-    def add_documents(self, documents: List[Dict[str, Any]]) -> None:
+    def add_documents(self, documents: List[Dict[str, Any]], collection: Optional[str] = None) -> None:
         """
         Ajoute des documents au vector store.
 
+        Les documents quasi identiques à un document déjà ajouté (dans la
+        même collection) sont écartés (voir `dedup_stats`). Les documents
+        dont l'embedding échoue sont marqués `embedding_status = "pending"`
+        et réessayés en arrière-plan au lieu d'être indexés avec un vecteur
+        arbitraire.
+
+        Args:
+            documents: Liste de documents avec champ 'text' et optionnellement
+                'embedding' (retiré du document une fois indexé)
+            collection: Collection des documents (champ 'collection'), ex: un cours
+        """
+        documents = list(documents)
+        if collection is not None:
+            for doc in documents:
+                doc["collection"] = collection
+
+        if self.dedup is not None:
+            with self._lock:
+                self._sync_dedup()
+                kept = []
+                for doc in documents:
+                    dedup = self._dedup_filter(doc.get("collection"))
+                    if not dedup.is_duplicate(doc.get("text", "")):
+                        kept.append(doc)
+                documents = kept
+
+        self._embed_and_index(documents)
+
+    def _embed_and_index(self, documents: List[Dict[str, Any]]) -> None:
+        """Indexe des documents, en créant les embeddings non fournis (réessayés en cas d'échec)."""
+        # Les vecteurs ne restent que dans l'index: les documents ne les gardent pas
+        vectors = [doc.pop(self.embedding_col, None) for doc in documents]
+
+        # Créer en un seul lot les embeddings non fournis
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            texts = [documents[i].get("text", "") for i in missing]
+            try:
+                created = self._create_embeddings(texts)
+            except Exception:
+                for i in missing:
+                    documents[i]["embedding_status"] = "pending"
+                self.retry_queue.submit([documents[i] for i in missing], texts)
+            else:
+                for i, vector in zip(missing, created):
+                    vectors[i] = vector
+
+        ready = [i for i, vector in enumerate(vectors) if vector is not None]
+        if ready:
+            self._index_documents(
+                [documents[i] for i in ready],
+                np.array([vectors[i] for i in ready], dtype=np.float32)
+            )
+
+    def add_documents_stream(
+        self,
+        documents: Iterable[Dict[str, Any]],
+        batch_size: int = 64,
+        collection: Optional[str] = None
+    ) -> int:
+        """
+        Ajoute des documents produits au fil de l'eau (ex: par un générateur).
+
+        Les documents sont encodés par lots de `batch_size` dès qu'ils sont
+        disponibles: les embeddings des premiers lots sont calculés pendant
+        que la source produit les suivants, sans matérialiser toute la source.
+
         Args:
-            documents: Liste de documents avec champ 'text' et optionnellement 'embedding'
+            documents: Itérable de documents avec champ 'text'
+            batch_size: Nombre de documents par lot d'embeddings
+            collection: Collection des documents
+
+        Returns:
+            Nombre de documents reçus
         """
+        count = 0
+        batch = []
+        for doc in documents:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                self.add_documents(batch, collection)
+                count += len(batch)
+                batch = []
+        if batch:
+            self.add_documents(batch, collection)
+            count += len(batch)
+        return count
+
+    def _dedup_filter(self, collection: Optional[str]) -> NearDuplicateFilter:
+        """Filtre des doublons d'une collection (celui du store hors collection)."""
+        if collection is None:
+            return self.dedup
+        if collection not in self._collection_dedup:
+            self._collection_dedup[collection] = NearDuplicateFilter(threshold=self.dedup.threshold)
+        return self._collection_dedup[collection]
+
+    def _sync_dedup(self) -> None:
+        """Mémorise dans les filtres de doublons les documents indexés depuis leur dernier usage (ex: store chargé)."""
+        for doc in self.documents[self._dedup_size:]:
+            self._dedup_filter(doc.get("collection")).add([doc.get("text", "")])
+        self._dedup_size = len(self.documents)
+
+    def _index_documents(self, documents: List[Dict[str, Any]], vectors: np.ndarray) -> None:
+        """Ajoute des documents et leurs embeddings (même ordre) à l'index."""
+        if not documents:
+            return
+
+        with self._lock:
+            self.documents.extend(documents)
+            # Ajouter uniquement les nouveaux vecteurs à l'index
+            self.index.add(vectors)
+
+    def _on_retry_success(self, documents: List[Dict[str, Any]], vectors: np.ndarray) -> None:
         for doc in documents:
-            # Créer un embedding si non fourni
-            if self.embedding_col not in doc or doc[self.embedding_col] is None:
-                if self.client:
-                    doc[self.embedding_col] = self._create_embedding(doc.get("text", ""))
-                else:
-                    # Embedding par défaut (aléatoire pour les tests)
-                    doc[self.embedding_col] = np.random.rand(3072).tolist()
+            doc.pop("embedding_status", None)
+        self._index_documents(documents, vectors)
 
-            self.documents.append(doc)
+    def _on_retry_failure(self, documents: List[Dict[str, Any]], error: Exception) -> None:
+        for doc in documents:
+            doc["embedding_status"] = "failed"
+            doc["embedding_error"] = str(error)
+        with self._lock:
+            self.failed_documents.extend(documents)
+            # Jamais indexés: ces textes ne doivent pas bloquer un nouvel ajout comme doublons
+            if self.dedup is not None:
+                for doc in documents:
+                    self._dedup_filter(doc.get("collection")).discard([doc.get("text", "")])
+
+    def wait_for_pending(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend la fin des réessais d'embedding en cours.
 
-        # Mettre à jour la matrice d'embeddings
-        if self.documents:
-            embeddings_list = [doc[self.embedding_col] for doc in self.documents]
-            self.embeddings = np.array(embeddings_list, dtype=np.float32)
+        Args:
+            timeout: Délai max d'attente (secondes)
 
-            # Entraîner le modèle k-NN
-            self.nn_model = NearestNeighbors(n_neighbors=3, metric="cosine")
-            self.nn_model.fit(self.embeddings)
+        Returns:
+            True si plus aucun document n'est en attente
+        """
+        return self.retry_queue.join(timeout)
+
+    @property
+    def dedup_stats(self) -> Dict[str, int]:
+        """Statistiques de déduplication (documents vus, retenus, doublons exacts et approchés)."""
+        if self.dedup is None:
+            return {}
+        stats = dict(self.dedup.stats)
+        for dedup in self._collection_dedup.values():
+            for key, value in dedup.stats.items():
+                stats[key] += value
+        return stats
+
+    def collections(self) -> Dict[str, int]:
+        """
+        Liste les collections du store.
+
+        Returns:
+            Dictionnaire {nom de collection: nombre de documents indexés}
+        """
+        with self._lock:
+            return self._sync_metadata_index().values("collection")
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        """Matrice des embeddings indexés (normalisés L2)."""
+        return self.index.vectors
+
+    def set_search_params(self, **params) -> None:
+        """
+        Ajuste le compromis rappel / latence de l'index.
+
+        Args:
+            **params: Paramètres de recherche (ex: nprobe=16 pour "ivf", ef_search=128 pour "hnsw")
+        """
+        for name, value in params.items():
+            if not hasattr(self.index, name):
+                raise ValueError(f"Paramètre inconnu pour l'index {self.index_type}: {name}")
+            setattr(self.index, name, value)
+            self.index_params[name] = value
 
     def _create_embedding(self, text: str) -> List[float]:
         """
@@ -79,22 +320,28 @@ class VectorStore:
         Returns:
             Vector d'embedding
         """
-        if self.client:
-            try:
-                response = self.client.client.embeddings.create(
-                    model=self.model,
-                    input=text
-                )
-                return response.data[0].embedding
-            except Exception:
-                return np.random.rand(3072).tolist()
-        return np.random.rand(3072).tolist()
+        return self._create_embeddings([text])[0].tolist()
+
+    def _create_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Crée les embeddings d'une liste de textes en requêtes groupées.
+
+        Args:
+            texts: Textes à encoder
+
+        Returns:
+            Matrice float32 (len(texts), d)
+        """
+        return self.embedder.embed(texts)
 
     def search(
         self,
         query: str,
         k: int = 3,
-        min_score: float = 0.5
+        min_score: Optional[float] = None,
+        mode: str = "dense",
+        filters: Optional[Dict[str, Any]] = None,
+        collection: Optional[str | List[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Recherche les documents les plus similaires à une query.
@@ -102,27 +349,33 @@ class VectorStore:
         Args:
             query: Query à rechercher
             k: Nombre de résultats à retourner
-            min_score: Score minimum de similarité (0-1)
+            min_score: Score minimum (0-1; défaut: selon le mode, voir
+                DEFAULT_MIN_SCORES)
+            mode: "dense" (embeddings), "sparse" (BM25 local, sans appel
+                réseau) ou "hybrid" (fusion des deux classements)
+            filters: Conditions sur les métadonnées, appliquées avant le
+                calcul des scores (ex: {"source": "cours.pdf", "page": {"gte": 3, "lte": 10}})
+            collection: Collection(s) où chercher (défaut: toutes)
 
         Returns:
             Liste des documents pertinents avec scores
         """
-        # Créer l'embedding de la query
-        query_embedding = self._create_embedding(query)
-        query_array = np.array([query_embedding], dtype=np.float32)
-
-        # Recherche k-NN
-        if self.nn_model is None:
-            return []
-
-        distances, indices = self.nn_model.kneighbors(query_array, n_neighbors=k)
+        return self.batch_search([query], k, min_score, mode, filters, collection)[0]
 
+    def _format_results(
+        self,
+        scores: np.ndarray,
+        indices: np.ndarray,
+        min_score: float
+    ) -> List[Dict[str, Any]]:
+        """Convertit une ligne de résultats de l'index en documents scorés."""
         results = []
-        for idx, dist in zip(indices[0], distances[0]):
-            # Convertir distance en score (1 - distance cosine)
-            score = 1 - dist
+        for idx, score in zip(indices, scores):
+            # Distance cosine = 1 - similarité
+            score = float(score)
+            dist = 1 - score
 
-            if score >= min_score and idx < len(self.documents):
+            if idx >= 0 and score >= min_score and idx < len(self.documents):
                 result = self.documents[idx].copy()
                 result["score"] = score
                 result["distance"] = dist
@@ -137,7 +390,10 @@ class VectorStore:
         self,
         queries: List[str],
         k: int = 3,
-        min_score: float = 0.5
+        min_score: Optional[float] = None,
+        mode: str = "dense",
+        filters: Optional[Dict[str, Any]] = None,
+        collection: Optional[str | List[str]] = None
     ) -> List[List[Dict[str, Any]]]:
         """
         Recherche multiple en batch.
@@ -145,53 +401,250 @@ class VectorStore:
         Args:
             queries: Liste de queries
             k: Nombre de résultats par query
-            min_score: Score minimum
+            min_score: Score minimum (défaut: selon le mode, voir `search`)
+            mode: "dense", "sparse" ou "hybrid" (voir `search`)
+            filters: Conditions sur les métadonnées (voir `search`)
+            collection: Collection(s) où chercher (défaut: toutes)
 
         Returns:
             Liste de listes de résultats
         """
-        return [self.search(q, k, min_score) for q in queries]
+        if mode not in ("dense", "sparse", "hybrid"):
+            raise ValueError(f"Mode de recherche inconnu: {mode}")
+        requested_min_score = min_score
+        if min_score is None:
+            min_score = DEFAULT_MIN_SCORES[mode]
+        if len(self.index) == 0 or not queries:
+            return [[] for _ in queries]
+
+        filters = build_filters(filters, collection)
+        ids = None
+        if filters:
+            with self._lock:
+                ids = self._sync_metadata_index().resolve(filters)
+            if len(ids) == 0:
+                return [[] for _ in queries]
+
+        if mode == "sparse":
+            with self._lock:
+                scores, indices = self._sparse_search(queries, k, ids)
+                return [
+                    self._format_results(scores[row], indices[row], min_score)
+                    for row in range(len(queries))
+                ]
+
+        # Un seul lot d'embeddings (queries non en cache), puis un seul produit matrice x index
+        try:
+            query_matrix = self._embed_queries(list(queries))
+        except Exception:
+            if mode == "hybrid":
+                # Sans embeddings, le classement lexical reste disponible
+                return self.batch_search(queries, k, requested_min_score, "sparse", filters)
+            # Pas de résultats plutôt qu'un classement sur un vecteur arbitraire
+            return [[] for _ in queries]
+
+        with self._lock:
+            if mode == "dense":
+                scores, indices = self.index.search(query_matrix, k, ids)
+                return [
+                    self._format_results(scores[row], indices[row], min_score)
+                    for row in range(len(queries))
+                ]
+
+            # Hybride: candidats des deux index, fusionnés par rang réciproque
+            dense_scores, dense_ids = self.index.search(query_matrix, 2 * k, ids)
+            sparse_scores, sparse_ids = self._sparse_search(queries, 2 * k, ids)
+            return [
+                self._fuse_results(
+                    dense_scores[row], dense_ids[row], sparse_scores[row], sparse_ids[row], k, min_score
+                )
+                for row in range(len(queries))
+            ]
+
+    def _embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Calcule les embeddings de queries via le cache LRU.
+
+        Seules les queries absentes du cache (dédupliquées) sont encodées,
+        en un seul lot.
+
+        Args:
+            queries: Queries à encoder
+
+        Returns:
+            Matrice float32 (len(queries), d)
+        """
+        if self.query_cache_size <= 0:
+            return self._create_embeddings(queries)
+
+        with self._lock:
+            cached = {q: self._query_cache[q] for q in dict.fromkeys(queries) if q in self._query_cache}
+            for query in cached:
+                self._query_cache.move_to_end(query)
+            missing = [q for q in dict.fromkeys(queries) if q not in cached]
+            self.query_cache_hits += sum(1 for q in queries if q in cached)
+            self.query_cache_misses += len(missing)
+
+        if missing:
+            vectors = self._create_embeddings(missing)
+            with self._lock:
+                for query, vector in zip(missing, vectors):
+                    cached[query] = vector
+                    self._query_cache[query] = vector
+                while len(self._query_cache) > self.query_cache_size:
+                    self._query_cache.popitem(last=False)
+
+        return np.stack([cached[q] for q in queries]).astype(np.float32, copy=False)
+
+    def _sparse_search(self, queries: List[str], k: int, ids: Optional[np.ndarray] = None):
+        """Recherche BM25, après indexation des documents ajoutés depuis la dernière requête."""
+        if self._sparse_index is None:
+            self._sparse_index = SparseIndex()
+        indexed = len(self._sparse_index)
+        if indexed < len(self.documents):
+            self._sparse_index.add([doc.get("text", "") for doc in self.documents[indexed:]])
+        return self._sparse_index.search(queries, k, ids)
+
+    def _sync_metadata_index(self) -> MetadataIndex:
+        """Index des métadonnées, après indexation des documents ajoutés depuis son dernier usage."""
+        if self._metadata_index is None:
+            self._metadata_index = MetadataIndex(exclude=("text", self.embedding_col))
+        indexed = len(self._metadata_index)
+        if indexed < len(self.documents):
+            self._metadata_index.add(self.documents[indexed:])
+        return self._metadata_index
+
+    def _fuse_results(
+        self,
+        dense_scores: np.ndarray,
+        dense_ids: np.ndarray,
+        sparse_scores: np.ndarray,
+        sparse_ids: np.ndarray,
+        k: int,
+        min_score: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Fusionne les candidats denses et lexicaux d'une query (RRF).
+
+        Le score RRF brut est gardé dans 'rrf_score'; 'score' est ce même
+        score ramené entre 0 et 1 (1: premier des deux classements), pour
+        rester comparable aux seuils des autres modes et des rerankers.
+        """
+        dense = {int(i): float(s) for i, s in zip(dense_ids, dense_scores) if i >= 0}
+        lexical = {int(i): float(s) for i, s in zip(sparse_ids, sparse_scores) if i >= 0}
+        candidates = [
+            i for i in dict.fromkeys(list(dense) + list(lexical))
+            if i < len(self.documents) and (dense.get(i, 0.0) >= min_score or lexical.get(i, 0.0) >= min_score)
+        ]
+        if not candidates:
+            return []
+
+        fused = reciprocal_rank_fusion([
+            [dense.get(i) for i in candidates],
+            [lexical.get(i) for i in candidates],
+        ], k=RRF_K)
+
+        results = []
+        for position in sorted(range(len(candidates)), key=lambda p: fused[p], reverse=True)[:k]:
+            idx = candidates[position]
+            result = self.documents[idx].copy()
+            result["score"] = fused[position] / RRF_MAX_SCORE
+            result["rrf_score"] = fused[position]
+            result["dense_score"] = dense.get(idx)
+            result["sparse_score"] = lexical.get(idx)
+            results.append(result)
+        return results
 
     def clear(self) -> None:
         """Efface tous les documents."""
-        self.documents = []
-        self.embeddings = np.array([])
-        self.nn_model = None
-
-    def save(self, path: str) -> None:
+        with self._lock:
+            self.documents = []
+            self.index.reset()
+            self._reset_state()
+
+    def _reset_state(self) -> None:
+        """Vide l'état dérivé des documents (index lexical et des métadonnées, cache des queries, doublons)."""
+        self.failed_documents = []
+        self._sparse_index = None
+        self._metadata_index = None
+        self._query_cache.clear()
+        if self.dedup is not None:
+            self.dedup.reset()
+        self._collection_dedup = {}
+        self._dedup_size = 0
+
+    def save(self, path: str, dtype: str = "float32") -> None:
         """
-        Sauvegarde le vector store.
+        Sauvegarde le vector store au format binaire versionné.
 
         Args:
-            path: Chemin de sauvegarde
+            path: Dossier de sauvegarde
+            dtype: Type de stockage des embeddings ("float32" ou "float16")
         """
-        import json
-        data = {
-            "documents": self.documents,
-            "embeddings": self.embeddings.tolist() if len(self.embeddings) > 0 else [],
-            "embedding_col": self.embedding_col,
-            "model": self.model
-        }
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, default=str)
-
-    def load(self, path: str) -> None:
+        # Instantané cohérent: un réessai d'embedding peut indexer des documents en parallèle
+        with self._lock:
+            documents = list(self.documents)
+            embeddings = self.embeddings
+            index_state = self.index.state()
+
+        save_store(
+            path,
+            documents,
+            embeddings,
+            meta={
+                "embedding_col": self.embedding_col,
+                "model": self.model,
+                "index_type": self.index_type,
+                "index_params": self.index_params,
+            },
+            dtype=dtype,
+            index_state=index_state
+        )
+
+    def load(self, path: str, mmap: bool = True) -> None:
         """
         Charge un vector store sauvegardé.
 
+        Les embeddings sont ouverts en np.memmap: le chargement ne lit pas la
+        matrice et ses pages sont partagées entre processus. Les anciens stores
+        JSON restent lisibles (voir convert_legacy_store pour les migrer).
+
         Args:
-            path: Chemin de chargement
+            path: Dossier du store (ou ancien fichier JSON)
+            mmap: Ouvrir les embeddings en lecture seule sans les charger en mémoire
         """
-        import json
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        self.documents = data.get("documents", [])
-        self.embedding_col = data.get("embedding_col", "embedding")
-        self.model = data.get("model", "text-embedding-3-large")
+        if is_legacy_store(path):
+            self._load_legacy(path)
+            return
+
+        documents, embeddings, meta = load_store(path, mmap=mmap)
+
+        with self._lock:
+            self.documents = documents
+            self.embedding_col = meta.get("embedding_col", "embedding")
+            self.model = meta.get("model", "text-embedding-3-large")
+            self.index_type = meta.get("index_type", self.index_type)
+            self.index_params = meta.get("index_params", self.index_params)
+            self.index = create_index(self.index_type, **self.index_params)
+            self.index.attach(embeddings, load_index_state(path, meta, mmap=mmap))
+            self._reset_state()
+
+    def _load_legacy(self, path: str) -> None:
+        """
+        Charge un ancien store JSON (format antérieur à la version 1).
 
-        embeddings_list = data.get("embeddings", [])
-        if embeddings_list:
-            self.embeddings = np.array(embeddings_list, dtype=np.float32)
-            self.nn_model = NearestNeighbors(n_neighbors=3, metric="cosine")
-            self.nn_model.fit(self.embeddings)
+        Les documents sans embedding sont encodés (ou mis en attente de
+        réessai) et ajoutés après les autres.
+        """
+        documents, embeddings, missing, meta = read_legacy_store(path)
+
+        with self._lock:
+            self.documents = documents
+            self.embedding_col = meta["embedding_col"]
+            self.model = meta["model"]
+            self.index.reset()
+            if len(embeddings):
+                self.index.add(embeddings)
+            self._reset_state()
+
+        self._embed_and_index(missing)
@@ -0,0 +1 @@
+"""Benchmarks du pipeline (non collectés par pytest: fichiers bench_*.py)."""
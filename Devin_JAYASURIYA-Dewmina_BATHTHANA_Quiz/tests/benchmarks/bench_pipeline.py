@@ -0,0 +1,376 @@
+"""Benchmarks du pipeline RAG du générateur de quiz.
+
+Aucun appel réseau: les appels LLM et embeddings sont servis par un serveur
+local compatible OpenAI (voir fake_openai.py), avec une latence configurable
+et des réponses déterministes. Les résultats sont écrits en JSON (avec le
+commit courant) pour suivre les régressions d'un commit à l'autre.
+
+Usage (depuis la racine du projet):
+
+    python -m tests.benchmarks.bench_pipeline --output bench.json
+    python -m tests.benchmarks.bench_pipeline --only search --sizes 1000 10000
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from src.config import settings
+from src.parsers.pdf_parser import PdfParser
+from src.parsers.text_parser import TextParser
+from src.rag.chunker import chunk_document, count_tokens
+from src.rag.index import HNSWLIB_AVAILABLE
+from src.rag.vectorstore import VectorStore
+
+from .fake_openai import FakeOpenAIServer
+
+BENCHMARKS = ("parse", "chunking", "embedding", "search", "generate")
+
+VOCABULARY = """
+algorithme structure donnee graphe arbre noeud parcours profondeur largeur complexite
+memoire processeur registre compilateur interpreteur variable fonction recursion pile file
+tableau liste chainee hachage collision dictionnaire ensemble tri fusion rapide insertion
+selection recherche dichotomique programmation dynamique glouton heuristique optimisation
+reseau protocole paquet routage adresse couche transport session application securite
+chiffrement cle publique privee signature certificat authentification autorisation base
+requete jointure index transaction verrou journal sauvegarde replication partition cluster
+""".split()
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Statistiques (ms) d'une série de durées en secondes."""
+    values = np.asarray(samples, dtype=np.float64) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(values, 50)), 4),
+        "p90_ms": round(float(np.percentile(values, 90)), 4),
+        "p99_ms": round(float(np.percentile(values, 99)), 4),
+        "mean_ms": round(float(values.mean()), 4),
+        "count": len(values),
+    }
+
+
+def make_course_text(num_sections: int, words_per_section: int = 400, seed: int = 0, markdown: bool = False) -> str:
+    """Texte de cours synthétique (titres numérotés ou Markdown, paragraphes, phrases)."""
+    rng = random.Random(seed)
+    sections = []
+    for i in range(1, num_sections + 1):
+        prefix = "#" if markdown else f"{i}."
+        lines = [f"{prefix} {' '.join(rng.sample(VOCABULARY, 3)).capitalize()}", ""]
+        remaining = words_per_section
+        while remaining > 0:
+            sentences = []
+            for _ in range(rng.randint(3, 6)):
+                length = rng.randint(8, 20)
+                sentences.append(" ".join(rng.choice(VOCABULARY) for _ in range(length)).capitalize() + ".")
+                remaining -= length
+            lines.extend([" ".join(sentences), ""])
+        sections.append("\n".join(lines))
+    return "\n".join(sections)
+
+
+def write_pdf(path: Path, pages: List[str]) -> None:
+    """Écrit un PDF minimal (texte ASCII, police Helvetica), une page par texte."""
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")
+    pages_id = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    kids = []
+    for text in pages:
+        words, lines, line = text.split(), [], ""
+        for word in words:
+            if len(line) + len(word) > 90:
+                lines.append(line)
+                line = ""
+            line = f"{line} {word}".strip()
+        lines.append(line)
+        escaped = [l.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for l in lines[:60]]
+        stream = ("BT /F1 10 Tf 40 800 Td 12 TL " + " ".join(f"({l}) Tj T*" for l in escaped) + " ET").encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (pages_id, content, font)
+        ))
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+    )
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    path.write_bytes(bytes(data))
+
+
+def timed(fn: Callable[[], Any]) -> tuple:
+    """Exécute fn et retourne (résultat, durée en secondes)."""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+class FixedEmbedder:
+    """Embedder de benchmark: vecteurs précalculés par texte (aucun coût d'encodage)."""
+
+    def __init__(self, vectors: Dict[str, np.ndarray]):
+        self.vectors = vectors
+        self.model = "fixed"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return np.stack([self.vectors[text] for text in texts]).astype(np.float32)
+
+
+def clustered_vectors(n: int, dim: int, rng: np.random.Generator, num_clusters: int = 256) -> np.ndarray:
+    """Vecteurs synthétiques groupés (plus réalistes que du bruit pour l'IVF et la PQ)."""
+    centers = rng.standard_normal((num_clusters, dim)).astype(np.float32)
+    return centers[rng.integers(0, num_clusters, n)] + 0.5 * rng.standard_normal((n, dim)).astype(np.float32)
+
+
+def bench_parse(args: argparse.Namespace) -> Dict[str, Any]:
+    """Temps de parsing par page (PDF séquentiel et parallèle, Markdown)."""
+    pages = [make_course_text(1, 350, seed=i) for i in range(args.pages)]
+    results: Dict[str, Any] = {"pages": args.pages}
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "cours.pdf"
+        write_pdf(pdf_path, pages)
+        for name, workers in (("pdf_serial", 1), ("pdf_parallel", None)):
+            sections, duration = timed(lambda: PdfParser(pdf_path, max_workers=workers).parse())
+            results[name] = {
+                "seconds": round(duration, 4),
+                "ms_per_page": round(1000 * duration / len(sections), 4),
+                "workers": workers or os.cpu_count(),
+            }
+
+        md_path = Path(tmp) / "cours.md"
+        md_path.write_text(make_course_text(args.pages, 350, markdown=True), encoding="utf-8")
+        sections, duration = timed(lambda: TextParser(md_path).parse())
+        results["markdown"] = {
+            "seconds": round(duration, 4),
+            "sections": len(sections),
+            "mb_per_s": round(md_path.stat().st_size / 1e6 / duration, 3),
+        }
+    return results
+
+
+def bench_chunking(args: argparse.Namespace) -> Dict[str, Any]:
+    """Débit du découpage en chunks (tokens et caractères par seconde)."""
+    text = make_course_text(args.pages, 350)
+    tokens = count_tokens(text)
+    results: Dict[str, Any] = {"chars": len(text), "tokens": tokens}
+    for max_tokens, overlap in ((256, 0), (256, 32), (512, 64)):
+        chunks, duration = timed(lambda: chunk_document(text, max_tokens, overlap))
+        results[f"max{max_tokens}_overlap{overlap}"] = {
+            "seconds": round(duration, 4),
+            "chunks": len(chunks),
+            "tokens_per_s": round(tokens / duration),
+            "mb_per_s": round(len(text) / 1e6 / duration, 3),
+        }
+    return results
+
+
+def bench_embedding(args: argparse.Namespace, server: FakeOpenAIServer) -> Dict[str, Any]:
+    """Débit d'embedding (via le serveur local) et d'indexation (vecteurs fournis)."""
+    text = make_course_text(args.pages, 350)
+    chunks = [chunk["text"] for chunk in chunk_document(text, 256)]
+    results: Dict[str, Any] = {"chunks": len(chunks)}
+
+    server.reset_counters()
+    store = VectorStore(api_key="bench", deduplicate=False)
+    _, duration = timed(lambda: store.add_documents([{"text": chunk} for chunk in chunks]))
+    results["embed_and_index"] = {
+        "seconds": round(duration, 4),
+        "docs_per_s": round(len(chunks) / duration, 1),
+        "requests": server.requests["embeddings"],
+        "server_latency_s": server.embedding_latency,
+    }
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.index_docs, args.dim)).astype(np.float32)
+    for index_type in args.index_types:
+        store = VectorStore(index_type=index_type, deduplicate=False, embedder=FixedEmbedder({}))
+        documents = [{"text": f"doc {i}", "embedding": vectors[i]} for i in range(len(vectors))]
+        _, duration = timed(lambda: store.add_documents_stream(documents, batch_size=1000))
+        results[f"index_{index_type}"] = {
+            "docs": len(vectors),
+            "seconds": round(duration, 4),
+            "docs_per_s": round(len(vectors) / duration, 1),
+        }
+    return results
+
+
+def bench_search(args: argparse.Namespace) -> Dict[str, Any]:
+    """Latence de VectorStore.search (p50 / p99) et rappel@k selon la taille et l'index."""
+    rng = np.random.default_rng(0)
+    results: Dict[str, Any] = {"dim": args.dim, "k": args.k, "queries": args.queries}
+
+    for size in args.sizes:
+        data = clustered_vectors(size, args.dim, rng)
+        queries = data[rng.integers(0, size, args.queries)] + 0.3 * rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+        texts = [f"query {i}" for i in range(args.queries)]
+        embedder = FixedEmbedder(dict(zip(texts, queries)))
+        truth: Optional[List[set]] = None
+        by_index: Dict[str, Any] = {}
+
+        for index_type in args.index_types:
+            store = VectorStore(index_type=index_type, deduplicate=False, embedder=embedder)
+            documents = [
+                {"text": f"doc {i}", "embedding": data[i], "collection": f"cours{i % 10}"}
+                for i in range(size)
+            ]
+            _, build = timed(lambda: store.add_documents_stream(documents, batch_size=10_000))
+            # Embeddings des queries mis en cache: seule la recherche est mesurée
+            store.batch_search(texts, k=args.k, min_score=-1.0)
+
+            latencies, found = [], []
+            for text in texts:
+                results_row, duration = timed(lambda: store.search(text, k=args.k, min_score=-1.0))
+                latencies.append(duration)
+                found.append({int(r["text"].split()[1]) for r in results_row})
+
+            filtered = [
+                timed(lambda: store.search(text, k=args.k, min_score=-1.0, collection="cours3"))[1]
+                for text in texts
+            ]
+
+            # Le premier index (exact de préférence) sert de référence
+            if truth is None:
+                truth = found
+            entry = {
+                "build_s": round(build, 4),
+                "search": percentiles(latencies),
+                "search_one_collection": percentiles(filtered),
+                # Mémoire réellement occupée (codes, tables) et vecteurs laissés sur disque
+                "index_ram_bytes_per_vector": round(store.index.nbytes / len(store.index), 2),
+                "index_disk_bytes_per_vector": (
+                    store.index.vectors.itemsize * store.index.dim
+                    if isinstance(store.index.vectors, np.memmap) else 0
+                ),
+            }
+            entry["recall_at_k"] = round(float(np.mean([len(a & b) / args.k for a, b in zip(found, truth)])), 4)
+            by_index[index_type] = entry
+
+        results[str(size)] = by_index
+    return results
+
+
+def bench_generate(args: argparse.Namespace, server: FakeOpenAIServer) -> Dict[str, Any]:
+    """Latence de bout en bout de la génération d'un quiz, par stratégie."""
+    from src.generators.quiz_generator import QuizGenerator
+
+    sections = [
+        {"title": f"Page {i + 1}", "content": make_course_text(1, 350, seed=i), "page": i + 1}
+        for i in range(args.pages)
+    ]
+    results: Dict[str, Any] = {"sections": len(sections), "server_latency_s": server.latency}
+
+    generator = QuizGenerator(model="gpt-4o", api_key="bench")
+    for strategy in ("rag", "map_reduce", "retrieval"):
+        durations, requests, questions = [], [], []
+        for _ in range(args.repeats):
+            server.reset_counters()
+            quiz, duration = timed(lambda: generator.generate_quiz_from_sections(
+                sections, strategy=strategy, num_questions=args.num_questions
+            ))
+            durations.append(duration)
+            requests.append(dict(server.requests))
+            questions.append(len(quiz.get("questions", [])))
+        results[strategy] = {
+            "latency": percentiles(durations),
+            "requests": requests[-1],
+            "questions": questions[-1],
+        }
+    return results
+
+
+def environment(args: argparse.Namespace) -> Dict[str, Any]:
+    """Contexte du benchmark (commit, machine, paramètres)."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "args": {key: value for key, value in vars(args).items() if key != "output"},
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmarks du pipeline RAG (sans réseau)")
+    parser.add_argument("--output", "-o", default="bench-results.json", help="Fichier JSON des résultats")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS), help="Benchmarks à lancer")
+    parser.add_argument("--pages", type=int, default=40, help="Pages du document synthétique")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000], help="Tailles de store (chunks)")
+    parser.add_argument("--dim", type=int, default=256, help="Dimension des embeddings de recherche")
+    parser.add_argument("--queries", type=int, default=200, help="Queries mesurées par configuration")
+    parser.add_argument("--k", type=int, default=10, help="Résultats par query")
+    parser.add_argument(
+        "--index-types", nargs="+", default=["flat", "ivf", "int8", "pq"] + (["hnsw"] if HNSWLIB_AVAILABLE else []),
+        help="Index comparés (le premier, de préférence \"flat\", sert de référence de rappel)"
+    )
+    parser.add_argument("--index-docs", type=int, default=20_000, help="Vecteurs pour le débit d'indexation")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latence simulée par appel LLM (s)")
+    parser.add_argument("--embedding-latency", type=float, default=0.01, help="Latence simulée par appel d'embeddings (s)")
+    parser.add_argument("--num-questions", type=int, default=10, help="Questions par quiz généré")
+    parser.add_argument("--repeats", type=int, default=3, help="Répétitions de la génération")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = parse_args(argv)
+
+    # Mesures à froid: aucun cache persistant, tous les appels vont au serveur local
+    settings.embedding_cache_path = ""
+    settings.parse_cache_path = ""
+    settings.llm_cache_enabled = False
+
+    report: Dict[str, Any] = {"environment": environment(args), "results": {}}
+    with FakeOpenAIServer(latency=args.latency, embedding_latency=args.embedding_latency) as server:
+        settings.llm_base_url = server.url
+        runners = {
+            "parse": lambda: bench_parse(args),
+            "chunking": lambda: bench_chunking(args),
+            "embedding": lambda: bench_embedding(args, server),
+            "search": lambda: bench_search(args),
+            "generate": lambda: bench_generate(args, server),
+        }
+        for name in args.only:
+            print(f"[bench] {name}...", flush=True)
+            report["results"][name], duration = timed(runners[name])
+            print(f"[bench] {name}: {duration:.1f}s", flush=True)
+
+    Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"[bench] Résultats: {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""Serveur local compatible OpenAI pour les benchmarks (sans réseau).
+
+Le serveur répond à ``POST /v1/chat/completions`` (avec ou sans streaming)
+et ``POST /v1/embeddings``. Les réponses sont déterministes (fonction du
+prompt) et ont la forme attendue par le pipeline: concepts, détails de
+concepts ou questions selon le prompt reçu. Une latence configurable est
+ajoutée à chaque requête pour simuler le temps de réponse d'un modèle.
+
+Utilisation:
+
+    with FakeOpenAIServer(latency=0.2) as server:
+        settings.llm_base_url = server.url
+        ...
+"""
+
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.rag.embeddings import HashingEmbedder
+
+WORD_PATTERN = re.compile(r"[^\W\d_]{5,}")
+COUNT_PATTERNS = (
+    re.compile(r"exactement (\d+) questions"),
+    re.compile(r"avec (\d+) questions"),
+    re.compile(r"(\d+) questions"),
+)
+CONCEPT_COUNT_PATTERN = re.compile(r"extrayez les (\d+) concepts")
+CONTENT_MARKERS = ("## Contenu:", "TEXTE À ANALYSER:", "TEXTE:", "CONTENU:")
+
+
+def _content_words(prompt: str) -> List[str]:
+    """Mots distincts du contenu d'un prompt (après son dernier marqueur de contenu)."""
+    start = max((prompt.rfind(marker) for marker in CONTENT_MARKERS), default=-1)
+    text = prompt[start:] if start >= 0 else prompt
+    words = list(dict.fromkeys(word.lower() for word in WORD_PATTERN.findall(text)))
+    return words or ["notion", "principe", "exemple", "methode"]
+
+
+def _first_int(patterns, text: str, default: int) -> int:
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return int(match.group(1))
+    return default
+
+
+def chat_content(prompt: str) -> str:
+    """
+    Réponse déterministe à un prompt du pipeline.
+
+    Args:
+        prompt: Prompt reçu
+
+    Returns:
+        Contenu JSON de la réponse (questions, détails, concepts ou générique)
+    """
+    rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+    words = _content_words(prompt)
+
+    if '"questions"' in prompt:
+        count = _first_int(COUNT_PATTERNS, prompt, 5)
+        questions = []
+        for i in range(count):
+            terms = rng.sample(words, min(4, len(words)))
+            options = [f"{term} ({i + 1}.{j + 1})" for j, term in enumerate(rng.sample(words, min(4, len(words))))]
+            questions.append({
+                "id": i + 1,
+                "type": "qcm",
+                "difficulty": rng.randint(1, 5),
+                "question": f"Quel rôle joue {terms[0]} par rapport à {' et '.join(terms[1:]) or terms[0]} ?",
+                "options": options,
+                "correct_answer": options[0],
+                "explanation": f"Le texte relie {terms[0]} à {terms[-1]}.",
+            })
+        return json.dumps({"title": "Quiz", "description": "Quiz de benchmark", "questions": questions})
+
+    if '"details"' in prompt:
+        block = prompt.split("CONCEPTS:", 1)[-1].split("Pour chaque concept", 1)[0]
+        names = [line.strip()[2:] for line in block.splitlines() if line.strip().startswith("- ")]
+        details = {
+            name: {
+                "definition": f"{name}: {' '.join(rng.sample(words, min(6, len(words))))}",
+                "characteristics": rng.sample(words, min(3, len(words))),
+                "examples": rng.sample(words, min(2, len(words))),
+                "context": rng.choice(words),
+            }
+            for name in names
+        }
+        return json.dumps({"details": details})
+
+    if '"concepts"' in prompt:
+        count = _first_int((CONCEPT_COUNT_PATTERN,), prompt, 5)
+        names = rng.sample(words, min(count, len(words)))
+        concepts = [
+            {
+                "name": name.capitalize(),
+                "definition": " ".join(rng.sample(words, min(8, len(words)))),
+                "importance": rng.choice(["haute", "moyenne", "basse"]),
+            }
+            for name in names
+        ]
+        return json.dumps({"concepts": concepts})
+
+    return json.dumps({"response": " ".join(words[:20])})
+
+
+class FakeOpenAIServer:
+    """Serveur HTTP local imitant l'API OpenAI (chat completions et embeddings)."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        embedding_latency: Optional[float] = None,
+        embedding_dim: int = 256,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        """
+        Initialise le serveur (démarré par `start` ou `with`).
+
+        Args:
+            latency: Délai ajouté à chaque requête de chat (secondes)
+            embedding_latency: Délai ajouté à chaque requête d'embeddings (défaut: latency)
+            embedding_dim: Dimension des embeddings (sauf paramètre `dimensions` de la requête)
+            host: Adresse d'écoute
+            port: Port d'écoute (0: port libre choisi par le système)
+        """
+        self.latency = latency
+        self.embedding_latency = latency if embedding_latency is None else embedding_latency
+        self.embedding_dim = embedding_dim
+        self.requests: Dict[str, int] = {"chat": 0, "embeddings": 0}
+        self._embedders: Dict[int, HashingEmbedder] = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """URL de base à passer au client (LLM_BASE_URL)."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.requests = {key: 0 for key in self.requests}
+
+    def _count(self, kind: str) -> None:
+        with self._lock:
+            self.requests[kind] += 1
+
+    def _embed(self, texts: List[str], dim: int) -> np.ndarray:
+        with self._lock:
+            embedder = self._embedders.setdefault(dim, HashingEmbedder(dim=dim))
+        return embedder.embed(texts)
+
+    def chat_response(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Réponse complète à une requête de chat."""
+        prompt = "\n".join(str(message.get("content", "")) for message in body.get("messages", []))
+        content = chat_content(prompt)
+        return {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "bench"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": (len(prompt) + len(content)) // 4,
+            },
+        }
+
+    def embeddings_response(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Réponse à une requête d'embeddings (encodage float ou base64)."""
+        texts = body.get("input", [])
+        if isinstance(texts, str):
+            texts = [texts]
+        vectors = self._embed(texts, body.get("dimensions") or self.embedding_dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = (vectors / np.where(norms == 0, 1, norms)).astype(np.float32)
+
+        base64_format = body.get("encoding_format") == "base64"
+        data = [
+            {
+                "object": "embedding",
+                "index": i,
+                "embedding": base64.b64encode(vector.tobytes()).decode("ascii") if base64_format else vector.tolist(),
+            }
+            for i, vector in enumerate(vectors)
+        ]
+        tokens = sum(len(text) // 4 for text in texts)
+        return {
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "bench"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+
+                if self.path.endswith("/chat/completions"):
+                    server._count("chat")
+                    time.sleep(server.latency)
+                    response = server.chat_response(body)
+                    if body.get("stream"):
+                        self._send_stream(response)
+                    else:
+                        self._send_json(response)
+                elif self.path.endswith("/embeddings"):
+                    server._count("embeddings")
+                    time.sleep(server.embedding_latency)
+                    self._send_json(server.embeddings_response(body))
+                else:
+                    self._send_json({"error": {"message": f"Route inconnue: {self.path}"}}, status=404)
+
+            def _send_json(self, payload: Dict[str, Any], status: int = 200) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, response: Dict[str, Any]) -> None:
+                content = response["choices"][0]["message"]["content"]
+                events = []
+                for start in range(0, len(content), 64):
+                    chunk = {
+                        "id": response["id"],
+                        "object": "chat.completion.chunk",
+                        "created": response["created"],
+                        "model": response["model"],
+                        "choices": [{"index": 0, "delta": {"content": content[start:start + 64]}, "finish_reason": None}],
+                    }
+                    events.append(f"data: {json.dumps(chunk)}\n\n")
+                events.append("data: [DONE]\n\n")
+                data = "".join(events).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
@@ -0,0 +1,24 @@
+"""Fixtures partagées des tests unitaires (sans réseau: embeddings locaux par hachage)."""
+
+import pytest
+
+from src.rag.embeddings import HashingEmbedder
+
+COURSE_DOCUMENTS = [
+    "La photosynthèse transforme l'énergie lumineuse en énergie chimique dans les chloroplastes.",
+    "La respiration cellulaire libère l'énergie du glucose dans les mitochondries.",
+    "Le cycle de Krebs produit du NADH et du FADH2 à partir de l'acétyl-CoA.",
+    "La mitose divise une cellule en deux cellules filles génétiquement identiques.",
+    "La méiose produit quatre gamètes haploïdes à partir d'une cellule diploïde.",
+    "L'ADN est transcrit en ARN messager par l'ARN polymérase dans le noyau.",
+]
+
+
+@pytest.fixture
+def embedder():
+    return HashingEmbedder(dim=256)
+
+
+@pytest.fixture
+def documents():
+    return [{"text": text, "source": "biologie.pdf", "page": i + 1} for i, text in enumerate(COURSE_DOCUMENTS)]
@@ -0,0 +1,98 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.batch import BatchManifest, BatchRunner, discover_documents
+from src.config import settings
+
+
+class FakeGenerator:
+    """Générateur de quiz sans LLM: une question par section."""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.calls = []
+
+    def generate_quiz_from_sections(self, sections, **kwargs):
+        sections = list(sections)
+        text = " ".join(section["content"] for section in sections)
+        self.calls.append(text)
+        if any(marker in text for marker in self.fail_on):
+            raise RuntimeError("génération impossible")
+        return {"title": "Quiz", "questions": [{"id": i + 1, "question": s["content"]} for i, s in enumerate(sections)]}
+
+    def export_quiz(self, quiz, format="json", output_path=None, **kwargs):
+        path = Path(f"{output_path}.{format}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(quiz, ensure_ascii=False), encoding="utf-8")
+        return str(path)
+
+
+@pytest.fixture(autouse=True)
+def no_parse_cache(monkeypatch):
+    monkeypatch.setattr(settings, "parse_cache_path", "")
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    root = tmp_path / "docs"
+    (root / "chapitre").mkdir(parents=True)
+    (root / "intro.txt").write_text("Introduction à la biologie cellulaire.", encoding="utf-8")
+    (root / "chapitre" / "mitose.md").write_text("# Mitose\n\nLa mitose divise la cellule.", encoding="utf-8")
+    (root / "chapitre" / "erreur.txt").write_text("Document ERREUR.", encoding="utf-8")
+    (root / "image.png").write_bytes(b"\x89PNG")
+    (root / ".cache.txt").write_text("ignoré", encoding="utf-8")
+    return root
+
+
+def run(corpus, tmp_path, generator):
+    manifest = BatchManifest(tmp_path / "out" / "manifest.json")
+    runner = BatchRunner(generator, corpus, tmp_path / "out", manifest, parse_workers=1, concurrency=2)
+    return runner.run(discover_documents(corpus)), manifest
+
+
+def test_discover_documents(corpus):
+    found = [path.relative_to(corpus).as_posix() for path in discover_documents(corpus)]
+
+    assert found == ["chapitre/erreur.txt", "chapitre/mitose.md", "intro.txt"]
+    assert [path.name for path in discover_documents(corpus, recursive=False)] == ["intro.txt"]
+
+
+def test_manifest_is_persisted(tmp_path):
+    manifest = BatchManifest(tmp_path / "manifest.json")
+    manifest.mark_done("a.txt", "d1", "out/a.json", 1.23456, 5)
+    manifest.mark_failed("b.txt", "d2", ValueError("boom"), 0.5)
+
+    reloaded = BatchManifest(tmp_path / "manifest.json")
+    assert reloaded.is_done("a.txt", "d1")
+    assert not reloaded.is_done("a.txt", "autre")
+    assert not reloaded.is_done("b.txt", "d2")
+    assert reloaded.items["b.txt"]["error"] == "ValueError: boom"
+    assert reloaded.summary() == {"done": 1, "failed": 1}
+    assert not (tmp_path / "manifest.json.tmp").exists()
+
+
+def test_resume_skips_finished_documents(corpus, tmp_path):
+    stats, manifest = run(corpus, tmp_path, FakeGenerator(fail_on=["ERREUR"]))
+    assert stats == {"done": 2, "failed": 1, "skipped": 0}
+    assert manifest.items["chapitre/erreur.txt"]["status"] == "failed"
+    assert (tmp_path / "out" / "intro.json").exists()
+
+    # Reprise: seul le document en échec est retraité
+    generator = FakeGenerator()
+    stats, manifest = run(corpus, tmp_path, generator)
+    assert stats == {"done": 1, "failed": 0, "skipped": 2}
+    assert generator.calls == ["Document ERREUR."]
+    assert manifest.summary() == {"done": 3, "failed": 0}
+
+
+def test_modified_document_is_processed_again(corpus, tmp_path):
+    run(corpus, tmp_path, FakeGenerator())
+    (corpus / "intro.txt").write_text("Introduction modifiée.", encoding="utf-8")
+
+    generator = FakeGenerator()
+    stats, _ = run(corpus, tmp_path, generator)
+
+    assert stats == {"done": 1, "failed": 0, "skipped": 2}
+    assert generator.calls == ["Introduction modifiée."]
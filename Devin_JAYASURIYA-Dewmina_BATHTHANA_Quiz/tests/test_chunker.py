@@ -0,0 +1,95 @@
+import pytest
+
+from src.rag.chunker import chunk_document, count_tokens, split_sentences
+from src.rag.extractor import chunk_text
+
+TEXT = """# Biologie cellulaire
+
+La cellule est l'unité de base du vivant. Elle contient un noyau et un cytoplasme. \
+Les organites assurent des fonctions spécialisées.
+
+## Mitochondries
+
+Les mitochondries produisent l'ATP. Elles possèdent leur propre ADN. \
+La respiration cellulaire s'y déroule en plusieurs étapes. Le cycle de Krebs en fait partie.
+
+## Chloroplastes
+
+Les chloroplastes réalisent la photosynthèse. Ils captent l'énergie lumineuse. \
+On les trouve dans les cellules végétales. Leur pigment principal est la chlorophylle.
+"""
+
+
+@pytest.mark.parametrize("max_tokens,overlap", [(16, 0), (32, 8), (64, 16), (1000, 0)])
+def test_offsets_match_source_text(max_tokens, overlap):
+    chunks = chunk_document(TEXT, max_tokens, overlap)
+
+    assert chunks
+    for chunk in chunks:
+        assert chunk["text"] == TEXT[chunk["start"]:chunk["end"]]
+
+
+@pytest.mark.parametrize("max_tokens,overlap", [(24, 0), (32, 8), (64, 16)])
+def test_token_budget_is_respected(max_tokens, overlap):
+    for chunk in chunk_document(TEXT, max_tokens, overlap):
+        assert chunk["tokens"] <= max_tokens
+        assert count_tokens(chunk["text"]) <= max_tokens
+
+
+def test_chunks_cover_the_whole_text():
+    chunks = chunk_document(TEXT, 32, 0)
+
+    covered = "".join(chunk["text"] for chunk in chunks)
+    assert "".join(covered.split()) == "".join(TEXT.split())
+    assert all(a["end"] <= b["start"] for a, b in zip(chunks, chunks[1:]))
+
+
+def test_overlap_repeats_whole_sentences():
+    paragraph = " ".join(f"La phrase numéro {i} décrit une étape du processus." for i in range(12))
+    chunks = chunk_document(paragraph, 40, 12)
+    starts = {start for start, _ in split_sentences(paragraph)}
+
+    assert len(chunks) > 1
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk["start"] < previous["end"]
+        assert chunk["start"] in starts
+
+
+def test_headings_start_chunks():
+    chunks = chunk_document(TEXT, 1000, 0)
+    small = chunk_document(TEXT, 48, 0)
+
+    assert len(chunks) == 3
+    assert [chunk["heading"] for chunk in chunks][1:] == ["Mitochondries", "Chloroplastes"]
+    assert all(not chunk["text"].rstrip().endswith(("Mitochondries", "Chloroplastes")) for chunk in small)
+
+
+def test_character_budget():
+    for chunk in chunk_text(TEXT, chunk_size=120, overlap=0):
+        assert len(chunk) <= 120
+
+
+def test_empty_text():
+    assert chunk_document("") == []
+
+
+def test_numbered_headings():
+    text = "Introduction du cours.\n2 Méthodes de mesure\nLe texte suit.\n\n2.1 Les mitochondries\n\nFin."
+    headings = [chunk["heading"] for chunk in chunk_document(text, 1000, 0)]
+
+    assert headings == [None, "2 Méthodes de mesure", "2.1 Les mitochondries"]
+
+
+def test_wrapped_prose_starting_with_a_number_is_not_a_heading():
+    text = (
+        "Au cours de la dernière épidémie, environ\n"
+        "3 millions de personnes ont été touchées par la\n"
+        "maladie dans le pays. Les autorités ont réagi vite.\n"
+        "12 Régions Ont Signalé Des Cas Dans Les Semaines Qui Ont Suivi La Première Alerte\n"
+        "sanitaire nationale."
+    )
+    chunks = chunk_document(text, 1000, 0)
+
+    assert len(chunks) == 1
+    assert chunks[0]["heading"] is None
+    assert chunks[0]["text"] == text
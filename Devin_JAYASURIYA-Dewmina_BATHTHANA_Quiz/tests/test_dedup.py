@@ -0,0 +1,174 @@
+from src.rag.dedup import NearDuplicateFilter, QuestionDeduplicator, deduplicate_questions, deduplicate_texts
+from src.rag.embeddings import EmbeddingRetryQueue
+from src.rag.extractor import concept_key
+from src.rag.vectorstore import VectorStore
+
+BASE = (
+    "Les mitochondries produisent l'essentiel de l'ATP de la cellule grâce à la "
+    "respiration cellulaire, qui se déroule en plusieurs étapes successives."
+)
+
+
+def test_exact_duplicates_ignore_case_and_spaces():
+    dedup = NearDuplicateFilter()
+
+    assert dedup.filter([BASE, "  " + BASE.upper().replace(" ", "   ")]) == [True, False]
+    assert dedup.stats == {"seen": 2, "kept": 1, "exact_duplicates": 1, "near_duplicates": 0}
+
+
+def test_near_duplicates_are_detected():
+    dedup = NearDuplicateFilter(threshold=0.7)
+    variant = BASE.replace("successives", "distinctes")
+
+    assert not dedup.is_duplicate(BASE)
+    assert dedup.is_duplicate(variant)
+    assert dedup.stats["near_duplicates"] == 1
+
+
+def test_distinct_texts_are_kept():
+    texts = [
+        BASE,
+        "Les chloroplastes réalisent la photosynthèse en captant l'énergie lumineuse du soleil.",
+        "La méiose produit quatre gamètes haploïdes à partir d'une cellule diploïde.",
+    ]
+
+    assert NearDuplicateFilter().filter(texts) == [True, True, True]
+
+
+def test_signature_is_deterministic():
+    assert (NearDuplicateFilter(seed=1).signature(BASE) == NearDuplicateFilter(seed=1).signature(BASE)).all()
+    assert NearDuplicateFilter().signature("!!! ...") is None
+
+
+def test_add_remembers_without_counting():
+    dedup = NearDuplicateFilter()
+    dedup.add([BASE])
+
+    assert dedup.stats["seen"] == 0
+    assert dedup.is_duplicate(BASE)
+
+
+def test_reset_forgets_texts():
+    dedup = NearDuplicateFilter()
+    dedup.is_duplicate(BASE)
+    dedup.reset()
+
+    assert not dedup.is_duplicate(BASE)
+    assert dedup.stats["seen"] == 1
+
+
+def test_deduplicate_texts_keeps_first_occurrence():
+    other = "La méiose produit quatre gamètes haploïdes."
+
+    assert deduplicate_texts([BASE, other, BASE.lower()], threshold=0.9) == [BASE, other]
+
+
+def test_discard_forgets_a_kept_text():
+    dedup = NearDuplicateFilter(threshold=0.7)
+    other = "La méiose produit quatre gamètes haploïdes à partir d'une cellule diploïde."
+    dedup.filter([BASE, other])
+    dedup.discard([BASE.replace("successives", "distinctes"), BASE])
+
+    assert not dedup.is_duplicate(BASE.replace("successives", "distinctes"))
+    assert dedup.is_duplicate(other)
+
+
+class FlakyEmbedder:
+    """Embedder en échec tant que `fail` est vrai."""
+
+    def __init__(self, embedder):
+        self.embedder = embedder
+        self.model = embedder.model
+        self.fail = True
+
+    def embed(self, texts):
+        if self.fail:
+            raise ConnectionError("API indisponible")
+        return self.embedder.embed(texts)
+
+
+def test_document_whose_embedding_failed_can_be_added_again(embedder):
+    flaky = FlakyEmbedder(embedder)
+    store = VectorStore(embedder=flaky, deduplicate=True)
+    store.retry_queue = EmbeddingRetryQueue(
+        flaky, store._on_retry_success, store._on_retry_failure, max_attempts=1, base_delay=0.0
+    )
+
+    store.add_documents([{"text": BASE}], collection="cours")
+    assert store.wait_for_pending(timeout=5)
+    assert [doc["text"] for doc in store.failed_documents] == [BASE]
+
+    flaky.fail = False
+    store.add_documents([{"text": BASE}], collection="cours")
+    assert [doc["text"] for doc in store.documents] == [BASE]
+    store.add_documents([{"text": BASE}], collection="cours")
+    assert len(store.documents) == 1
+
+
+class CountingEmbedder:
+    """Embedder qui enregistre les textes encodés."""
+
+    def __init__(self, embedder):
+        self.embedder = embedder
+        self.texts = []
+
+    def embed(self, texts):
+        self.texts.extend(texts)
+        return self.embedder.embed(texts)
+
+
+def question(text, **fields):
+    return {"question": text, "options": ["A", "B"], "correct_answer": "A", **fields}
+
+
+def test_deduplicate_questions_keeps_existing_questions(embedder):
+    existing = question("Quel organite produit l'ATP ?")
+    duplicate = question("Quel organite produit l'ATP ?", explanation="La mitochondrie.")
+    other = question("Où se déroule la photosynthèse ?")
+
+    kept, removed = deduplicate_questions([existing, duplicate, other], embedder, keep_first=1)
+
+    assert kept == [existing, other]
+    assert removed == 1
+
+
+def test_deduplicate_questions_keeps_the_most_complete(embedder):
+    bare = {"question": "Quel organite produit l'ATP ?"}
+    complete = question("Quel organite produit l'ATP ?", explanation="La mitochondrie.")
+
+    assert deduplicate_questions([bare, complete], embedder) == ([complete], 1)
+
+
+def test_question_deduplicator_embeds_each_question_once(embedder):
+    counting = CountingEmbedder(embedder)
+    dedup = QuestionDeduplicator(counting)
+    dedup.add([question("Quel organite produit l'ATP ?")])
+
+    batches = [
+        [question("Où se déroule la photosynthèse ?"), question("Quel organite produit l'ATP ?")],
+        [question("Combien de gamètes produit la méiose ?"), question("Où se déroule la photosynthèse ?")],
+        [question("Que transcrit l'ARN polymérase ?")],
+    ]
+    results = [dedup.filter(batch) for batch in batches]
+
+    assert [removed for _, removed in results] == [1, 1, 0]
+    assert [q["question"] for kept, _ in results for q in kept] == [
+        "Où se déroule la photosynthèse ?",
+        "Combien de gamètes produit la méiose ?",
+        "Que transcrit l'ARN polymérase ?",
+    ]
+    assert len(counting.texts) == 1 + sum(len(batch) for batch in batches)
+
+
+def test_question_deduplicator_keeps_questions_when_embedding_fails():
+    class FailingEmbedder:
+        def embed(self, texts):
+            raise ConnectionError("API indisponible")
+
+    batch = [question("Quel organite produit l'ATP ?")] * 2
+    assert QuestionDeduplicator(FailingEmbedder()).filter(batch) == (batch, 0)
+
+
+def test_concept_key_ignores_case_accents_and_spaces():
+    assert concept_key("  Énergie   d'activation ") == concept_key("energie d'activation")
+    assert concept_key("Mitose") != concept_key("Méiose")
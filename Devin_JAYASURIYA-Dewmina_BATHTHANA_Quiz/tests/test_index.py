@@ -0,0 +1,213 @@
+import numpy as np
+import pytest
+
+from src.rag.index import HNSWLIB_AVAILABLE, IVFIndex, QuantizedIndex, create_index, normalize
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(20, 64))
+    data = centers[rng.integers(0, 20, 2000)] + 0.5 * rng.normal(size=(2000, 64))
+    queries = data[rng.integers(0, 2000, 50)] + 0.1 * rng.normal(size=(50, 64))
+    return normalize(data.astype(np.float32)), normalize(queries.astype(np.float32))
+
+
+def recall(expected: np.ndarray, found: np.ndarray) -> float:
+    return float(np.mean([len(set(a) & set(b)) / len(a) for a, b in zip(expected, found)]))
+
+
+@pytest.fixture(scope="module")
+def exact(dataset):
+    data, queries = dataset
+    flat = create_index("flat")
+    flat.add(data)
+    return flat.search(queries, 10)
+
+
+def test_flat_search_is_exact(dataset, exact):
+    data, queries = dataset
+    scores, ids = exact
+
+    expected = np.argsort(-(queries @ data.T), axis=1)[:, :10]
+    assert recall(expected, ids) == 1.0
+    assert (np.diff(scores, axis=1) <= 0).all()
+
+
+def test_incremental_add_matches_single_add(dataset, exact):
+    data, queries = dataset
+    index = create_index("flat")
+    for start in range(0, len(data), 300):
+        index.add(data[start:start + 300])
+
+    assert len(index) == len(data)
+    np.testing.assert_array_equal(index.search(queries, 10)[1], exact[1])
+
+
+def test_dimension_mismatch_is_rejected(dataset):
+    index = create_index("flat")
+    index.add(dataset[0][:10])
+
+    with pytest.raises(ValueError):
+        index.add(np.ones((1, 8), dtype=np.float32))
+
+
+def test_results_are_padded():
+    index = create_index("flat")
+    index.add(np.eye(3, dtype=np.float32))
+
+    scores, ids = index.search(np.ones((1, 3), dtype=np.float32), 5)
+    assert ids[0, 3:].tolist() == [-1, -1]
+    assert np.isneginf(scores[0, 3:]).all()
+
+
+def test_ivf_recall(dataset, exact):
+    data, queries = dataset
+    index = create_index("ivf", nlist=32, nprobe=8)
+    index.add(data)
+
+    assert index.is_trained
+    assert recall(exact[1], index.search(queries, 10)[1]) >= 0.9
+
+
+def test_ivf_full_probe_is_exact(dataset, exact):
+    data, queries = dataset
+    index = create_index("ivf", nlist=16, nprobe=16)
+    index.add(data)
+
+    assert recall(exact[1], index.search(queries, 10)[1]) == 1.0
+
+
+def test_ivf_subset_search(dataset):
+    data, queries = dataset
+    index = create_index("ivf", nlist=32, nprobe=32)
+    index.add(data)
+    subset = np.arange(0, len(data), 3)
+
+    _, ids = index.search(queries, 5, subset)
+    expected = subset[np.argsort(-(queries @ data[subset].T), axis=1)[:, :5]]
+    np.testing.assert_array_equal(ids, expected)
+
+
+def test_ivf_state_is_restored_without_training(dataset, monkeypatch):
+    data, queries = dataset
+    index = create_index("ivf", nlist=32, nprobe=8)
+    index.add(data[:1500])
+    index.add(data[1500:])
+    expected = index.search(queries, 10)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("l'index ne doit pas être ré-entraîné")
+
+    monkeypatch.setattr(IVFIndex, "train", fail)
+    loaded = create_index("ivf", nlist=32, nprobe=8)
+    loaded.attach(data, index.state())
+
+    np.testing.assert_array_equal(loaded.search(queries, 10)[1], expected[1])
+    loaded.add(queries[:1])
+    assert loaded.search(queries[:1], 1)[1][0, 0] == len(data)
+
+
+@pytest.mark.skipif(not HNSWLIB_AVAILABLE, reason="hnswlib non installé")
+def test_hnsw_state_round_trip(dataset, exact):
+    data, queries = dataset
+    index = create_index("hnsw")
+    index.add(data)
+    assert recall(exact[1], index.search(queries, 10)[1]) >= 0.9
+
+    loaded = create_index("hnsw")
+    loaded.attach(data, index.state())
+    np.testing.assert_array_equal(loaded.search(queries, 10)[1], index.search(queries, 10)[1])
+
+
+@pytest.mark.parametrize("method,params,minimum", [
+    ("int8", {}, 0.98),
+    ("int8", {"rescore": 0}, 0.95),
+    ("pq", {"train_size": 1000}, 0.9),
+])
+def test_quantized_recall_against_flat(dataset, exact, method, params, minimum):
+    data, queries = dataset
+    index = create_index(method, **params)
+    index.add(data)
+
+    assert index.is_trained
+    _, ids = index.search(queries, 10)
+    assert recall(exact[1], ids) >= minimum
+
+
+def test_pq_rescore_improves_recall(dataset, exact):
+    data, queries = dataset
+    recalls = []
+    for rescore in (0, 16):
+        index = create_index("pq", train_size=1000, rescore=rescore)
+        index.add(data)
+        recalls.append(recall(exact[1], index.search(queries, 10)[1]))
+
+    assert recalls[1] > recalls[0]
+
+
+def test_rescored_scores_match_flat(dataset, exact):
+    data, queries = dataset
+    index = create_index("int8")
+    index.add(data)
+
+    scores, ids = index.search(queries, 10)
+    found = ids[:, 0] == exact[1][:, 0]
+    np.testing.assert_allclose(scores[found, 0], exact[0][found, 0], atol=1e-5)
+
+
+def test_only_codes_are_kept_in_memory(dataset):
+    data, _ = dataset
+    index = QuantizedIndex(method="int8")
+    index.add(data)
+
+    assert index.code_size == data.shape[1]
+    assert index.codes.shape == (len(data), index.code_size)
+    assert isinstance(index.vectors, np.memmap) and index.vectors.dtype == np.float32
+    np.testing.assert_allclose(index.vectors, data, atol=1e-6)
+    assert index.nbytes < index.codes.nbytes + 4 * 4 * data.shape[1]
+
+
+def test_quantized_state_reads_attached_vectors(dataset, tmp_path):
+    data, queries = dataset
+    index = create_index("pq", train_size=1000)
+    index.add(data)
+    np.save(tmp_path / "embeddings.npy", data)
+
+    loaded = create_index("pq", train_size=1000)
+    loaded.attach(np.load(tmp_path / "embeddings.npy", mmap_mode="r"), index.state())
+    np.testing.assert_array_equal(loaded.search(queries, 10)[1], index.search(queries, 10)[1])
+
+    loaded.add(queries[:1])
+    assert isinstance(loaded.vectors, np.memmap) and len(loaded) == len(data) + 1
+    assert loaded.search(queries[:1], 1)[1][0, 0] == len(data)
+
+
+def test_untrained_index_searches_exactly(dataset, exact):
+    data, queries = dataset
+    index = QuantizedIndex(method="int8", train_size=len(data) + 1)
+    index.add(data)
+
+    assert not index.is_trained
+    _, ids = index.search(queries, 10)
+    assert recall(exact[1], ids) == 1.0
+
+
+def test_quantized_subset_search(dataset):
+    data, queries = dataset
+    index = create_index("int8")
+    index.add(data)
+    subset = np.arange(0, len(data), 7)
+
+    _, ids = index.search(queries, 5, subset)
+    assert np.isin(ids[ids >= 0], subset).all()
+
+
+def test_unknown_quantization_is_rejected():
+    with pytest.raises(ValueError):
+        create_index("int4")
+
+
+def test_unknown_index_type_is_rejected():
+    with pytest.raises(ValueError):
+        create_index("annoy")
@@ -0,0 +1,66 @@
+import json
+import sqlite3
+
+from src.parsers.cache import ParseCache, file_digest, parse_key
+from src.parsers.registry import parse_document
+
+SECTIONS = [
+    {"page": 1, "content": "Première page.", "text": "Première page."},
+    {"section": 2, "title": "Titre", "content": "Deuxième section.", "text": "Deuxième section."},
+]
+
+
+def test_round_trip_stores_text_once(tmp_path):
+    cache = ParseCache(tmp_path / "parsed.sqlite")
+    cache.put("doc", SECTIONS)
+
+    assert cache.get("doc") == SECTIONS
+    stored = json.loads(cache._conn.execute("SELECT sections FROM parsed").fetchone()[0])
+    assert all("text" not in section for section in stored)
+
+
+def test_distinct_text_is_kept(tmp_path):
+    cache = ParseCache(tmp_path / "parsed.sqlite")
+    sections = [{"content": "contenu", "text": "autre texte"}]
+    cache.put("doc", sections)
+
+    assert cache.get("doc") == sections
+
+
+def test_least_recently_used_documents_are_evicted(tmp_path):
+    cache = ParseCache(tmp_path / "parsed.sqlite", max_entries=2)
+    cache.put("a", SECTIONS)
+    cache.put("b", SECTIONS)
+    cache.get("a")
+    cache.put("c", SECTIONS)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == SECTIONS and cache.get("c") == SECTIONS
+
+
+def test_previous_schema_is_rebuilt(tmp_path):
+    path = tmp_path / "parsed.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE parsed (key TEXT PRIMARY KEY, sections TEXT NOT NULL, created_at REAL NOT NULL)")
+    conn.execute("INSERT INTO parsed VALUES ('doc', '[]', 0)")
+    conn.commit()
+    conn.close()
+
+    cache = ParseCache(path)
+    assert len(cache) == 0
+    cache.put("doc", SECTIONS)
+    assert cache.get("doc") == SECTIONS
+
+
+def test_parse_document_uses_cache(tmp_path):
+    document = tmp_path / "cours.txt"
+    document.write_text("Introduction.\n\nDeuxième paragraphe.", encoding="utf-8")
+    cache = ParseCache(tmp_path / "parsed.sqlite")
+
+    first = parse_document(document, cache=cache)
+    second = parse_document(document, cache=cache, digest=file_digest(document))
+
+    assert first == second
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert parse_key(document, "TextParser") == parse_key(document, "TextParser", digest=file_digest(document))
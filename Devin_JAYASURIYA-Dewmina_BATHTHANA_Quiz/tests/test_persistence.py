@@ -0,0 +1,188 @@
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from src.rag.persistence import FORMAT_VERSION, convert_legacy_store, load_store, save_store
+from src.rag.vectorstore import VectorStore
+
+QUERIES = ["mitochondries glucose", "division cellulaire", "ARN messager"]
+
+
+def results(store, mode="dense"):
+    return [[(r["text"], round(r["score"], 3)) for r in store.search(q, k=3, min_score=0.0, mode=mode)] for q in QUERIES]
+
+
+@pytest.mark.parametrize("index_type,index_params", [
+    ("flat", {}),
+    ("ivf", {"nlist": 2, "nprobe": 2, "train_size": 4}),
+    ("int8", {"train_size": 4}),
+])
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip(tmp_path, embedder, documents, index_type, index_params, mmap):
+    store = VectorStore(embedder=embedder, index_type=index_type, index_params=index_params)
+    store.add_documents([dict(doc) for doc in documents])
+    store.save(tmp_path / "store")
+
+    loaded = VectorStore(embedder=embedder)
+    loaded.load(tmp_path / "store", mmap=mmap)
+
+    assert loaded.documents == store.documents
+    assert loaded.index_type == index_type
+    assert results(loaded) == results(store)
+    assert results(loaded, "sparse") == results(store, "sparse")
+
+
+def test_float16_round_trip(tmp_path, embedder, documents):
+    store = VectorStore(embedder=embedder)
+    store.add_documents([dict(doc) for doc in documents])
+    store.save(tmp_path / "store", dtype="float16")
+
+    _, embeddings, meta = load_store(tmp_path / "store")
+    assert embeddings.dtype == np.float16 and meta["dtype"] == "float16"
+    np.testing.assert_allclose(embeddings, store.embeddings, atol=1e-3)
+
+
+def test_load_replaces_previous_state(tmp_path, embedder, documents):
+    store = VectorStore(embedder=embedder, deduplicate=True)
+    store.add_documents([dict(doc) for doc in documents[:3]])
+    store.save(tmp_path / "store")
+
+    other = VectorStore(embedder=embedder, deduplicate=True)
+    other.add_documents([dict(doc) for doc in documents[3:]])
+    other.search("méiose", k=1, mode="sparse")
+    other.search("méiose", k=1)
+    other.load(tmp_path / "store")
+
+    assert len(other._query_cache) == 0
+    assert other.search("méiose gamètes", k=1, mode="sparse") == []
+    other.add_documents([dict(documents[0]), dict(documents[4])])
+    assert [doc["text"] for doc in other.documents] == [doc["text"] for doc in documents[:3]] + [documents[4]["text"]]
+
+
+def test_unsupported_version_is_rejected(tmp_path, embedder, documents):
+    store = VectorStore(embedder=embedder)
+    store.add_documents([dict(doc) for doc in documents])
+    store.save(tmp_path / "store")
+    meta_path = tmp_path / "store" / "meta.json"
+    meta = json.loads(meta_path.read_text())
+    meta_path.write_text(json.dumps(dict(meta, format_version=FORMAT_VERSION + 1)))
+
+    with pytest.raises(ValueError):
+        load_store(tmp_path / "store")
+
+
+def test_save_checks_lengths(tmp_path):
+    with pytest.raises(ValueError):
+        save_store(tmp_path / "store", [{"text": "a"}], np.zeros((2, 4), dtype=np.float32), {})
+
+
+@pytest.fixture
+def legacy_file(tmp_path, embedder, documents):
+    vectors = embedder.embed([doc["text"] for doc in documents])
+    data = {
+        "documents": [dict(doc, embedding=vector.tolist()) for doc, vector in zip(documents, vectors)],
+        "embedding_col": "embedding",
+        "model": "text-embedding-3-large",
+    }
+    path = tmp_path / "legacy.json"
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def test_legacy_store_is_loaded(legacy_file, embedder, documents):
+    store = VectorStore(embedder=embedder)
+    store.load(str(legacy_file))
+
+    assert store.documents == documents
+    assert len(store.index) == len(documents)
+    assert "mitochondries" in store.search("mitochondries glucose", k=1, min_score=0.0)[0]["text"]
+
+
+def test_convert_legacy_store(tmp_path, legacy_file, embedder, documents):
+    legacy = VectorStore(embedder=embedder)
+    legacy.load(str(legacy_file))
+
+    path = convert_legacy_store(legacy_file, tmp_path / "converted")
+    converted = VectorStore(embedder=embedder)
+    converted.load(path)
+
+    assert converted.documents == documents
+    assert results(converted) == results(legacy)
+
+
+def write_legacy(path, documents, vectors):
+    data = {
+        "documents": [
+            dict(doc, embedding=vector.tolist()) if vector is not None else dict(doc)
+            for doc, vector in zip(documents, vectors)
+        ],
+        "embedding_col": "embedding",
+    }
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def test_legacy_store_without_embeddings(tmp_path, embedder, documents):
+    path = write_legacy(tmp_path / "legacy.json", documents, [None] * len(documents))
+
+    store = VectorStore(embedder=embedder)
+    store.load(str(path))
+
+    assert store.documents == documents
+    assert len(store.index) == len(documents)
+    assert "méiose" in store.search("méiose gamètes", k=1, min_score=0.0)[0]["text"]
+
+
+def test_legacy_store_with_some_embeddings(tmp_path, embedder, documents):
+    vectors = list(embedder.embed([doc["text"] for doc in documents]))
+    vectors[1] = vectors[4] = None
+    path = write_legacy(tmp_path / "legacy.json", documents, vectors)
+
+    store = VectorStore(embedder=embedder)
+    store.load(str(path))
+
+    # Documents sans embedding encodés et ajoutés après les autres
+    assert [doc["text"] for doc in store.documents] == [
+        doc["text"] for i, doc in enumerate(documents) if i not in (1, 4)
+    ] + [documents[1]["text"], documents[4]["text"]]
+    assert len(store.index) == len(documents)
+
+
+def test_convert_legacy_store_without_embeddings(tmp_path, embedder, documents):
+    vectors = list(embedder.embed([doc["text"] for doc in documents]))
+    vectors[0] = None
+    path = write_legacy(tmp_path / "legacy.json", documents, vectors)
+
+    skipped = load_store(convert_legacy_store(path, tmp_path / "skipped"))
+    assert skipped[0] == documents[1:] and len(skipped[1]) == len(documents) - 1
+
+    embedded = load_store(convert_legacy_store(path, tmp_path / "embedded", embedder=embedder))
+    assert embedded[0] == documents[1:] + documents[:1]
+
+    empty = write_legacy(tmp_path / "empty.json", documents, [None] * len(documents))
+    assert load_store(convert_legacy_store(empty, tmp_path / "empty"))[0] == []
+
+
+def test_save_during_concurrent_indexing_is_consistent(tmp_path, embedder):
+    store = VectorStore(embedder=embedder, deduplicate=False)
+    stop = threading.Event()
+
+    def index_forever():
+        i = 0
+        while not stop.is_set():
+            text = f"document {i}"
+            store._index_documents([{"text": text}], embedder.embed([text]))
+            i += 1
+
+    thread = threading.Thread(target=index_forever)
+    thread.start()
+    try:
+        for attempt in range(20):
+            store.save(tmp_path / f"store{attempt}")
+            documents, embeddings, _ = load_store(tmp_path / f"store{attempt}")
+            assert len(documents) == len(embeddings)
+    finally:
+        stop.set()
+        thread.join()
@@ -0,0 +1,40 @@
+import pytest
+
+from src.generators.quiz_generator import allocate_questions
+
+
+@pytest.mark.parametrize("sizes,total", [
+    ([100, 100, 100], 10),
+    ([5000, 1200, 300, 40], 17),
+    ([1, 1], 1),
+    ([7], 4),
+    ([3, 0, 9], 5),
+])
+def test_allocation_sums_to_total(sizes, total):
+    counts = allocate_questions(sizes, total)
+
+    assert sum(counts) == total
+    assert len(counts) == len(sizes)
+    assert all(count >= 0 for count in counts)
+
+
+def test_allocation_is_proportional():
+    assert allocate_questions([300, 100], 8) == [6, 2]
+    assert allocate_questions([5000, 1200, 300, 40], 17) == [13, 3, 1, 0]
+
+
+def test_largest_remainders_get_extra_questions():
+    assert allocate_questions([10, 20, 30], 4) == [1, 1, 2]
+    assert allocate_questions([1, 1, 1], 2) in ([1, 1, 0], [1, 0, 1], [0, 1, 1])
+
+
+def test_allocation_stays_within_one_of_quota():
+    sizes = [123, 456, 789, 1011, 1213]
+    total = 25
+    for size, count in zip(sizes, allocate_questions(sizes, total)):
+        assert abs(count - total * size / sum(sizes)) < 1
+
+
+@pytest.mark.parametrize("sizes,total", [([0, 0], 5), ([10, 20], 0), ([], 3)])
+def test_degenerate_allocations(sizes, total):
+    assert allocate_questions(sizes, total) == [0] * len(sizes)
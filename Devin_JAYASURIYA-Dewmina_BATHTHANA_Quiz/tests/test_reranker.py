@@ -0,0 +1,52 @@
+from src.rag.reranker import HybridReranker
+
+
+class RecordingFallback:
+    def __init__(self):
+        self.calls = 0
+
+    def rerank(self, query, results):
+        self.calls += 1
+        return results
+
+
+def test_dominant_dense_signal_is_not_escalated():
+    # Le vectoriel sépare nettement les deux candidats, BM25 est à peine en
+    # désaccord: les rangs s'inversent (égalité RRF) mais rien n'est indécis
+    results = [
+        {"text": "La mitochondrie produit l'énergie de la cellule.", "score": 0.9},
+        {"text": "La mitochondrie de la cellule, la cellule et son énergie.", "score": 0.5},
+    ]
+    fallback = RecordingFallback()
+    reranker = HybridReranker(fallback=fallback)
+
+    ranked = reranker.rerank("énergie de la cellule", results)
+
+    assert ranked[0]["bm25_score"] < ranked[1]["bm25_score"]
+    assert ranked[0]["rerank_score"] == ranked[1]["rerank_score"]
+    assert fallback.calls == 0
+    assert reranker.escalation_rate == 0.0
+
+
+def test_undecided_candidates_are_escalated():
+    results = [
+        {"text": "La photosynthèse a lieu dans le chloroplaste.", "score": 0.81},
+        {"text": "Le chloroplaste est le siège de la photosynthèse.", "score": 0.80},
+    ]
+    fallback = RecordingFallback()
+    reranker = HybridReranker(fallback=fallback)
+
+    reranker.rerank("photosynthèse chloroplaste", results)
+
+    assert fallback.calls == 1
+    assert reranker.escalation_rate == 1.0
+
+
+def test_single_result_is_never_escalated():
+    fallback = RecordingFallback()
+    reranker = HybridReranker(fallback=fallback)
+
+    ranked = reranker.rerank("cellule", [{"text": "La cellule.", "score": 0.7}])
+
+    assert len(ranked) == 1
+    assert fallback.calls == 0
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from src.llm.streaming import JSONArrayStreamParser
+
+QUESTIONS = [
+    {"id": 1, "question": "Que vaut {x} dans \"f(x) = [x]\" ?", "options": ["1", "2"], "nested": {"a": [1, {"b": 2}]}},
+    {"id": 2, "question": "Échappement: \\\" et \\\\ puis }", "options": []},
+    {"id": 3, "question": "Dernière", "options": ["ok"]},
+]
+RESPONSE = json.dumps({
+    "title": "Quiz [test] {1}",
+    "description": "questions: [pas un tableau]",
+    "questions": QUESTIONS,
+    "after": {"questions": [{"id": 99}]},
+}, ensure_ascii=False, indent=2)
+
+
+def feed_all(parser, chunks):
+    elements = []
+    for chunk in chunks:
+        elements.extend(parser.feed(chunk))
+    return elements
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(RESPONSE)])
+def test_elements_are_extracted_for_any_chunk_size(size):
+    parser = JSONArrayStreamParser("questions")
+    chunks = [RESPONSE[i:i + size] for i in range(0, len(RESPONSE), size)]
+
+    assert feed_all(parser, chunks) == QUESTIONS
+    assert parser.done
+
+
+def test_elements_are_extracted_for_every_split_point():
+    for split in range(len(RESPONSE) + 1):
+        parser = JSONArrayStreamParser("questions")
+        assert feed_all(parser, [RESPONSE[:split], RESPONSE[split:]]) == QUESTIONS
+
+
+def test_element_is_emitted_as_soon_as_it_is_closed():
+    parser = JSONArrayStreamParser("questions")
+    first_end = RESPONSE.index('"id": 2')
+
+    assert parser.feed(RESPONSE[:first_end]) == QUESTIONS[:1]
+    assert not parser.done
+
+
+def test_string_and_array_elements():
+    parser = JSONArrayStreamParser("items")
+
+    assert feed_all(parser, list('{"items": ["a,]", [1, 2], "b\\"c"]}')) == ["a,]", [1, 2], 'b"c']
+
+
+def test_missing_key_yields_nothing():
+    parser = JSONArrayStreamParser("questions")
+
+    assert parser.feed('{"title": "Quiz", "items": [{"id": 1}]}') == []
+    assert not parser.done
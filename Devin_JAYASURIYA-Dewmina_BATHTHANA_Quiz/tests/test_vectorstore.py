@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from src.rag.vectorstore import DEFAULT_MIN_SCORES, RRF_K, VectorStore
+
+
+@pytest.fixture
+def store(embedder, documents):
+    store = VectorStore(embedder=embedder, deduplicate=True, query_cache_size=16)
+    store.add_documents([dict(doc) for doc in documents])
+    return store
+
+
+@pytest.mark.parametrize("mode", ["sparse", "hybrid"])
+def test_lexical_modes_return_results_with_default_threshold(store, mode):
+    results = store.search("mitochondries glucose", k=2, mode=mode)
+
+    assert results
+    assert "mitochondries" in results[0]["text"]
+    assert all(0.0 <= result["score"] <= 1.0 for result in results)
+
+
+def test_dense_default_threshold_is_kept():
+    assert DEFAULT_MIN_SCORES["dense"] > DEFAULT_MIN_SCORES["sparse"]
+    assert DEFAULT_MIN_SCORES["hybrid"] == 0.0
+
+
+def test_hybrid_score_is_normalized_rrf(store):
+    results = store.search("cycle de Krebs", k=3, mode="hybrid")
+
+    assert results[0]["score"] <= 1.0
+    assert results[0]["rrf_score"] < results[0]["score"]
+
+
+def test_fusion_only_counts_lists_containing_the_document(store):
+    # 1 est deuxième des deux listes, 0 et 2 premiers d'une seule liste
+    results = store._fuse_results(
+        np.array([0.9, 0.8]), np.array([0, 1]),
+        np.array([5.0, 4.0]), np.array([2, 1]),
+        k=3, min_score=0.0
+    )
+
+    assert results[0]["text"] == store.documents[1]["text"]
+    assert results[0]["rrf_score"] == pytest.approx(2 / (RRF_K + 2))
+    assert [r["rrf_score"] for r in results[1:]] == pytest.approx([1 / (RRF_K + 1)] * 2)
+    assert results[1]["sparse_score"] is None and results[2]["dense_score"] is None
+
+
+def test_hybrid_falls_back_to_sparse_when_query_embedding_fails(store, monkeypatch):
+    def fail(texts):
+        raise ConnectionError("API indisponible")
+
+    monkeypatch.setattr(store.embedder, "embed", fail)
+
+    assert store.search("méiose gamètes", k=1) == []
+    results = store.search("méiose gamètes", k=1, mode="hybrid")
+    assert results and "méiose" in results[0]["text"]
+
+
+def test_unknown_mode_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.search("ADN", mode="semantic")
+
+
+def test_embeddings_are_not_kept_in_documents(embedder, documents):
+    vectors = embedder.embed([doc["text"] for doc in documents])
+    store = VectorStore(embedder=embedder)
+    store.add_documents([dict(doc, embedding=vector) for doc, vector in zip(documents, vectors)])
+
+    assert len(store.index) == len(documents)
+    assert all("embedding" not in doc for doc in store.documents)
+
+
+def test_near_duplicates_are_skipped(store, documents):
+    store.add_documents([dict(documents[0]), {"text": documents[1]["text"].upper()}])
+
+    assert len(store.documents) == len(documents)
+
+
+def test_clear_resets_derived_state(store):
+    store.search("ADN", k=1, mode="sparse")
+    store.search("ADN", k=1)
+    store.clear()
+
+    assert store.documents == []
+    assert len(store._query_cache) == 0
+    assert store.search("ADN", k=1, mode="sparse") == []